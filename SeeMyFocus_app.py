@@ -3,23 +3,297 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from PIL import Image, ImageTk
 import time
-import json
 import os
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib
 matplotlib.use('TkAgg')
 
+from seemyfocus_camera import CameraManager, FramePool, mirror_faces, CAPTURE_PROFILES, DEFAULT_PROFILE
+from seemyfocus_analytics import dashboard, day_arrays, plot_dashboard
+from seemyfocus_rollups import describe_week
+from seemyfocus_audio import AudioCueEngine
+from seemyfocus_calibration import DetectorCalibrator, BUDGET_CHOICES, DEFAULT_DETECTOR
+from seemyfocus_engine import FocusEngine
+from seemyfocus_live import LiveStateServer
+from seemyfocus_memory import MemoryMonitor, MEMORY_LOG, MEMORY_CHECK_INTERVAL
+from seemyfocus_metrics import MetricsExporter, METRICS_DIR, METRICS_PORT
+from seemyfocus_pipeline import DetectionPipeline, WORKER_CHOICES, opencv_threads
+from seemyfocus_presence import BreakPresence, DeskPresence, BREAK_FRAME_INTERVAL, privacy_blur
+from seemyfocus_profiler import FrameLoopProfiler, parse_profile_arg
+
+MOODS = ["😊 Focused", "😵 Distracted", "😴 Tired", "🔥 Motivated"]
+# History screen date filters: label -> days back from now (0 is today, "year" this calendar year)
+HISTORY_RANGES = [("All time", None), ("Today", 0), ("7 days", 7), ("30 days", 30), ("This year", "year")]
+
 try:
     import pyttsx3
     TTS_AVAILABLE = True
 except:
     TTS_AVAILABLE = False
 
-class SeeMyFocusApp:
-    def __init__(self, root):
+class NotificationQueue:
+    """Single owner of the motivation label and the reminder popup.
+    
+    Messages are merged, prioritized and rate limited here so that bursts of
+    events never stack up Tk callbacks - there is at most one pending timer.
+    """
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    
+    def __init__(self, root, max_pending=5):
+        self.root = root
+        self.max_pending = max_pending
+        self.label = None
+        self.popup = None
+        self.popup_widgets = {}
+        
+        self.pending = []  # [priority, seq, message, duration]
+        self.current = None  # (priority, message)
+        self.label_deadline = None
+        self.popup_deadline = None
+        self.after_id = None
+        self.seq = 0
+        
+        # Cooldowns keyed by notification kind, e.g. "reminder"
+        self.cooldowns = {}
+        self.last_shown = {}
+    
+    def attach_label(self, label):
+        """Route motivation messages to this label"""
+        self.label = label
+        self.current = None
+        self.label_deadline = None
+        self.schedule()
+    
+    def label_alive(self):
+        try:
+            return self.label is not None and bool(self.label.winfo_exists())
+        except tk.TclError:
+            return False
+    
+    def set_cooldown(self, key, seconds):
+        self.cooldowns[key] = seconds
+    
+    def is_ready(self, key, now=None):
+        """True if a notification of this kind is allowed right now"""
+        if key is None or key not in self.last_shown:
+            return True
+        now = time.time() if now is None else now
+        return now - self.last_shown[key] >= self.cooldowns.get(key, 0)
+    
+    def notify(self, message, priority=NORMAL, duration=3.0, key=None):
+        """Queue a motivation message. Returns False if it was suppressed"""
+        now = time.time()
+        if not self.label_alive() or not self.is_ready(key, now):
+            return False
+        if key is not None:
+            self.last_shown[key] = now
+        
+        # Same message already on screen - just keep it up longer
+        if self.current and self.current[1] == message:
+            self.current = (max(self.current[0], priority), message)
+            self.label_deadline = max(self.label_deadline or now, now + duration)
+            self.schedule()
+            return True
+        
+        # Same message already waiting - merge and keep the higher priority
+        for entry in self.pending:
+            if entry[2] == message:
+                entry[0] = max(entry[0], priority)
+                entry[3] = max(entry[3], duration)
+                self.pending.sort(key=lambda e: (-e[0], e[1]))
+                return True
+        
+        if self.current is None or priority > self.current[0]:
+            self.display(priority, message, duration, now)
+        else:
+            self.seq += 1
+            self.pending.append([priority, self.seq, message, duration])
+            self.pending.sort(key=lambda e: (-e[0], e[1]))
+            del self.pending[self.max_pending:]
+        return True
+    
+    def display(self, priority, message, duration, now):
+        self.current = (priority, message)
+        self.label_deadline = now + duration
+        self.label.config(text=message)
+        self.schedule()
+    
+    def show_popup(self, title, message, detail="", duration=3.0, key=None):
+        """Show the reusable reminder popup. Returns False if rate limited"""
+        now = time.time()
+        if not self.is_ready(key, now):
+            return False
+        if key is not None:
+            self.last_shown[key] = now
+        
+        if self.popup is None or not self.popup.winfo_exists():
+            self.build_popup()
+        
+        self.popup_widgets["title"].config(text=title)
+        self.popup_widgets["message"].config(text=message)
+        self.popup_widgets["detail"].config(text=detail)
+        
+        # Position in top right
+        screen_width = self.root.winfo_screenwidth()
+        self.popup.geometry(f"400x200+{screen_width-420}+20")
+        self.popup.deiconify()
+        self.popup.lift()
+        
+        self.popup_deadline = now + duration
+        self.schedule()
+        return True
+    
+    def build_popup(self):
+        """Create the reminder window once; it is hidden, never destroyed"""
+        bg, fg = "#fef3c7", "#92400e"
+        self.popup = tk.Toplevel(self.root)
+        self.popup.title("Focus Reminder")
+        self.popup.configure(bg=bg)
+        self.popup.protocol("WM_DELETE_WINDOW", self.hide_popup)
+        self.popup.withdraw()
+        
+        self.popup_widgets["title"] = tk.Label(self.popup, font=("Helvetica", 14, "bold"),
+                                               bg=bg, fg=fg)
+        self.popup_widgets["title"].pack(pady=15)
+        
+        self.popup_widgets["message"] = tk.Label(self.popup, font=("Helvetica", 12),
+                                                 bg=bg, fg=fg, wraplength=350)
+        self.popup_widgets["message"].pack(pady=10)
+        
+        self.popup_widgets["detail"] = tk.Label(self.popup, font=("Helvetica", 10),
+                                                bg=bg, fg="#dc2626")
+        self.popup_widgets["detail"].pack()
+    
+    def hide_popup(self):
+        self.popup_deadline = None
+        if self.popup is not None and self.popup.winfo_exists():
+            self.popup.withdraw()
+        self.schedule()
+    
+    def schedule(self):
+        """Keep exactly one timer armed for the earliest deadline"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        
+        deadlines = [d for d in (self.label_deadline, self.popup_deadline) if d is not None]
+        if not deadlines:
+            return
+        delay_ms = max(0, int((min(deadlines) - time.time()) * 1000) + 1)
+        self.after_id = self.root.after(delay_ms, self.on_timer)
+    
+    def on_timer(self):
+        self.after_id = None
+        now = time.time()
+        
+        if self.popup_deadline is not None and now >= self.popup_deadline:
+            self.popup_deadline = None
+            if self.popup is not None and self.popup.winfo_exists():
+                self.popup.withdraw()
+        
+        if self.label_deadline is not None and now >= self.label_deadline:
+            self.current = None
+            self.label_deadline = None
+            if not self.label_alive():
+                self.pending.clear()
+            elif self.pending:
+                priority, _, message, duration = self.pending.pop(0)
+                self.display(priority, message, duration, now)
+                return
+            else:
+                self.label.config(text="")
+        
+        self.schedule()
+    
+    def reset(self):
+        """Drop queued messages and cooldowns, e.g. at session start"""
+        self.pending.clear()
+        self.last_shown.clear()
+        self.current = None
+        self.label_deadline = None
+        if self.label_alive():
+            self.label.config(text="")
+        self.hide_popup()
+    
+    def shutdown(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        if self.popup is not None and self.popup.winfo_exists():
+            self.popup.destroy()
+        self.popup = None
+
+class ThemeRegistry:
+    """Remembers which palette role every widget color came from.
+    
+    Switching themes recolors the registered widgets in place instead of
+    rebuilding the screens that own them.
+    """
+    BG_OPTIONS = ("bg", "selectcolor", "activebackground", "highlightbackground")
+    FG_OPTIONS = ("fg", "activeforeground", "insertbackground")
+    # Lookup order matters when two roles share a color (e.g. white card and white text)
+    BG_ROLES = ("bg", "card", "accent", "secondary", "fg")
+    FG_ROLES = ("fg", "secondary", "accent", "card", "bg")
+    
+    def __init__(self, palette):
+        self.palette = dict(palette)
+        self.entries = []  # (widget, {option: role})
+        self.hooks = []
+    
+    def register(self, widget, **roles):
+        """Register explicit option -> role pairs, e.g. register(lbl, fg="accent")"""
+        if roles:
+            self.entries.append((widget, roles))
+    
+    def register_tree(self, widget):
+        """Register a widget and all its children by matching their current colors"""
+        stack = [widget]
+        while stack:
+            w = stack.pop()
+            stack.extend(w.winfo_children())
+            keys = set(w.keys())
+            roles = {}
+            for options, role_order in ((self.BG_OPTIONS, self.BG_ROLES),
+                                        (self.FG_OPTIONS, self.FG_ROLES)):
+                for option in options:
+                    if option not in keys:
+                        continue
+                    value = str(w.cget(option)).lower()
+                    for role in role_order:
+                        if self.palette[role].lower() == value:
+                            roles[option] = role
+                            break
+            self.register(w, **roles)
+    
+    def on_change(self, callback):
+        """Call callback(palette) after every theme switch"""
+        self.hooks.append(callback)
+    
+    def apply(self, palette):
+        """Recolor every live registered widget for the new palette"""
+        self.palette = dict(palette)
+        alive = []
+        for widget, roles in self.entries:
+            try:
+                if not widget.winfo_exists():
+                    continue
+                widget.configure(**{option: self.palette[role] for option, role in roles.items()})
+                alive.append((widget, roles))
+            except tk.TclError:
+                continue
+        self.entries = alive
+        
+        for callback in self.hooks:
+            callback(self.palette)
+
+class SeeMyFocusApp(FocusEngine):
+    def __init__(self, root, profile_mode=None):
         self.root = root
         self.root.title("SeeMyFocus - AI Focus Coach")
         self.root.geometry("1400x800")
@@ -29,129 +303,89 @@ class SeeMyFocusApp:
         self.dark_mode.trace_add('write', lambda *args: self.on_dark_mode_change())
         self.setup_theme()
         
-        self.current_screen = "home"
-        self.cap = None
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
-        
-        # Enhanced eye tracking - focused on eye gaze, not head movement
-        self.eye_history = []
-        self.eye_history_length = 15  # Longer history for smoother tracking
-        self.gaze_deviation_threshold = 25  # LOWERED - more strict, catches side-eyeing
-        self.looking_away_frames = 0
-        self.looking_away_threshold = 8  # More frames needed to register looking away
-        
-        # Session variables
-        self.session_active = False
-        self.session_start_time = None
-        self.session_id = None
-        self.session_task = ""
-        self.session_mood = ""
+        # Screens are built once and then raised/hidden; the theme registry
+        # recolors them in place when dark mode is toggled
+        self.theme = ThemeRegistry(self.palette)
+        self.screens = {}
+        self.scroll_canvases = {}
+        self.current_screen = None
+        
+        # Webcam is opened in the background and released when no session needs it
+        self.capture_profile = tk.StringVar(value=DEFAULT_PROFILE)
+        self.camera = CameraManager(0, profile=DEFAULT_PROFILE)
+        self.camera_loop_id = None
+        self.camera_idle_id = None
+        self.CAMERA_POLL_MS = 250  # loop rate while the camera is opening or reconnecting
+        self.timer_id = None  # cycles, countdown and reminders run on this, not on frames
+        self.timer_due = None
+        self.CAMERA_IDLE_TIMEOUT = 120  # release a pre-warmed camera after 2 idle minutes
+        
+        # Preallocated frame buffers; detection runs on the raw frame and
+        # only the display copy is mirrored
+        self.frame_pool = FramePool()
+        self.video_photo = None
+        
+        # Detection, cycles, streaks and XP (shared with headless stations)
+        FocusEngine.__init__(self)
         self.ai_coaching_plan = ""
-        
-        # Pomodoro-style session management
-        self.focus_cycle_duration = 20 * 60  # 20 minutes in seconds
-        self.break_cycle_duration = 5 * 60   # 5 minutes in seconds
-        self.current_cycle_type = "focus"  # "focus" or "break"
-        self.cycle_start_time = None
-        self.cycles_completed = 0
-        
-        # NEW: Off-screen / Paper Mode
-        self.offscreen_mode = tk.BooleanVar(value=False)
-        
-        # NEW: Persistent streak counter
-        self.persistent_streak_count = 0  # Total streak across sessions
-        self.session_cycles = 0  # Cycles in current session only
-        
-        self.coaching_style = tk.StringVar(value="Gentle")
-        self.privacy_shield = tk.BooleanVar(value=True)
-        self.audio_cues = tk.BooleanVar(value=True)
         self.ai_sponsor = "Claude"
         
-        self.tts_engine = None
-        if TTS_AVAILABLE:
-            try:
-                self.tts_engine = pyttsx3.init()
-                self.tts_engine.setProperty('rate', 150)
-                self.tts_engine.setProperty('volume', 0.7)
-            except:
-                self.tts_engine = None
-        
-        # Focus tracking with buffer
-        self.current_state = "Away"
-        self.streak_time_sec = 0
-        self.streak_count = 0
-        self.longest_streak = 0
-        self.wellness_points = 0
-        self.focus_score = 0
-        self.focused_frames = 0
-        self.total_frames = 0
-        self.deep_work_meter = 0
+        # Speech runs on its own worker thread - never on the Tk thread
+        self.audio = AudioCueEngine(rate=150, volume=0.7) if TTS_AVAILABLE else None
         self.last_audio_cue = 0
-        
-        # Gamification with XP rewards
-        self.level = 1
-        self.xp = 0
-        self.xp_to_next_level = 100
-        self.total_sessions = 0
-        self.lifetime_wellness = 0
-        self.health_streak = 0
-        
-        # XP rewards system
-        self.xp_rewards = {
-            "complete_cycle": 50,
-            "maintain_focus_10min": 25,
-            "take_break": 20,
-            "complete_session": 100,
-            "perfect_focus": 150
-        }
-        
-        # NEW: Achievement system
-        self.achievements = {
-            "first_session": {"unlocked": False, "title": "First Steps", "description": "Complete your first session"},
-            "focus_master": {"unlocked": False, "title": "Focus Master", "description": "Reach 10 cycle streak"},
-            "wellness_warrior": {"unlocked": False, "title": "Wellness Warrior", "description": "Earn 500 wellness points"},
-            "level_5": {"unlocked": False, "title": "Rising Star", "description": "Reach level 5"},
-            "perfect_day": {"unlocked": False, "title": "Perfect Day", "description": "Complete 5 cycles in one session"},
-            "streak_legend": {"unlocked": False, "title": "Streak Legend", "description": "Maintain 20 cycle streak"}
-        }
-        
-        self.break_start_time = None
-        self.total_break_time = 0
-        self.eligible_for_break_reward = False
-        self.break_rewarded = False
-        
-        self.eyes_detected_count = 0
-        self.no_eyes_count = 0
-        self.eye_detection_threshold = 3
-        
-        # Enhanced buffer system - more forgiving (INCREASED FROM 3 to 5 seconds)
-        self.away_buffer_start = None
-        self.return_buffer_start = None
-        self.last_state = "Away"
-        self.streak_start_time = None
-        self.distraction_buffer = 5.0  # 5 second buffer before breaking streak
-        self.distraction_start_time = None
-        
-        self.focus_timeline = []
-        self.timeline_interval = 5
-        self.last_timeline_update = None
-        
-        # Unfocus reminder system
-        self.last_reminder_time = None
-        self.reminder_cooldown = 30  # Remind every 30 seconds when unfocused
-        self.reminder_count = 0
-        
-        self.FOCUS_TIME_REQUIRED = 60
-        self.BREAK_TIME_REQUIRED = 15
-        self.AWAY_BUFFER = 2.0  # Increased buffer time
-        self.RETURN_BUFFER = 1.0
-        self.TOO_CLOSE_THRESHOLD = 0.35
         self.AUDIO_CUE_INTERVAL = 1200
         
+        # One queue owns the motivation label and the reminder popup
+        self.notifications = NotificationQueue(self.root)
+        self.notifications.set_cooldown("reminder", self.reminder_cooldown)
+        
+        # Opt-in local live-state API for desk lights, DND togglers etc.
+        self.live_api = tk.BooleanVar(value=False)
+        self.live_server = None
+        
+        # Frame-loop metrics are always recorded; exporting them is opt-in
+        self.metrics_export = tk.BooleanVar(value=False)
+        self.metrics_exporter = None
+        self.metrics.add_collector(self.camera_metrics)
+        
+        # Developer HUD on the video (F12) and the --profile launch mode
+        self.performance_hud = tk.BooleanVar(value=False)
+        self.root.bind_all("<F12>", lambda e: self.toggle_performance_hud())
+        self.profiler = None
+        if profile_mode:
+            self.profiler = FrameLoopProfiler(profile_mode, active=lambda: self.session_active)
+            self.update_camera = self.profiler.wrap(self.update_camera)
+        
+        # Opt-in memory self-check for machines left running all day
+        self.memory_check = tk.BooleanVar(value=False)
+        self.memory_monitor = None
+        self.memory_check_id = None
+        self.metrics.add_collector(self.memory_metrics)
+        
+        # Detector settings tuned to a per-frame CPU budget, once per camera and profile
+        self.detector_budget = tk.StringVar(value="Off")
+        self.calibrator = None
+        self.metrics.add_collector(self.calibration_metrics)
+        
+        # Face and eye detection on a small worker pool during sessions (Settings → Camera);
+        # OpenCV's own threads are sized to the cores left after Tk either way
+        self.detection_workers = tk.StringVar(value="Off")
+        self.pipeline = None
+        cv2.setNumThreads(opencv_threads(1))
+        self.metrics.add_collector(self.pipeline_metrics)
+        
+        # Breaks only check whether someone is at the desk, a couple of times a second
+        self.break_presence = BreakPresence(self.face_cascade)
+        self.metrics.add_collector(self.break_presence.stats)
+        # Paper Mode presence: background subtraction on the desk region found at session start
+        self.desk_presence = DeskPresence(self.face_cascade)
+        self.metrics.add_collector(self.desk_presence.stats)
+        
+        # At most one session details window (and its graph) exists at a time
+        self.details_window = None
+        self.details_figure = None
+        
         self.session_data = {}
-        self.history_file = "seemyfocus_history.json"
-        self.session_history = []
         
         self.load_user_progress()
         self.load_session_history()
@@ -172,96 +406,100 @@ class SeeMyFocusApp:
             self.accent_color = '#3b82f6'
             self.text_secondary = '#6b7280'
         
+        self.palette = {
+            "bg": self.bg_color,
+            "fg": self.fg_color,
+            "card": self.card_bg,
+            "accent": self.accent_color,
+            "secondary": self.text_secondary
+        }
+        
         self.root.configure(bg=self.bg_color)
     
     def on_dark_mode_change(self):
-        """Handle dark mode change via trace"""
+        """Handle dark mode change via trace - recolor cached screens in place"""
         self.setup_theme()
-        
-        # Refresh current screen
-        if self.current_screen == "home":
-            self.setup_home_screen()
-        elif self.current_screen == "main":
-            self.setup_main_screen()
-        elif self.current_screen == "history":
-            self.setup_history_screen()
-        elif self.current_screen == "settings":
-            self.setup_settings_screen()
-        elif self.current_screen == "achievements":
-            self.setup_achievements_screen()
+        self.theme.apply(self.palette)
         
         self.save_user_progress()
     
+    def progress_settings(self):
+        """Engine settings plus the UI-only ones stored in the progress file"""
+        settings = super().progress_settings()
+        settings["dark_mode"] = self.dark_mode
+        settings["capture_profile"] = self.capture_profile
+        settings["live_api"] = self.live_api
+        settings["metrics_export"] = self.metrics_export
+        settings["performance_hud"] = self.performance_hud
+        settings["memory_check"] = self.memory_check
+        settings["detector_budget"] = self.detector_budget
+        settings["detection_workers"] = self.detection_workers
+        return settings
+    
+    def make_setting(self, value):
+        if isinstance(value, bool):
+            return tk.BooleanVar(value=value)
+        return tk.StringVar(value=value)
+    
     def load_user_progress(self):
-        if os.path.exists("seemyfocus_progress.json"):
-            try:
-                with open("seemyfocus_progress.json", "r") as f:
-                    data = json.load(f)
-                    self.level = data.get("level", 1)
-                    self.xp = data.get("xp", 0)
-                    self.xp_to_next_level = data.get("xp_to_next_level", 100)
-                    self.total_sessions = data.get("total_sessions", 0)
-                    self.lifetime_wellness = data.get("lifetime_wellness", 0)
-                    self.coaching_style.set(data.get("coaching_style", "Gentle"))
-                    self.privacy_shield.set(data.get("privacy_shield", True))
-                    self.audio_cues.set(data.get("audio_cues", True))
-                    self.health_streak = data.get("health_streak", 0)
-                    self.dark_mode.set(data.get("dark_mode", False))
-                    self.persistent_streak_count = data.get("persistent_streak_count", 0)
-                    self.achievements = data.get("achievements", self.achievements)
-            except:
-                pass
-    
-    def save_user_progress(self):
-        data = {
-            "level": self.level,
-            "xp": self.xp,
-            "xp_to_next_level": self.xp_to_next_level,
-            "total_sessions": self.total_sessions,
-            "lifetime_wellness": self.lifetime_wellness,
-            "coaching_style": self.coaching_style.get(),
-            "privacy_shield": self.privacy_shield.get(),
-            "audio_cues": self.audio_cues.get(),
-            "health_streak": self.health_streak,
-            "dark_mode": self.dark_mode.get(),
-            "persistent_streak_count": self.persistent_streak_count,
-            "achievements": self.achievements
-        }
-        with open("seemyfocus_progress.json", "w") as f:
-            json.dump(data, f, indent=2)
+        super().load_user_progress()
+        self.camera.set_profile(self.capture_profile.get())
+        if self.live_api.get():
+            self.start_live_api()
+        if self.metrics_export.get():
+            self.start_metrics_export()
+        if self.memory_check.get():
+            self.start_memory_check()
     
-    def load_session_history(self):
-        """Load session history from file"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r") as f:
-                    self.session_history = json.load(f)
-            except:
-                self.session_history = []
-    
-    def save_session_history(self):
-        """Save session history to file"""
-        with open(self.history_file, "w") as f:
-            json.dump(self.session_history, f, indent=2)
-    
-    def add_xp(self, amount, reason=""):
-        """Add XP with level up system"""
-        self.xp += amount
-        
-        # Check for level up
-        while self.xp >= self.xp_to_next_level:
-            self.xp -= self.xp_to_next_level
-            self.level += 1
-            self.xp_to_next_level = int(self.xp_to_next_level * 1.5)
-            self.show_level_up_notification()
-            self.check_achievements()  # Check for level achievements
+    def show_screen(self, name):
+        """Raise a cached screen, building it the first time it is shown"""
+        if name not in self.screens:
+            frame = tk.Frame(self.root, bg=self.bg_color)
+            getattr(self, f"build_{name}_screen")(frame)
+            self.theme.register_tree(frame)
+            self.screens[name] = frame
+        
+        if self.current_screen != name:
+            if self.current_screen in self.screens:
+                self.screens[self.current_screen].pack_forget()
+            self.screens[name].pack(fill=tk.BOTH, expand=True)
+            self.current_screen = name
+        
+        # Only the home form and the session screen need the webcam
+        if name not in ("home", "main") and not self.session_active:
+            self.camera.release()
+        
+        # Mousewheel scrolling follows the visible screen
+        canvas = self.scroll_canvases.get(name)
+        if canvas is not None:
+            self.root.bind_all("<MouseWheel>",
+                               lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+        else:
+            self.root.unbind_all("<MouseWheel>")
         
-        self.save_user_progress()
+        refresh = getattr(self, f"refresh_{name}_screen", None)
+        if refresh:
+            refresh()
     
     def show_level_up_notification(self):
         """Show level up notification"""
-        if hasattr(self, 'motivation_label'):
-            self.update_motivation(f"🎉 LEVEL UP! You're now Level {self.level}!")
+        self.update_motivation(f"🎉 LEVEL UP! You're now Level {self.level}!",
+                               priority=NotificationQueue.HIGH)
+        self.play_audio_cue("level_up", AudioCueEngine.HIGH)
+    
+    def play_audio_cue(self, cue, priority=AudioCueEngine.NORMAL):
+        """Queue a spoken cue if audio cues are enabled; never blocks"""
+        if not self.audio or not self.audio_cues.get():
+            return
+        
+        # Low priority nudges are rate limited, transitions always play
+        if priority == AudioCueEngine.LOW:
+            now = time.time()
+            if now - self.last_audio_cue < self.AUDIO_CUE_INTERVAL:
+                return
+            self.last_audio_cue = now
+        
+        self.audio.say(cue, priority)
     
     def get_xp_rewards_info(self):
         """Return info about XP rewards - UPDATED"""
@@ -388,66 +626,12 @@ Level up to unlock achievements and track your progress!
                              activebackground="#16a34a")
         start_btn.pack(pady=25)
     
-    def show_unfocus_reminder(self):
-        """Show reminder popup when user is unfocused"""
-        current_time = time.time()
-        
-        # Check cooldown
-        if self.last_reminder_time and (current_time - self.last_reminder_time) < self.reminder_cooldown:
-            return
-        
-        self.last_reminder_time = current_time
-        self.reminder_count += 1
-        
-        # Create non-intrusive reminder
-        reminder = tk.Toplevel(self.root)
-        reminder.title("Focus Reminder")
-        reminder.geometry("400x200")
-        reminder.configure(bg="#fef3c7")
-        
-        # Position in top right
-        screen_width = self.root.winfo_screenwidth()
-        reminder.geometry(f"+{screen_width-420}+20")
-        
-        messages = [
-            "👀 Hey! Your focus drifted. Let's get back on track!",
-            "⚡ Quick reminder: Your task awaits!",
-            "🎯 Refocus! You've got this!",
-            "💪 Your streak is waiting! Come back!",
-            "🌟 Stay strong! You're doing great!"
-        ]
-        
-        message = messages[self.reminder_count % len(messages)]
-        
-        tk.Label(reminder, text="🔔 Focus Coach",
-                font=("Helvetica", 14, "bold"),
-                bg="#fef3c7", fg="#92400e").pack(pady=15)
-        
-        tk.Label(reminder, text=message,
-                font=("Helvetica", 12),
-                bg="#fef3c7", fg="#92400e",
-                wraplength=350).pack(pady=10)
-        
-        # XP penalty info
-        xp_lost = 5
-        self.xp = max(0, self.xp - xp_lost)
-        
-        tk.Label(reminder, text=f"⚠️ -{xp_lost} XP",
-                font=("Helvetica", 10),
-                bg="#fef3c7", fg="#dc2626").pack()
-        
-        # Auto close after 3 seconds
-        reminder.after(3000, reminder.destroy)
-    
     def setup_home_screen(self):
+        """Show the home screen"""
+        self.show_screen("home")
+    
+    def build_home_screen(self, container):
         """Enhanced home screen with professional credentials - SCROLLABLE"""
-        self.clear_screen()
-        self.current_screen = "home"
-        
-        # Create main container with canvas for scrolling
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill=tk.BOTH, expand=True)
-        
         # Create canvas
         canvas = tk.Canvas(container, bg=self.bg_color, highlightthickness=0)
         scrollbar = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
@@ -469,9 +653,7 @@ Level up to unlock achievements and track your progress!
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Add mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        self.scroll_canvases["home"] = canvas
         
         # Add padding frame
         content_frame = tk.Frame(main_frame, bg=self.bg_color)
@@ -489,9 +671,12 @@ Level up to unlock achievements and track your progress!
         toggle_frame = tk.Frame(header_frame, bg=self.bg_color)
         toggle_frame.pack(side=tk.RIGHT)
         
-        tk.Label(toggle_frame, text="🌙" if not self.dark_mode.get() else "☀️",
-                font=("Helvetica", 16),
-                bg=self.bg_color, fg=self.fg_color).pack(side=tk.LEFT, padx=5)
+        dark_mode_icon = tk.Label(toggle_frame, text="🌙" if not self.dark_mode.get() else "☀️",
+                                  font=("Helvetica", 16),
+                                  bg=self.bg_color, fg=self.fg_color)
+        dark_mode_icon.pack(side=tk.LEFT, padx=5)
+        self.theme.on_change(
+            lambda palette: dark_mode_icon.config(text="🌙" if not self.dark_mode.get() else "☀️"))
         
         dark_mode_btn = tk.Checkbutton(toggle_frame, text="Dark Mode",
                                        variable=self.dark_mode,
@@ -535,23 +720,21 @@ Level up to unlock achievements and track your progress!
         stats_grid = tk.Frame(stats_card, bg=self.card_bg)
         stats_grid.pack(padx=30, pady=20)
         
-        stats = [
-            ("Level", f"⭐ {self.level}", f"XP: {self.xp}/{self.xp_to_next_level}"),
-            ("Sessions", f"📊 {self.total_sessions}", "Total completed"),
-            ("Wellness", f"💚 {self.lifetime_wellness}", "Points earned"),
-            ("Streak", f"🔥 {self.persistent_streak_count}", "Cycles")
-        ]
-        
-        for i, (label, value, subtitle) in enumerate(stats):
+        # Values are filled in by refresh_home_screen each time home is shown
+        self.home_stat_labels = {}
+        for i, label in enumerate(["Level", "Sessions", "Wellness", "Streak"]):
             frame = tk.Frame(stats_grid, bg=self.card_bg)
             frame.grid(row=0, column=i, padx=20)
             
             tk.Label(frame, text=label, font=("Helvetica", 11),
                     bg=self.card_bg, fg=self.text_secondary).pack()
-            tk.Label(frame, text=value, font=("Helvetica", 20, "bold"),
-                    bg=self.card_bg, fg=self.accent_color).pack()
-            tk.Label(frame, text=subtitle, font=("Helvetica", 9),
-                    bg=self.card_bg, fg=self.text_secondary).pack()
+            value_label = tk.Label(frame, font=("Helvetica", 20, "bold"),
+                                   bg=self.card_bg, fg=self.accent_color)
+            value_label.pack()
+            subtitle_label = tk.Label(frame, font=("Helvetica", 9),
+                                      bg=self.card_bg, fg=self.text_secondary)
+            subtitle_label.pack()
+            self.home_stat_labels[label] = (value_label, subtitle_label)
         
         # Task input with Enter key support
         input_frame = tk.Frame(content_frame, bg=self.bg_color)
@@ -584,7 +767,7 @@ Level up to unlock achievements and track your progress!
                 font=("Helvetica", 14, "bold"),
                 bg=self.bg_color, fg=self.fg_color).pack(anchor=tk.W, pady=(0, 10))
         
-        moods = ["😊 Focused", "😵 Distracted", "😴 Tired", "🔥 Motivated"]
+        moods = MOODS
         
         mood_buttons_frame = tk.Frame(mood_frame, bg=self.bg_color)
         mood_buttons_frame.pack()
@@ -594,6 +777,7 @@ Level up to unlock achievements and track your progress!
         for mood in moods:
             btn = tk.Radiobutton(mood_buttons_frame, text=mood,
                                 variable=self.selected_mood, value=mood,
+                                command=self.prewarm_camera,
                                 font=("Helvetica", 12),
                                 bg=self.card_bg, fg=self.fg_color,
                                 selectcolor=self.accent_color,
@@ -635,6 +819,14 @@ Level up to unlock achievements and track your progress!
                                      borderwidth=1, cursor="hand2")
         achievements_btn.pack(side=tk.LEFT, padx=5)
         
+        dashboard_btn = tk.Button(nav_frame, text="📈 Dashboard",
+                                  command=self.setup_dashboard_screen,
+                                  font=("Helvetica", 12),
+                                  bg=self.card_bg, fg=self.fg_color,
+                                  padx=20, pady=8, relief=tk.SOLID,
+                                  borderwidth=1, cursor="hand2")
+        dashboard_btn.pack(side=tk.LEFT, padx=5)
+        
         settings_btn = tk.Button(nav_frame, text="⚙️ Settings",
                                 command=self.setup_settings_screen,
                                 font=("Helvetica", 12),
@@ -651,10 +843,41 @@ Level up to unlock achievements and track your progress!
                                relief=tk.FLAT, cursor="hand2")
         xp_info_btn.pack(pady=10)
     
+    def refresh_home_screen(self):
+        """Update the lifetime stats on the cached home screen"""
+        stats = [
+            ("Level", f"⭐ {self.level}", f"XP: {self.xp}/{self.xp_to_next_level}"),
+            ("Sessions", f"📊 {self.total_sessions}", "Total completed"),
+            ("Wellness", f"💚 {self.lifetime_wellness}", "Points earned"),
+            ("Streak", f"🔥 {self.persistent_streak_count}", "Cycles")
+        ]
+        
+        for label, value, subtitle in stats:
+            value_label, subtitle_label = self.home_stat_labels[label]
+            value_label.config(text=value)
+            subtitle_label.config(text=subtitle)
+    
     def on_task_focus_in(self):
         """Clear placeholder text on focus"""
         if self.task_entry.get() == "e.g., Homework, Coding, Reading...":
             self.task_entry.delete(0, tk.END)
+        
+        # User is filling in the session form - get the camera ready meanwhile
+        self.prewarm_camera()
+    
+    def prewarm_camera(self):
+        """Open and warm up the webcam in the background before the session starts"""
+        self.camera.open_async()
+        
+        if self.camera_idle_id is not None:
+            self.root.after_cancel(self.camera_idle_id)
+        self.camera_idle_id = self.root.after(self.CAMERA_IDLE_TIMEOUT * 1000, self.release_idle_camera)
+    
+    def release_idle_camera(self):
+        """Release a pre-warmed camera that no session ended up using"""
+        self.camera_idle_id = None
+        if not self.session_active and self.current_screen != "main":
+            self.camera.release()
     
     def on_task_entered(self):
         """Handle Enter key press on task input"""
@@ -706,13 +929,16 @@ Level up to unlock achievements and track your progress!
         self.start_session()
     
     def setup_main_screen(self):
-        """Enhanced main screen with paper mode and streak counter"""
-        self.clear_screen()
-        self.current_screen = "main"
-        
-        main_container = tk.Frame(self.root, bg=self.bg_color)
-        main_container.pack(fill=tk.BOTH, expand=True)
+        """Show the focus session screen and start the camera"""
+        self.show_screen("main")
         
+        # Start camera - usually already warm from the home screen
+        self.camera.open_async()
+        if self.camera_loop_id is None:
+            self.update_camera()
+    
+    def build_main_screen(self, main_container):
+        """Enhanced main screen with paper mode and streak counter"""
         # Left panel - Video and controls
         left_panel = tk.Frame(main_container, bg=self.bg_color)
         left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -742,13 +968,15 @@ Level up to unlock achievements and track your progress!
         info_content = tk.Frame(info_frame, bg=self.card_bg)
         info_content.pack(padx=15, pady=10)
         
-        tk.Label(info_content, text=f"📝 Task: {self.session_task}",
-                font=("Helvetica", 11),
-                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W)
+        self.task_label = tk.Label(info_content, text=f"📝 Task: {self.session_task}",
+                                   font=("Helvetica", 11),
+                                   bg=self.card_bg, fg=self.fg_color)
+        self.task_label.pack(anchor=tk.W)
         
-        tk.Label(info_content, text=f"😊 Mood: {self.session_mood}",
-                font=("Helvetica", 11),
-                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W)
+        self.mood_label = tk.Label(info_content, text=f"😊 Mood: {self.session_mood}",
+                                   font=("Helvetica", 11),
+                                   bg=self.card_bg, fg=self.fg_color)
+        self.mood_label.pack(anchor=tk.W)
         
         # NEW: Paper Mode / Off-Screen Mode toggle
         paper_mode_frame = tk.Frame(left_panel, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
@@ -798,9 +1026,10 @@ Level up to unlock achievements and track your progress!
         xp_content = tk.Frame(xp_card, bg=self.card_bg)
         xp_content.pack(padx=20, pady=15)
         
-        tk.Label(xp_content, text=f"⭐ Level {self.level}",
-                font=("Helvetica", 16, "bold"),
-                bg=self.card_bg, fg=self.accent_color).pack()
+        self.level_label = tk.Label(xp_content, text=f"⭐ Level {self.level}",
+                                    font=("Helvetica", 16, "bold"),
+                                    bg=self.card_bg, fg=self.accent_color)
+        self.level_label.pack()
         
         self.xp_label = tk.Label(xp_content, text=f"XP: {self.xp}/{self.xp_to_next_level}",
                                 font=("Helvetica", 12),
@@ -920,28 +1149,35 @@ Level up to unlock achievements and track your progress!
                                         bg=self.bg_color, fg=self.accent_color,
                                         wraplength=350, justify=tk.CENTER)
         self.motivation_label.pack(pady=15)
-        
-        # Start camera
-        if not self.cap:
-            self.cap = cv2.VideoCapture(0)
-            self.update_camera()
+        self.notifications.attach_label(self.motivation_label)
+    
+    def refresh_main_screen(self):
+        """Reset the cached session screen for a new session"""
+        self.task_label.config(text=f"📝 Task: {self.session_task}")
+        self.mood_label.config(text=f"😊 Mood: {self.session_mood}")
+        self.status_label.config(text="Ready", fg=self.fg_color)
+        self.cycle_timer_label.config(text="00:00")
+        self.cycle_type_label.config(text="Ready to start")
+        self.streak_counter_label.config(text=str(self.persistent_streak_count))
+        self.session_cycles_label.config(text=f"This session: {self.session_cycles} cycles")
+        self.update_stats_display()
     
     def toggle_offscreen_mode(self):
         """Handle paper mode toggle"""
         if self.offscreen_mode.get():
-            self.update_motivation("✍️ Paper Mode ON - No judgment! You're still earning streak time. Face just needs to be in frame.")
+            self.desk_presence.start()
+            self.update_motivation("✍️ Paper Mode ON - No judgment! You're still earning streak time. Face just needs to be in frame.",
+                                   priority=NotificationQueue.LOW)
         else:
-            self.update_motivation("👀 Normal Mode - Back to eye tracking. Looking directly at screen required.")
+            self.update_motivation("👀 Normal Mode - Back to eye tracking. Looking directly at screen required.",
+                                   priority=NotificationQueue.LOW)
     
     def setup_history_screen(self):
+        """Show the session history screen"""
+        self.show_screen("history")
+    
+    def build_history_screen(self, container):
         """Session history screen with improved graph visibility - SCROLLABLE"""
-        self.clear_screen()
-        self.current_screen = "history"
-        
-        # Container with header
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill=tk.BOTH, expand=True)
-        
         # Header frame (fixed at top)
         header_container = tk.Frame(container, bg=self.bg_color)
         header_container.pack(fill=tk.X, padx=40, pady=(30, 10))
@@ -961,11 +1197,50 @@ Level up to unlock achievements and track your progress!
                             borderwidth=1, cursor="hand2")
         back_btn.pack(side=tk.RIGHT)
         
-        if not self.session_history:
-            tk.Label(container, text="No sessions yet. Start your first session!",
-                    font=("Helvetica", 14),
-                    bg=self.bg_color, fg=self.text_secondary).pack(pady=50)
-            return
+        # Search and filters, answered by the history index
+        filter_frame = tk.Frame(header_container, bg=self.bg_color)
+        filter_frame.pack(fill=tk.X, pady=(15, 0))
+        
+        tk.Label(filter_frame, text="🔍 Task",
+                font=("Helvetica", 11),
+                bg=self.bg_color, fg=self.fg_color).pack(side=tk.LEFT)
+        self.history_search = tk.StringVar(value="")
+        tk.Entry(filter_frame, textvariable=self.history_search, width=18,
+                font=("Helvetica", 11),
+                bg=self.card_bg, fg=self.fg_color,
+                insertbackground=self.fg_color,
+                relief=tk.SOLID, borderwidth=1).pack(side=tk.LEFT, padx=(5, 15), ipady=4)
+        
+        self.history_mood = tk.StringVar(value="")
+        self.history_range = tk.StringVar(value="All time")
+        for variable, choices in ((self.history_mood, [("All moods", "")] + [(mood, mood) for mood in MOODS]),
+                                  (self.history_range, [(label, label) for label, _ in HISTORY_RANGES])):
+            group = tk.Frame(filter_frame, bg=self.bg_color)
+            group.pack(side=tk.LEFT, padx=(0, 15))
+            for label, value in choices:
+                tk.Radiobutton(group, text=label,
+                              variable=variable, value=value,
+                              font=("Helvetica", 10),
+                              bg=self.card_bg, fg=self.fg_color,
+                              selectcolor=self.accent_color,
+                              indicatoron=0, padx=6, pady=4,
+                              activebackground=self.accent_color,
+                              activeforeground="white").pack(side=tk.LEFT)
+        
+        for variable in (self.history_search, self.history_mood, self.history_range):
+            variable.trace_add('write', lambda *args: self.schedule_history_filter())
+        self.history_filter_job = None
+        self.history_filtered = False  # whether some cards are hidden
+        
+        self.history_result_label = tk.Label(header_container,
+                                             font=("Helvetica", 11),
+                                             bg=self.bg_color, fg=self.text_secondary)
+        self.history_result_label.pack(anchor="w", pady=(8, 0))
+        
+        # Shown by refresh_history_screen while there are no sessions
+        self.history_empty_label = tk.Label(container, text="No sessions yet. Start your first session!",
+                                            font=("Helvetica", 14),
+                                            bg=self.bg_color, fg=self.text_secondary)
         
         # Scrollable content
         canvas = tk.Canvas(container, bg=self.bg_color, highlightthickness=0)
@@ -981,25 +1256,91 @@ Level up to unlock achievements and track your progress!
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=40)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 40))
+        self.scroll_canvases["history"] = canvas
+        self.history_canvas = canvas
+        self.history_scrollbar = scrollbar
         
         # Add padding frame
-        content_frame = tk.Frame(scrollable_frame, bg=self.bg_color)
-        content_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.history_content = tk.Frame(scrollable_frame, bg=self.bg_color)
+        self.history_content.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.history_cards = []  # newest first, like the list on screen
+    
+    def refresh_history_screen(self):
+        """Add cards for sessions recorded since the list was last shown"""
+        if not self.session_history:
+            self.history_canvas.pack_forget()
+            self.history_scrollbar.pack_forget()
+            self.history_empty_label.pack(pady=50)
+            return
+        
+        self.history_empty_label.pack_forget()
+        self.history_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=40)
+        self.history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 40))
+        
+        # Sessions list - older cards are kept, new ones go on top. While filtered the
+        # newest card may be hidden, so pack at the end and let the filter reorder
+        for session_num in range(len(self.history_cards) + 1, len(self.session_history) + 1):
+            before = self.history_cards[0] if self.history_cards and not self.history_filtered else None
+            card = self.create_session_card(self.history_content,
+                                            self.session_history[session_num - 1],
+                                            session_num, before=before)
+            self.theme.register_tree(card)
+            self.history_cards.insert(0, card)
+        self.apply_history_filter()
+    
+    def schedule_history_filter(self):
+        """Filter once typing pauses rather than on every keystroke"""
+        if self.history_filter_job is not None:
+            self.root.after_cancel(self.history_filter_job)
+        self.history_filter_job = self.root.after(150, self.apply_history_filter)
+    
+    def history_range_start(self):
+        """Start of the chosen date range, or None for all time"""
+        days = dict(HISTORY_RANGES)[self.history_range.get()]
+        now = self.clock.now()
+        if days is None:
+            return None
+        if days == "year":
+            return now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        return now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days)
+    
+    def apply_history_filter(self):
+        """Show only the session cards matching the search, mood and date range"""
+        self.history_filter_job = None
+        search = self.history_search.get().strip() or None
+        mood = self.history_mood.get() or None
+        start = self.history_range_start()
+        total = self.history_index.aggregate(start, None, mood=mood, search=search)
+        self.history_result_label.config(
+            text=f"{total['sessions']} sessions · {total['focus_seconds'] / 3600:.1f} h focused · "
+                 f"mean focus score {total['mean_score']:.0f}%")
+        
+        if search is None and mood is None and start is None:
+            if self.history_filtered:
+                for card in self.history_cards:
+                    card.pack_forget()
+                for card in self.history_cards:
+                    card.pack(fill=tk.X, pady=10)
+                self.history_filtered = False
+            return
         
-        # Sessions list
-        for i, session in enumerate(reversed(self.session_history)):
-            self.create_session_card(content_frame, session, len(self.session_history) - i)
+        # Cards are newest first, so history position p is card count - 1 - p
+        newest = len(self.history_cards) - 1
+        for card in self.history_cards:
+            card.pack_forget()
+        for position in reversed(self.history_index.select(start, None, mood=mood, search=search)):
+            if position <= newest:
+                self.history_cards[newest - position].pack(fill=tk.X, pady=10)
+        self.history_filtered = True
+        self.history_canvas.yview_moveto(0)
     
-    def create_session_card(self, parent, session, session_num):
+    def create_session_card(self, parent, session, session_num, before=None):
         """Create session card with detailed view button"""
         card = tk.Frame(parent, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
-        card.pack(fill=tk.X, pady=10)
+        if before is not None:
+            card.pack(fill=tk.X, pady=10, before=before)
+        else:
+            card.pack(fill=tk.X, pady=10)
         
         content = tk.Frame(card, bg=self.card_bg)
         content.pack(padx=20, pady=15, fill=tk.X)
@@ -1047,10 +1388,14 @@ Level up to unlock achievements and track your progress!
                             cursor="hand2",
                             activebackground="#2563eb")
         view_btn.pack(pady=(10, 0))
+        
+        return card
     
     def show_session_details(self, session):
         """Show detailed session stats with focus timeline graph"""
-        details_window = tk.Toplevel(self.root)
+        self.close_session_details()
+        details_window = self.details_window = tk.Toplevel(self.root)
+        details_window.protocol("WM_DELETE_WINDOW", self.close_session_details)
         details_window.title("Session Details")
         details_window.geometry("900x700")
         details_window.configure(bg=self.bg_color)
@@ -1110,7 +1455,7 @@ Level up to unlock achievements and track your progress!
                     font=("Helvetica", 14, "bold"),
                     bg=self.card_bg, fg=self.fg_color).pack(pady=10)
             
-            self.create_focus_graph(graph_frame, session['focus_timeline'])
+            self.details_figure = self.create_focus_graph(graph_frame, session['focus_timeline'])
         else:
             tk.Label(details_window, text="No timeline data available for this session",
                     font=("Helvetica", 12),
@@ -1118,7 +1463,7 @@ Level up to unlock achievements and track your progress!
         
         # Close button - IMPROVED VISIBILITY
         close_btn = tk.Button(details_window, text="Close",
-                             command=details_window.destroy,
+                             command=self.close_session_details,
                              font=("Helvetica", 13, "bold"),
                              bg=self.accent_color, fg="white",
                              padx=35, pady=12, relief=tk.FLAT,
@@ -1126,22 +1471,42 @@ Level up to unlock achievements and track your progress!
                              activebackground="#2563eb")
         close_btn.pack(pady=20)
     
+    def close_session_details(self):
+        """Destroy the details window and release its figure"""
+        if self.details_figure is not None:
+            self.details_figure.clear()
+            self.details_figure = None
+        if self.details_window is not None:
+            if self.details_window.winfo_exists():
+                self.details_window.destroy()
+            self.details_window = None
+    
     def create_focus_graph(self, parent, timeline_data):
-        """Create focus timeline graph using matplotlib"""
-        fig, ax = plt.subplots(figsize=(8, 3.5), facecolor=self.card_bg if self.dark_mode.get() else 'white')
+        """Create focus timeline graph using matplotlib; returns the figure.
+        
+        A plain Figure rather than pyplot, which would keep every graph ever
+        opened alive in its figure manager.
+        """
+        fig = Figure(figsize=(8, 3.5), facecolor=self.card_bg if self.dark_mode.get() else 'white')
+        ax = fig.add_subplot()
         
         if self.dark_mode.get():
             ax.set_facecolor(self.bg_color)
         else:
             ax.set_facecolor('#f9fafb')
         
-        # Prepare data
+        # Prepare data; no-camera samples become gaps in the line
         time_points = list(range(len(timeline_data)))
-        focus_values = timeline_data
+        no_camera = [value == FocusEngine.TIMELINE_NO_CAMERA for value in timeline_data]
+        focus_values = [float('nan') if missing else value for value, missing in zip(timeline_data, no_camera)]
         
         # Create the plot
         ax.fill_between(time_points, focus_values, alpha=0.3, color='#3b82f6')
         ax.plot(time_points, focus_values, color='#3b82f6', linewidth=2, marker='o', markersize=4)
+        if any(no_camera):
+            ax.fill_between(time_points, -0.1, 1.1, where=no_camera, step='mid',
+                            color='#6b7280', alpha=0.25, linewidth=0, label='No camera')
+            ax.legend(loc='upper right', fontsize=9)
         
         # Styling
         text_color = self.fg_color if self.dark_mode.get() else '#111827'
@@ -1158,22 +1523,92 @@ Level up to unlock achievements and track your progress!
             for spine in ax.spines.values():
                 spine.set_edgecolor(text_color)
         
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Embed in tkinter
         canvas = FigureCanvasTkAgg(fig, parent)
         canvas.draw()
         canvas.get_tk_widget().pack(padx=20, pady=10, fill=tk.BOTH, expand=True)
+        return fig
     
-    def setup_achievements_screen(self):
-        """NEW: Achievements screen - SCROLLABLE"""
-        self.clear_screen()
-        self.current_screen = "achievements"
+    def setup_dashboard_screen(self):
+        """Show the statistics dashboard"""
+        self.show_screen("dashboard")
+    
+    def build_dashboard_screen(self, container):
+        """Statistics over the whole history; the charts are drawn by refresh_dashboard_screen"""
+        header_frame = tk.Frame(container, bg=self.bg_color)
+        header_frame.pack(fill=tk.X, padx=40, pady=(30, 10))
+        
+        tk.Label(header_frame, text="📈 Dashboard",
+                font=("Helvetica", 24, "bold"),
+                bg=self.bg_color, fg=self.fg_color).pack(side=tk.LEFT)
         
-        # Container
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill=tk.BOTH, expand=True)
+        back_btn = tk.Button(header_frame, text="🏠 Home",
+                            command=self.setup_home_screen,
+                            font=("Helvetica", 12),
+                            bg=self.card_bg, fg=self.fg_color,
+                            padx=20, pady=8, relief=tk.SOLID,
+                            borderwidth=1, cursor="hand2")
+        back_btn.pack(side=tk.RIGHT)
         
+        rebuild_btn = tk.Button(header_frame, text="🔄 Rebuild",
+                                command=self.on_rebuild_rollups,
+                                font=("Helvetica", 12),
+                                bg=self.card_bg, fg=self.fg_color,
+                                padx=20, pady=8, relief=tk.SOLID,
+                                borderwidth=1, cursor="hand2")
+        rebuild_btn.pack(side=tk.RIGHT, padx=10)
+        
+        self.dashboard_summary_label = tk.Label(container, font=("Helvetica", 12),
+                                                bg=self.bg_color, fg=self.text_secondary,
+                                                justify=tk.LEFT)
+        self.dashboard_summary_label.pack(padx=40, anchor="w")
+        
+        self.dashboard_figure = Figure(figsize=(10, 6))
+        self.dashboard_canvas = FigureCanvasTkAgg(self.dashboard_figure, container)
+        self.dashboard_canvas.get_tk_widget().pack(padx=40, pady=10, fill=tk.BOTH, expand=True)
+        self.dashboard_drawn = None  # (sessions, dark mode, day) the charts were drawn for
+        self.dashboard_days = None   # day columns, updated with the days new sessions changed
+    
+    def on_rebuild_rollups(self):
+        """Regenerate the rollups from the history and redraw"""
+        self.rebuild_rollups()
+        self.dashboard_drawn = None
+        self.refresh_dashboard_screen()
+    
+    def refresh_dashboard_screen(self):
+        """Redraw the charts when sessions were added, the theme or the day changed since the last visit"""
+        today = self.clock.now().date()
+        key = (self.rollups.sessions, self.dark_mode.get(), today)
+        if key == self.dashboard_drawn:
+            return
+        start = time.perf_counter()
+        self.dashboard_days = day_arrays(self.rollups, self.dashboard_days)
+        summary = dashboard(self.rollups, today, days=self.dashboard_days)
+        
+        dark = self.dark_mode.get()
+        self.dashboard_figure.set_facecolor(self.card_bg if dark else 'white')
+        plot_dashboard(self.dashboard_figure, summary,
+                       text_color=self.fg_color if dark else '#111827',
+                       face_color=self.bg_color if dark else '#f9fafb')
+        self.dashboard_canvas.draw()
+        
+        cycles, scores = summary["cycles"], summary["scores"]
+        self.dashboard_summary_label.config(
+            text=f"{summary['sessions']} sessions · {summary['focus_hours']:.1f} focused hours · "
+                 f"median focus score {scores['median']:.0f}% · "
+                 f"cycle completion {cycles['rate'] * 100:.0f}% ({cycles['completed']}/{cycles['ended']}) · "
+                 f"day streak {summary['day_streak']}\n{describe_week(summary['week'])}")
+        self.metrics.observe("dashboard_render", time.perf_counter() - start)
+        self.dashboard_drawn = key
+    
+    def setup_achievements_screen(self):
+        """Show the achievements screen"""
+        self.show_screen("achievements")
+    
+    def build_achievements_screen(self, container):
+        """NEW: Achievements screen - SCROLLABLE"""
         # Header (fixed)
         header_container = tk.Frame(container, bg=self.bg_color)
         header_container.pack(fill=tk.X, padx=40, pady=(30, 10))
@@ -1193,13 +1628,11 @@ Level up to unlock achievements and track your progress!
                             borderwidth=1, cursor="hand2")
         back_btn.pack(side=tk.RIGHT)
         
-        # Progress
-        unlocked = sum(1 for a in self.achievements.values() if a["unlocked"])
-        total = len(self.achievements)
-        
-        tk.Label(header_container, text=f"Unlocked: {unlocked}/{total}",
-                font=("Helvetica", 14),
-                bg=self.bg_color, fg=self.text_secondary).pack(pady=10)
+        # Progress - text is filled in by refresh_achievements_screen
+        self.achievements_progress_label = tk.Label(header_container,
+                                                    font=("Helvetica", 14),
+                                                    bg=self.bg_color, fg=self.text_secondary)
+        self.achievements_progress_label.pack(pady=10)
         
         # Scrollable content
         canvas = tk.Canvas(container, bg=self.bg_color, highlightthickness=0)
@@ -1215,24 +1648,32 @@ Level up to unlock achievements and track your progress!
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        self.scroll_canvases["achievements"] = canvas
         
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=40)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 40))
         
         # Achievement grid
-        grid = tk.Frame(scrollable_frame, bg=self.bg_color)
-        grid.pack(pady=20, fill=tk.BOTH, expand=True, padx=20)
-        
-        row, col = 0, 0
-        for key, achievement in self.achievements.items():
-            self.create_achievement_card(grid, achievement, row, col)
-            col += 1
-            if col >= 2:
-                col = 0
-                row += 1
+        self.achievements_grid = tk.Frame(scrollable_frame, bg=self.bg_color)
+        self.achievements_grid.pack(pady=20, fill=tk.BOTH, expand=True, padx=20)
+        self.achievement_cards = {}  # key -> (card, unlocked when drawn)
+    
+    def refresh_achievements_screen(self):
+        """Redraw only the achievement cards whose unlock state changed"""
+        unlocked = sum(1 for a in self.achievements.values() if a["unlocked"])
+        total = len(self.achievements)
+        self.achievements_progress_label.config(text=f"Unlocked: {unlocked}/{total}")
+        
+        for i, (key, achievement) in enumerate(self.achievements.items()):
+            drawn = self.achievement_cards.get(key)
+            if drawn and drawn[1] == achievement["unlocked"]:
+                continue
+            if drawn:
+                drawn[0].destroy()
+            
+            card = self.create_achievement_card(self.achievements_grid, achievement, i // 2, i % 2)
+            self.theme.register_tree(card)
+            self.achievement_cards[key] = (card, achievement["unlocked"])
     
     def create_achievement_card(self, parent, achievement, row, col):
         """Create achievement card"""
@@ -1263,16 +1704,15 @@ Level up to unlock achievements and track your progress!
             tk.Label(card, text="✓ UNLOCKED",
                     font=("Helvetica", 10, "bold"),
                     bg=card["bg"], fg="#22c55e").pack(pady=5)
+        
+        return card
     
     def setup_settings_screen(self):
+        """Show the settings screen"""
+        self.show_screen("settings")
+    
+    def build_settings_screen(self, container):
         """NEW: Settings screen - SCROLLABLE"""
-        self.clear_screen()
-        self.current_screen = "settings"
-        
-        # Container
-        container = tk.Frame(self.root, bg=self.bg_color)
-        container.pack(fill=tk.BOTH, expand=True)
-        
         # Header (fixed)
         header_container = tk.Frame(container, bg=self.bg_color)
         header_container.pack(fill=tk.X, padx=40, pady=(30, 10))
@@ -1306,9 +1746,7 @@ Level up to unlock achievements and track your progress!
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Mousewheel scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        self.scroll_canvases["settings"] = canvas
         
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=40)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0, 40))
@@ -1337,6 +1775,20 @@ Level up to unlock achievements and track your progress!
                           command=self.save_user_progress,
                           activebackground=self.card_bg).pack(anchor=tk.W, pady=3)
         
+        tk.Label(coaching_content, text="Other people in view",
+                font=("Helvetica", 11, "bold"),
+                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W, pady=(10, 3))
+        
+        for policy, label in [("Ignore", "Ignore them - only your face is tracked"),
+                              ("Distraction", "Count them as a distraction (shared rooms, study halls)")]:
+            tk.Radiobutton(coaching_content, text=label,
+                          variable=self.other_faces_policy, value=policy,
+                          font=("Helvetica", 11),
+                          bg=self.card_bg, fg=self.fg_color,
+                          selectcolor=self.card_bg,
+                          command=self.save_user_progress,
+                          activebackground=self.card_bg).pack(anchor=tk.W, pady=3)
+        
         # Privacy Settings
         privacy_card = tk.Frame(main_frame, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
         privacy_card.pack(fill=tk.X, pady=15)
@@ -1385,6 +1837,109 @@ Level up to unlock achievements and track your progress!
                       command=self.save_user_progress,
                       activebackground=self.card_bg).pack(anchor=tk.W, pady=5)
         
+        # Integrations
+        live_card = tk.Frame(main_frame, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
+        live_card.pack(fill=tk.X, pady=15)
+        
+        live_content = tk.Frame(live_card, bg=self.card_bg)
+        live_content.pack(padx=30, pady=20)
+        
+        tk.Label(live_content, text="🔌 Integrations",
+                font=("Helvetica", 14, "bold"),
+                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W, pady=(0, 10))
+        
+        tk.Checkbutton(live_content,
+                      text="Share live focus state with local apps (desk lights, Do-Not-Disturb)",
+                      variable=self.live_api,
+                      font=("Helvetica", 11),
+                      bg=self.card_bg, fg=self.fg_color,
+                      selectcolor=self.card_bg,
+                      command=self.on_live_api_change,
+                      activebackground=self.card_bg).pack(anchor=tk.W, pady=5)
+        
+        tk.Label(live_content, text="✓ Local socket only - try python seemyfocus_live.py --client",
+                font=("Helvetica", 10, "italic"),
+                bg=self.card_bg, fg=self.text_secondary).pack(anchor=tk.W, pady=2)
+        
+        tk.Checkbutton(live_content,
+                      text="Export performance metrics (Prometheus + JSON)",
+                      variable=self.metrics_export,
+                      font=("Helvetica", 11),
+                      bg=self.card_bg, fg=self.fg_color,
+                      selectcolor=self.card_bg,
+                      command=self.on_metrics_export_change,
+                      activebackground=self.card_bg).pack(anchor=tk.W, pady=(10, 5))
+        
+        tk.Label(live_content, text=f"✓ Written to {METRICS_DIR}/ and served on 127.0.0.1:{METRICS_PORT}/metrics",
+                font=("Helvetica", 10, "italic"),
+                bg=self.card_bg, fg=self.text_secondary).pack(anchor=tk.W, pady=2)
+        
+        tk.Checkbutton(live_content,
+                      text="Memory self-check for all-day / kiosk use",
+                      variable=self.memory_check,
+                      font=("Helvetica", 11),
+                      bg=self.card_bg, fg=self.fg_color,
+                      selectcolor=self.card_bg,
+                      command=self.on_memory_check_change,
+                      activebackground=self.card_bg).pack(anchor=tk.W, pady=(10, 5))
+        
+        tk.Label(live_content, text=f"✓ Memory and object counts every {MEMORY_CHECK_INTERVAL // 60} min to {MEMORY_LOG} - python seemyfocus_memory.py --show",
+                font=("Helvetica", 10, "italic"),
+                bg=self.card_bg, fg=self.text_secondary).pack(anchor=tk.W, pady=2)
+        
+        # Camera Settings
+        camera_card = tk.Frame(main_frame, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
+        camera_card.pack(fill=tk.X, pady=15)
+        
+        camera_content = tk.Frame(camera_card, bg=self.card_bg)
+        camera_content.pack(padx=30, pady=20)
+        
+        tk.Label(camera_content, text="📷 Camera Capture Profile",
+                font=("Helvetica", 14, "bold"),
+                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W, pady=(0, 10))
+        
+        for profile, settings in CAPTURE_PROFILES.items():
+            if settings:
+                label = f"{profile} - {settings['width']}x{settings['height']} {settings['fourcc']}, buffer {settings['buffer_size']}"
+            else:
+                label = f"{profile} - whatever the driver picks"
+            tk.Radiobutton(camera_content, text=label,
+                          variable=self.capture_profile, value=profile,
+                          font=("Helvetica", 11),
+                          bg=self.card_bg, fg=self.fg_color,
+                          selectcolor=self.card_bg,
+                          command=self.on_capture_profile_change,
+                          activebackground=self.card_bg).pack(anchor=tk.W, pady=3)
+        
+        tk.Label(camera_content, text="⏱️ Detection CPU Budget",
+                font=("Helvetica", 14, "bold"),
+                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W, pady=(15, 10))
+        
+        for budget in BUDGET_CHOICES:
+            label = "Off - default detector settings" if budget == "Off" else f"{budget} ms per frame - calibrated for this camera"
+            tk.Radiobutton(camera_content, text=label,
+                          variable=self.detector_budget, value=budget,
+                          font=("Helvetica", 11),
+                          bg=self.card_bg, fg=self.fg_color,
+                          selectcolor=self.card_bg,
+                          command=self.on_detector_budget_change,
+                          activebackground=self.card_bg).pack(anchor=tk.W, pady=3)
+        
+        tk.Label(camera_content, text="🧵 Detection Threads",
+                font=("Helvetica", 14, "bold"),
+                bg=self.card_bg, fg=self.fg_color).pack(anchor=tk.W, pady=(15, 10))
+        
+        for workers in WORKER_CHOICES:
+            label = ("Off - faces and eyes on the UI thread" if workers == "Off"
+                     else f"{workers} workers - eyes of one frame alongside faces of the next (one frame later)")
+            tk.Radiobutton(camera_content, text=label,
+                          variable=self.detection_workers, value=workers,
+                          font=("Helvetica", 11),
+                          bg=self.card_bg, fg=self.fg_color,
+                          selectcolor=self.card_bg,
+                          command=self.on_detection_workers_change,
+                          activebackground=self.card_bg).pack(anchor=tk.W, pady=3)
+        
         # Display Settings
         display_card = tk.Frame(main_frame, bg=self.card_bg, relief=tk.RAISED, borderwidth=1)
         display_card.pack(fill=tk.X, pady=15)
@@ -1403,115 +1958,114 @@ Level up to unlock achievements and track your progress!
                       bg=self.card_bg, fg=self.fg_color,
                       selectcolor=self.card_bg,
                       activebackground=self.card_bg).pack(anchor=tk.W, pady=5)
-    
-    def check_achievements(self):
-        """Check and unlock achievements"""
-        if self.total_sessions >= 1 and not self.achievements["first_session"]["unlocked"]:
-            self.achievements["first_session"]["unlocked"] = True
-            self.show_achievement_notification("First Steps")
-        
-        if self.persistent_streak_count >= 10 and not self.achievements["focus_master"]["unlocked"]:
-            self.achievements["focus_master"]["unlocked"] = True
-            self.show_achievement_notification("Focus Master")
-        
-        if self.lifetime_wellness >= 500 and not self.achievements["wellness_warrior"]["unlocked"]:
-            self.achievements["wellness_warrior"]["unlocked"] = True
-            self.show_achievement_notification("Wellness Warrior")
-        
-        if self.level >= 5 and not self.achievements["level_5"]["unlocked"]:
-            self.achievements["level_5"]["unlocked"] = True
-            self.show_achievement_notification("Rising Star")
-        
-        if self.session_cycles >= 5 and not self.achievements["perfect_day"]["unlocked"]:
-            self.achievements["perfect_day"]["unlocked"] = True
-            self.show_achievement_notification("Perfect Day")
-        
-        if self.persistent_streak_count >= 20 and not self.achievements["streak_legend"]["unlocked"]:
-            self.achievements["streak_legend"]["unlocked"] = True
-            self.show_achievement_notification("Streak Legend")
         
+        tk.Checkbutton(display_content,
+                      text="📊 Performance HUD on the video (F12)",
+                      variable=self.performance_hud,
+                      font=("Helvetica", 11),
+                      bg=self.card_bg, fg=self.fg_color,
+                      selectcolor=self.card_bg,
+                      command=self.save_user_progress,
+                      activebackground=self.card_bg).pack(anchor=tk.W, pady=5)
+    
+    def on_capture_profile_change(self):
+        """New capture settings apply the next time the camera opens"""
+        self.camera.set_profile(self.capture_profile.get())
+        if not self.session_active:
+            self.camera.release()
         self.save_user_progress()
     
-    def show_achievement_notification(self, title):
-        """Show achievement unlock notification"""
-        if hasattr(self, 'motivation_label'):
-            self.update_motivation(f"🏆 Achievement Unlocked: {title}!")
+    def on_detector_budget_change(self):
+        self.save_user_progress()
+        if self.session_active:
+            self.prepare_detector()
+    
+    def on_detection_workers_change(self):
+        self.save_user_progress()
+        if self.session_active:
+            self.prepare_pipeline()
+    
+    def prepare_pipeline(self):
+        """Start the detection worker pool the setting asks for, replacing any running one"""
+        self.close_pipeline()
+        workers = self.detection_workers.get()
+        if workers != "Off":
+            self.pipeline = DetectionPipeline(self, int(workers), self.metrics)
+    
+    def close_pipeline(self):
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+    
+    def camera_key(self):
+        """Calibrations are kept per camera and capture profile"""
+        return f"{self.camera.index}:{self.capture_profile.get()}"
+    
+    def prepare_detector(self):
+        """Use this camera's stored calibration for the budget, or start a new one"""
+        budget = self.detector_budget.get()
+        if budget == "Off":
+            self.calibrator = None
+            self.apply_detector(DEFAULT_DETECTOR)
+            return
+        budget_ms = float(budget)
+        if self.calibrator is not None and self.calibrator.state == DetectorCalibrator.SWEEPING:
+            return  # finishes on its thread and is applied from update_camera
+        if self.calibrator is None or self.calibrator.budget_ms != budget_ms:
+            self.calibrator = DetectorCalibrator(budget_ms)
+        stored = self.detector_calibrations.get(self.camera_key())
+        if stored and stored.get("budget_ms") == budget_ms:
+            self.apply_detector(stored["detector"])
+            self.calibrator.watch(stored["frame_ms"])
+        else:
+            self.apply_detector(DEFAULT_DETECTOR)
+            self.calibrator.start()
     
-    def clear_screen(self):
-        """Clear all widgets from screen"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def store_calibration(self, result):
+        if self.pipeline is not None:
+            self.pipeline.flush()  # no eye job may run while the eye tracker is reset
+        self.apply_detector(result["detector"])
+        self.detector_calibrations[self.camera_key()] = {
+            "detector": result["detector"],
+            "frame_ms": round(result["frame_ms"], 1),
+            "budget_ms": self.calibrator.budget_ms,
+            "accuracy": round(result["accuracy"], 3),
+            "calibrated": datetime.now().isoformat(timespec="seconds")
+        }
+        self.save_user_progress()
+        self.update_motivation(f"⚙️ Detection tuned for this camera: {result['frame_ms']:.0f} ms per frame")
     
     def start_session(self):
         """Start a new focus session"""
-        self.session_active = True
-        self.session_start_time = time.time()
-        self.cycle_start_time = time.time()
-        self.current_cycle_type = "focus"
-        self.session_id = datetime.now().isoformat()
-        
-        # Reset session stats
-        self.streak_time_sec = 0
-        self.streak_count = 0
-        self.longest_streak = 0
-        self.wellness_points = 0
-        self.focus_score = 0
-        self.focused_frames = 0
-        self.total_frames = 0
-        self.deep_work_meter = 0
-        self.total_break_time = 0
-        self.focus_timeline = []
-        self.cycles_completed = 0
-        self.session_cycles = 0  # Reset session cycles
-        self.reminder_count = 0
-        self.last_reminder_time = None
-        
-        self.update_motivation("🎯 Session started! Stay focused!")
+        self.notifications.reset()
+        super().start_session()
+        self.prepare_detector()
+        self.prepare_pipeline()
+        self.desk_presence.start()
+        
+        if "main" in self.screens:
+            self.refresh_main_screen()
+        self.publish_live_state()
+        self.schedule_timers()
     
     def end_session(self):
         """End current session and save data"""
         if not self.session_active:
             return
         
-        self.session_active = False
-        session_duration = int(time.time() - self.session_start_time)
-        
-        # Calculate final stats
-        session_data = {
-            "timestamp": self.session_id,
-            "task": self.session_task,
-            "mood": self.session_mood,
-            "session_time": session_duration,
-            "focus_score": self.focus_score,
-            "streak_count": self.session_cycles,  # Use session cycles
-            "longest_streak": self.longest_streak,
-            "wellness_points": self.wellness_points,
-            "break_time": self.total_break_time,
-            "focus_timeline": self.focus_timeline
-        }
-        
-        # Save to history
-        self.session_history.append(session_data)
-        self.save_session_history()
+        session_data, xp_earned = self.finish_session()
+        session_duration = session_data["session_time"]
+        self.cancel_timers()
+        self.close_pipeline()
+        self.publish_live_state()
         
-        # Update lifetime stats
-        self.total_sessions += 1
-        self.lifetime_wellness += self.wellness_points
+        if self.profiler:
+            report = self.profiler.write_report(self.session_id, self.metrics.snapshot())
+            if report:
+                self.update_motivation(f"📊 Frame loop profile written to {report}", NotificationQueue.LOW)
         
-        # Award completion XP
-        xp_earned = self.xp_rewards["complete_session"]
-        self.add_xp(xp_earned, "Session completed!")
-        
-        # Perfect focus bonus
-        if self.focus_score >= 90:
-            bonus_xp = self.xp_rewards["perfect_focus"]
-            self.add_xp(bonus_xp, "Perfect focus!")
-            xp_earned += bonus_xp
-        
-        # Check achievements
-        self.check_achievements()
-        
-        self.save_user_progress()
+        # No session needs the webcam any more
+        self.camera.release()
         
         # Generate AI coaching feedback based on performance
         ai_feedback = self.generate_session_feedback()
@@ -1540,6 +2094,185 @@ Keep up the great work! 💪
         # Return to home
         self.setup_home_screen()
     
+    def schedule_timers(self):
+        """Arm one Tk timer for the engine's next deadline.
+        
+        The delay is recomputed from the absolute deadline every time, so
+        late callbacks never add up, and a stalled camera or throttled
+        detection cannot hold back cycle boundaries or the countdown.
+        """
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+        self.timer_due = self.next_timer_deadline()
+        if self.timer_due is None:
+            return
+        delay_ms = max(0, int((self.timer_due - self.clock.time()) * 1000) + 1)
+        self.timer_id = self.root.after(delay_ms, self.on_timer)
+    
+    def on_timer(self):
+        self.timer_id = None
+        self.metrics.observe("timer_late", max(0.0, self.clock.time() - self.timer_due))
+        self.run_timers()
+        self.publish_live_state()
+        self.schedule_timers()
+    
+    def cancel_timers(self):
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+    
+    def present_reminder(self, message, xp_lost):
+        """Reuse the single reminder popup, auto close after 3 seconds"""
+        self.notifications.show_popup("🔔 Focus Coach", message,
+                                      f"⚠️ -{xp_lost} XP",
+                                      duration=3.0, key="reminder")
+        self.play_audio_cue("reminder", AudioCueEngine.LOW)
+    
+    def show_cycle_timer(self, remaining):
+        minutes = remaining // 60
+        seconds = remaining % 60
+        
+        if hasattr(self, 'cycle_timer_label'):
+            self.cycle_timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
+        
+        if hasattr(self, 'cycle_type_label'):
+            cycle_name = "🎯 FOCUS TIME" if self.current_cycle_type == "focus" else "☕ BREAK TIME"
+            self.cycle_type_label.config(text=cycle_name)
+    
+    def refresh_streak_display(self):
+        if hasattr(self, 'streak_counter_label'):
+            self.streak_counter_label.config(text=str(self.persistent_streak_count))
+        if hasattr(self, 'session_cycles_label'):
+            self.session_cycles_label.config(text=f"This session: {self.session_cycles} cycles")
+    
+    def camera_ready(self):
+        return self.camera.is_ready()
+    
+    def on_live_api_change(self):
+        if self.live_api.get():
+            self.start_live_api()
+        else:
+            self.stop_live_api()
+        self.save_user_progress()
+    
+    def start_live_api(self):
+        if self.live_server is None:
+            self.live_server = LiveStateServer()
+            if not self.live_server.start():
+                self.live_server = None
+                self.update_motivation("⚠️ Live state API could not start")
+                return
+        self.publish_live_state()
+    
+    def stop_live_api(self):
+        if self.live_server is not None:
+            self.live_server.stop()
+            self.live_server = None
+    
+    def publish_live_state(self):
+        """Cheap enough for every frame - only changes are pushed"""
+        if self.live_server is not None:
+            self.live_server.publish(self.live_state())
+    
+    def on_metrics_export_change(self):
+        if self.metrics_export.get():
+            self.start_metrics_export()
+        else:
+            self.stop_metrics_export()
+        self.save_user_progress()
+    
+    def start_metrics_export(self):
+        if self.metrics_exporter is None:
+            self.metrics_exporter = MetricsExporter(self.metrics, METRICS_DIR, port=METRICS_PORT)
+            self.metrics_exporter.start()
+    
+    def stop_metrics_export(self):
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+    
+    def on_memory_check_change(self):
+        if self.memory_check.get():
+            self.start_memory_check()
+        else:
+            self.stop_memory_check()
+        self.save_user_progress()
+    
+    def start_memory_check(self):
+        if self.memory_monitor is None:
+            self.memory_monitor = MemoryMonitor(MEMORY_LOG)
+            self.memory_monitor.add_probe("tk_widgets", self.count_widgets)
+            self.memory_monitor.add_probe("after_callbacks",
+                                          lambda: len(self.root.tk.splitlist(self.root.tk.call("after", "info"))))
+            self.memory_monitor.add_probe("theme_entries", lambda: len(self.theme.entries))
+            self.memory_monitor.add_probe("history_cards", lambda: len(getattr(self, "history_cards", [])))
+            self.memory_monitor.add_probe("details_windows", lambda: int(self.details_window is not None))
+            self.check_memory()
+    
+    def stop_memory_check(self):
+        if self.memory_check_id is not None:
+            self.root.after_cancel(self.memory_check_id)
+            self.memory_check_id = None
+        self.memory_monitor = None
+    
+    def check_memory(self):
+        """Sample on the Tk thread - the probes walk the widget tree"""
+        self.memory_check_id = None
+        if self.memory_monitor is None:
+            return
+        self.memory_monitor.sample()
+        self.memory_check_id = self.root.after(MEMORY_CHECK_INTERVAL * 1000, self.check_memory)
+    
+    def count_widgets(self):
+        count = 0
+        stack = [self.root]
+        while stack:
+            widget = stack.pop()
+            count += 1
+            stack.extend(widget.winfo_children())
+        return count
+    
+    def memory_metrics(self):
+        latest = self.memory_monitor.latest() if self.memory_monitor else None
+        if not latest:
+            return {}
+        return {"resident_kb": latest["rss_kb"], "python_objects": latest["objects"]}
+    
+    def toggle_performance_hud(self):
+        self.performance_hud.set(not self.performance_hud.get())
+        self.save_user_progress()
+    
+    def camera_metrics(self):
+        stats = self.camera.stats()
+        return {
+            "camera_fps": stats["fps"],
+            "camera_frames_dropped": stats["frames_dropped"],
+            "camera_read_failures": stats["read_failures"],
+            "camera_read_timeouts": stats["read_timeouts"],
+            "camera_disconnects": stats["disconnects"],
+            "camera_reconnect_ms": stats["reconnect_ms"],
+            "glass_to_state_ms": stats["glass_to_state_ms"]
+        }
+    
+    def pipeline_metrics(self):
+        if self.pipeline is None:
+            return {"pipeline_workers": 0}
+        return self.pipeline.stats()
+    
+    def calibration_metrics(self):
+        return {
+            "detector_calibration_runs": self.calibrator.runs if self.calibrator else 0,
+            "detector_scale": self.detector["scale"],
+            "detector_face_scale_factor": self.detector["face_scale_factor"]
+        }
+    
+    def show_achievement_notification(self, title):
+        """Show achievement unlock notification"""
+        self.update_motivation(f"🏆 Achievement Unlocked: {title}!",
+                               priority=NotificationQueue.HIGH)
+        self.play_audio_cue("achievement")
+    
     def generate_session_feedback(self):
         """Generate AI coaching feedback based on session performance"""
         focus_score = self.focus_score
@@ -1586,318 +2319,136 @@ Keep up the great work! 💪
         import random
         return random.choice(messages) + wellness_msg
     
-    def update_cycle_timer(self):
-        """Update cycle timer display"""
-        if not self.session_active or not self.cycle_start_time:
-            return
-        
-        current_time = time.time()
-        elapsed = int(current_time - self.cycle_start_time)
-        
-        if self.current_cycle_type == "focus":
-            remaining = self.focus_cycle_duration - elapsed
-            if remaining <= 0:
-                # Focus cycle complete - only increment if actually focused OR in paper mode with face present
-                is_paper_mode_focused = self.offscreen_mode.get() and self.cap and self.cap.isOpened()
-                
-                if self.current_state == "Focused" or is_paper_mode_focused:
-                    self.cycles_completed += 1
-                    self.session_cycles += 1
-                    self.persistent_streak_count += 1  # Increment persistent streak
-                    
-                    self.add_xp(self.xp_rewards["complete_cycle"], "Cycle complete!")
-                    self.update_motivation("🎉 Focus cycle complete! Take a break!")
-                    
-                    # Update displays
-                    if hasattr(self, 'streak_counter_label'):
-                        self.streak_counter_label.config(text=str(self.persistent_streak_count))
-                    if hasattr(self, 'session_cycles_label'):
-                        self.session_cycles_label.config(text=f"This session: {self.session_cycles} cycles")
-                    
-                    self.check_achievements()
-                    self.save_user_progress()
-                else:
-                    self.update_motivation("⚠️ Cycle ended but focus was lost. No streak bonus.")
-                
-                # Switch to break
-                self.current_cycle_type = "break"
-                self.cycle_start_time = time.time()
-                return
-        else:  # break
-            remaining = self.break_cycle_duration - elapsed
-            if remaining <= 0:
-                # Break complete!
-                self.wellness_points += 10
-                self.add_xp(self.xp_rewards["take_break"], "Break taken!")
-                self.update_motivation("💪 Break over! Back to focus!")
-                
-                # Switch to focus
-                self.current_cycle_type = "focus"
-                self.cycle_start_time = time.time()
-                return
-        
-        # Update display
-        minutes = remaining // 60
-        seconds = remaining % 60
-        
-        if hasattr(self, 'cycle_timer_label'):
-            self.cycle_timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
-        
-        if hasattr(self, 'cycle_type_label'):
-            cycle_name = "🎯 FOCUS TIME" if self.current_cycle_type == "focus" else "☕ BREAK TIME"
-            self.cycle_type_label.config(text=cycle_name)
-    
-    def detect_eye_gaze(self, frame, gray, face_rect):
-        """Detect if eyes are looking at screen - enhanced to catch side-eyeing"""
-        x, y, w, h = face_rect
-        roi_gray = gray[y:y+h, x:x+w]
-        
-        # Detect eyes
-        eyes = self.eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
-        
-        if len(eyes) >= 2:
-            eye_centers = []
-            for (ex, ey, ew, eh) in eyes[:2]:  # Only use first 2 eyes detected
-                # Get eye center
-                cx = ex + ew // 2
-                cy = ey + eh // 2
-                eye_centers.append((cx, cy))
-            
-            # Add to history
-            self.eye_history.append(eye_centers)
-            if len(self.eye_history) > self.eye_history_length:
-                self.eye_history.pop(0)
-            
-            # Analyze eye movement to detect side-eyeing
-            if len(self.eye_history) >= 3:
-                recent_positions = self.eye_history[-3:]
-                deviations = []
-                
-                # Calculate deviation between consecutive frames
-                for i in range(len(recent_positions) - 1):
-                    for j in range(min(len(recent_positions[i]), len(recent_positions[i+1]))):
-                        if j < len(recent_positions[i]) and j < len(recent_positions[i+1]):
-                            dx = recent_positions[i+1][j][0] - recent_positions[i][j][0]
-                            dy = recent_positions[i+1][j][1] - recent_positions[i][j][1]
-                            deviation = np.sqrt(dx**2 + dy**2)
-                            deviations.append(deviation)
-                
-                if deviations:
-                    avg_deviation = np.mean(deviations)
-                    
-                    # Check for horizontal eye movement (side-eyeing)
-                    # If eyes are moving horizontally a lot, user is looking away
-                    horizontal_movements = []
-                    for i in range(len(recent_positions) - 1):
-                        for j in range(min(len(recent_positions[i]), len(recent_positions[i+1]))):
-                            if j < len(recent_positions[i]) and j < len(recent_positions[i+1]):
-                                dx = abs(recent_positions[i+1][j][0] - recent_positions[i][j][0])
-                                horizontal_movements.append(dx)
-                    
-                    if horizontal_movements:
-                        avg_horizontal = np.mean(horizontal_movements)
-                        # If strong horizontal movement, they're side-eyeing
-                        if avg_horizontal > 8:  # LOWERED threshold - stricter detection of side-eyeing
-                            return True, False  # Eyes detected but not looking straight
-                    
-                    # Overall deviation check
-                    looking_straight = avg_deviation < self.gaze_deviation_threshold
-                    return True, looking_straight
-            
-            # Not enough history yet, assume looking straight
-            return True, True
-        
-        # Eyes not detected
-        return False, False
-    
     def update_camera(self):
         """Update camera feed and process detection"""
-        if not self.cap or not self.cap.isOpened():
+        self.camera_loop_id = None
+        
+        # The loop ends once nothing is showing or recording the feed
+        if not self.session_active and self.current_screen != "main":
+            self.metrics.loop_idle()
             return
         
-        ret, frame = self.cap.read()
-        if not ret:
-            self.root.after(33, self.update_camera)
+        if not self.camera.is_ready():
+            # Opening, or gone and being reconnected by the camera supervisor
+            if self.camera.state == CameraManager.RECONNECTING:
+                if self.session_active:
+                    self.process_no_camera()
+                else:
+                    self.status_label.config(text="📷 No camera - reconnecting...", fg="#ef4444")
+                self.publish_live_state()
+            self.camera_loop_id = self.root.after(self.CAMERA_POLL_MS, self.update_camera)
             return
         
-        frame = cv2.flip(frame, 1)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100))
+        # Breaks run in low-power mode: the camera decodes a couple of frames a second
+        low_power = self.in_break()
+        self.camera.frame_interval = BREAK_FRAME_INTERVAL if low_power else 0.0
         
-        if self.session_active:
-            self.process_face_detection(frame, faces, gray)
+        metrics = self.metrics
+        frame_start = t = metrics.now()
+        buffer = self.frame_pool.next_frame()
+        ret, frame = self.camera.read(out=buffer)
+        if not ret:
+            # The reader thread has not delivered the next frame yet; check back soon
+            self.camera_loop_id = self.root.after(50 if low_power else 5, self.update_camera)
+            return
+        if frame is not buffer:
+            self.frame_pool.adopt(frame)
+        t = metrics.lap("capture", t)
+        
+        # Detection doesn't care about mirroring, so it runs on the raw frame
+        gray = self.frame_pool.to_gray(frame)
+        t = metrics.add("convert", t)
+        if low_power:
+            if self.pipeline is not None and self.pipeline.in_flight:
+                self.pipeline.flush()  # frames from the end of the focus cycle
+            present = self.break_presence.check(gray, self.clock.time())
+            self.process_break_presence(frame, present)
+            self.camera.mark_state_updated()
+            t = metrics.lap("presence", t)
+            detection_ms = None
+        elif self.session_active and self.offscreen_mode.get():
+            if self.pipeline is not None and self.pipeline.in_flight:
+                self.pipeline.flush()
+            present = self.desk_presence.check(gray, self.clock.time(), self.detect_faces)
+            self.process_face_detection(frame, (), gray, present=present)
+            self.camera.mark_state_updated()
+            t = metrics.lap("presence", t)
+            detection_ms = None
+        elif self.session_active and self.pipeline is not None:
+            # Faces and eyes are found on the workers; the state for this frame lands a frame or two later
+            if self.pipeline.submit(frame, gray):
+                self.camera.mark_state_updated()
+            t = metrics.lap("process", t)
+            detection_ms = metrics.recent_ms("pipeline_faces") + metrics.recent_ms("pipeline_eyes")
         else:
-            for (x, y, w, h) in faces:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (100, 100, 100), 2)
-        
-        # Update cycle timer
-        self.update_cycle_timer()
-        
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(frame_rgb)
-        imgtk = ImageTk.PhotoImage(image=img)
-        self.video_canvas.imgtk = imgtk
-        self.video_canvas.configure(image=imgtk)
-        
-        self.root.after(33, self.update_camera)
-    
-    def process_face_detection(self, frame, faces, gray):
-        """Process face detection with enhanced buffer system and paper mode support"""
-        current_time = time.time()
-        self.total_frames += 1
-        
-        # Update timeline
-        is_focused_state = (self.current_state == "Focused") or (self.offscreen_mode.get() and len(faces) > 0)
-        if self.last_timeline_update is None or current_time - self.last_timeline_update >= self.timeline_interval:
-            self.focus_timeline.append(1 if is_focused_state else 0)
-            self.last_timeline_update = current_time
-        
-        eyes_detected = False
-        looking_straight = False
-        detected_state = "Away"
+            faces = self.detect_faces(gray)
+            t = metrics.lap("face_detect", t)
+            if self.session_active:
+                self.process_face_detection(frame, faces, gray)
+                self.camera.mark_state_updated()
+                t = metrics.lap("process", t)
+            detection_ms = metrics.recent_ms("face_detect") + metrics.recent_ms("eye_gaze")
         
-        # Paper mode handling
-        if self.offscreen_mode.get():
-            # In paper mode, just check if face is present anywhere in frame
-            if len(faces) > 0:
-                # Face detected = still working, treat as focused
-                eyes_detected = True
-                looking_straight = True
-                detected_state = "Focused"  # Treat as focused in paper mode
-            else:
-                # No face at all = actually away
-                detected_state = "Away"
-        else:
-            # Normal mode - check eye gaze and distance
-            if len(faces) > 0:
-                x, y, w, h = faces[0]
-                
-                # Check if too close first
-                face_ratio = w / frame.shape[1]
-                
-                if face_ratio > self.TOO_CLOSE_THRESHOLD:
-                    detected_state = "TooClose"
-                    eyes_detected = False
-                    looking_straight = False
-                else:
-                    # Not too close, check eye gaze
-                    eyes_detected, looking_straight = self.detect_eye_gaze(frame, gray, (x, y, w, h))
-                    
-                    if eyes_detected and looking_straight:
-                        self.eyes_detected_count += 1
-                        self.no_eyes_count = 0
-                        detected_state = "Focused"
-                    else:
-                        self.no_eyes_count += 1
-                        # More forgiving - short glances away are okay
-                        if self.no_eyes_count < self.eye_detection_threshold:
-                            eyes_detected = True
-                            looking_straight = True
-                            detected_state = "Focused"
-                        else:
-                            self.eyes_detected_count = 0
-                            detected_state = "Away"
-            else:
-                # No face detected at all
-                self.eyes_detected_count = 0
-                self.no_eyes_count += 1
-                detected_state = "Away"
-        
-        # Apply distraction buffer - don't break streak immediately
-        # SPECIAL HANDLING FOR PAPER MODE - if face present, never mark as Away
-        if self.offscreen_mode.get() and len(faces) > 0:
-            # In paper mode with face present, always treat as focused
-            detected_state = "Focused"
-            self.distraction_start_time = None  # Reset distraction timer
-            
-            if self.current_state == "Away":
-                if self.return_buffer_start is None:
-                    self.return_buffer_start = current_time
-                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
-                    self.current_state = "Focused"
-            else:
-                self.current_state = "Focused"
-                self.return_buffer_start = None
-        elif detected_state == "Away":
-            if self.distraction_start_time is None:
-                self.distraction_start_time = current_time
-            elif current_time - self.distraction_start_time >= self.distraction_buffer:
-                # Been away for buffer period
-                if self.current_state != "Away":
-                    # Break streak ONLY during focus time
-                    if self.current_cycle_type == "focus":
-                        self.update_motivation("❌ Distracted! Streak broken.")
-                        self.persistent_streak_count = 0  # Reset persistent streak
-                        if hasattr(self, 'streak_counter_label'):
-                            self.streak_counter_label.config(text="0")
-                        self.save_user_progress()
-                    
-                    # Show reminder
-                    if self.current_cycle_type == "focus":
-                        self.show_unfocus_reminder()
-                
-                self.current_state = "Away"
-                self.return_buffer_start = None
-        elif detected_state == "TooClose":
-            # Reset distraction buffer for too close
-            self.distraction_start_time = None
-            
-            if self.current_state == "Away":
-                if self.return_buffer_start is None:
-                    self.return_buffer_start = current_time
-                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
-                    self.current_state = "TooClose"
-            else:
-                self.current_state = "TooClose"
-                self.return_buffer_start = None
-        else:  # Focused
-            # Reset distraction buffer
-            self.distraction_start_time = None
+        if self.session_active:
+            if self.calibrator is not None and self.primary_face is not None and detection_ms is not None:
+                result = self.calibrator.observe(gray, detection_ms)
+                if result is not None:
+                    self.store_calibration(result)
+            # A frame that starts a distraction buffer can bring the next deadline forward
+            due = self.next_timer_deadline()
+            if due is not None and (self.timer_due is None or due < self.timer_due):
+                self.schedule_timers()
+        self.publish_live_state()
+        
+        # The session screen is cached, so the video label outlives navigation;
+        # only pay for the display conversion while it is visible
+        if self.current_screen == "main":
+            t = metrics.now()
+            display = self.frame_pool.to_display(frame)
+            width = frame.shape[1]
+            t = metrics.add("convert", t)
             
-            if self.current_state == "Away":
-                if self.return_buffer_start is None:
-                    self.return_buffer_start = current_time
-                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
-                    self.current_state = "Focused"
+            if low_power and self.privacy_shield.get():
+                display = privacy_blur(display, out=display)
+                cv2.putText(display, "Break - video blurred", (20, 40), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.9, (255, 255, 255), 2, cv2.LINE_AA)
+            elif self.session_active:
+                if self.offscreen_mode.get() and self.desk_presence.region is not None:
+                    x, y, w, h = mirror_faces([self.desk_presence.region], width)[0]
+                    cv2.rectangle(display, (x, y), (x + w, y + h), (100, 100, 100), 1)
+                primary = [self.primary_face] if self.primary_face is not None else []
+                self.draw_overlay(display, mirror_faces(primary, width), self.eyes_looking_straight,
+                                  mirror_faces(self.other_faces, width))
             else:
-                self.current_state = "Focused"
-                self.return_buffer_start = None
-        
-        # Update focus tracking - count TooClose AND PAPER MODE as focused for stats
-        if self.current_state in ["Focused", "TooClose"] or (self.offscreen_mode.get() and len(faces) > 0):
-            self.focused_frames += 1
-            
-            if self.streak_start_time is None:
-                self.streak_start_time = current_time
+                shown_faces = mirror_faces(faces, width)
+                for (x, y, w, h) in shown_faces:
+                    cv2.rectangle(display, (x, y), (x+w, y+h), (100, 100, 100), 2)
+            t = metrics.lap("overlay", t)
             
-            self.streak_time_sec = int(current_time - self.streak_start_time)
-            
-            # Award XP for sustained focus
-            if self.streak_time_sec > 0 and self.streak_time_sec % 600 == 0:  # Every 10 minutes
-                self.add_xp(self.xp_rewards["maintain_focus_10min"], "10 min focus!")
-        
-        elif self.current_state == "Away" and not (self.offscreen_mode.get() and len(faces) > 0):
-            if self.break_start_time is None:
-                self.break_start_time = current_time
-        
-        # Update progress
-        if self.last_state == "Away" and self.current_state in ["Focused", "TooClose"]:
-            self.streak_start_time = current_time
-            self.streak_time_sec = 0
-            self.break_start_time = None
+            rgba = self.frame_pool.to_rgba(display)
+            t = metrics.add("convert", t)
+            self.show_video_frame(rgba)
+            metrics.lap("display", t)
         
-        self.last_state = self.current_state
+        metrics.frame_done(frame_start)
         
-        # Calculate focus score
-        if self.total_frames > 0:
-            self.focus_score = int((self.focused_frames / self.total_frames) * 100)
-            self.deep_work_meter = self.focus_score
-        
-        self.draw_overlay(frame, faces, eyes_detected and looking_straight)
-        self.update_stats_display()
+        self.camera_loop_id = self.root.after(int(BREAK_FRAME_INTERVAL * 1000) if low_power else 33, self.update_camera)
+    
+    def show_video_frame(self, rgba):
+        """Paste into the existing Tk photo instead of creating one per frame"""
+        img = Image.fromarray(rgba)
+        if self.video_photo is None or (self.video_photo.width(), self.video_photo.height()) != img.size:
+            self.video_photo = ImageTk.PhotoImage(image=img)
+            self.video_canvas.imgtk = self.video_photo
+            self.video_canvas.configure(image=self.video_photo)
+        else:
+            self.video_photo.paste(img)
     
-    def draw_overlay(self, frame, faces, eyes_looking_straight):
-        """Draw overlay with GREEN for focused, ORANGE for too close, RED for away"""
+    def draw_overlay(self, frame, faces, eyes_looking_straight, others=()):
+        """Draw overlay with GREEN for focused, ORANGE for too close, RED for away; other people in gray"""
+        for (x, y, w, h) in others:
+            cv2.rectangle(frame, (x, y), (x+w, y+h), (100, 100, 100), 1)
+        
         for (x, y, w, h) in faces:
             # Color based on state
             if self.current_state == "Focused":
@@ -1938,10 +2489,34 @@ Keep up the great work! 💪
         if self.offscreen_mode.get():
             cv2.putText(frame, "Paper Mode: No eye tracking", (10, 90), 
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (34, 197, 94), 2)
+        
+        if self.performance_hud.get():
+            self.draw_performance_hud(frame)
+    
+    def draw_performance_hud(self, frame):
+        """Recent per-stage milliseconds, FPS, dropped frames and eye cascade skips, bottom left"""
+        metrics = self.metrics
+        ms = metrics.recent_ms
+        camera = self.camera.stats()
+        eyes = self.eye_tracker.stats()
+        lines = [
+            f"FPS {metrics.gauges['effective_fps']:4.1f}  cam {camera['fps']:4.1f}  "
+            f"drops {camera['frames_dropped'] + camera['read_failures']}  lost {camera['disconnects']}",
+            f"cap {ms('capture'):4.1f}  cvt {ms('convert'):4.1f}  face {ms('face_detect'):4.1f}  "
+            f"eye {ms('eye_gaze'):4.1f}",
+            f"proc {ms('process'):4.1f}  ovl {ms('overlay'):4.1f}  disp {ms('display'):4.1f} ms",
+            f"eye cascade skipped {eyes['eye_cascade_skip_ratio'] * 100:3.0f}%  misses {eyes['eye_misses']}"
+        ]
+        height = frame.shape[0]
+        top = height - 10 - 20 * len(lines)
+        cv2.rectangle(frame, (5, top - 5), (330, height - 5), (0, 0, 0), -1)
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (10, top + 15 + 20 * i), cv2.FONT_HERSHEY_SIMPLEX,
+                       0.45, (255, 255, 255), 1)
     
     def update_stats_display(self):
         """Update stats display - IMPROVED CLARITY with all states"""
-        status_colors = {"Focused": "#22c55e", "TooClose": "#f59e0b", "Away": "#ef4444"}
+        status_colors = {"Focused": "#22c55e", "TooClose": "#f59e0b", "Away": "#ef4444", "NoCamera": "#6b7280"}
         
         if self.offscreen_mode.get() and self.current_state == "Focused":
             status_text_display = "✍️ Off-Screen Work"
@@ -1950,7 +2525,8 @@ Keep up the great work! 💪
             status_text_map = {
                 "Focused": "✓ Focused", 
                 "TooClose": "⚠ Too Close", 
-                "Away": "✗ Away"
+                "Away": "✗ Away",
+                "NoCamera": "📷 No Camera"
             }
             status_text_display = status_text_map.get(self.current_state, "Ready")
             status_color = status_colors.get(self.current_state, "#111827")
@@ -1971,40 +2547,51 @@ Keep up the great work! 💪
             self.focus_score_label.config(text=f"{self.focus_score}%")
         
         if hasattr(self, 'session_time_label') and self.session_start_time:
-            session_time = int(time.time() - self.session_start_time)
+            session_time = int(self.clock.time() - self.session_start_time)
             self.session_time_label.config(text=f"{session_time}s")
         
         if hasattr(self, 'deep_work_label'):
             self.deep_work_label.config(text=f"⚡ Deep Work: {self.deep_work_meter}%")
         
+        if hasattr(self, 'level_label'):
+            self.level_label.config(text=f"⭐ Level {self.level}")
+        
         if hasattr(self, 'xp_label'):
             self.xp_label.config(text=f"XP: {self.xp}/{self.xp_to_next_level}")
             
         if hasattr(self, 'xp_progress'):
             self.xp_progress['value'] = (self.xp / self.xp_to_next_level) * 100
     
-    def update_motivation(self, message):
-        """Update motivation message"""
-        if hasattr(self, 'motivation_label'):
-            self.motivation_label.config(text=message)
-            
-            # Auto-clear after 3 seconds
-            self.root.after(3000, lambda: self.motivation_label.config(text=""))
+    def update_motivation(self, message, priority=NotificationQueue.NORMAL):
+        """Update motivation message - queued, merged and auto-cleared after 3 seconds"""
+        self.notifications.notify(message, priority=priority, duration=3.0)
     
     def cleanup(self):
         """Cleanup resources"""
-        if self.cap:
-            self.cap.release()
+        self.camera.release()
+        if self.camera_loop_id is not None:
+            self.root.after_cancel(self.camera_loop_id)
+        self.cancel_timers()
         
-        # Save progress before closing
+        # Save progress before closing; its messages and cues still need the queues below
         if self.session_active:
             self.end_session()
         
+        self.notifications.shutdown()
+        if self.audio:
+            self.audio.shutdown()
+        self.stop_live_api()
+        self.stop_metrics_export()
+        self.stop_memory_check()
+        self.close_session_details()
+        if self.profiler:
+            self.profiler.stop()
+        
         self.root.destroy()
 
 def main():
     root = tk.Tk()
-    app = SeeMyFocusApp(root)
+    app = SeeMyFocusApp(root, profile_mode=parse_profile_arg(sys.argv[1:]))
     root.protocol("WM_DELETE_WINDOW", app.cleanup)
     root.mainloop()
 
@@ -0,0 +1,385 @@
+"""Session history analytics for SeeMyFocus
+
+The only statistics used to be the per-session numbers in the session
+details window. The dashboard reads the daily rollups (seemyfocus_rollups)
+into NumPy columns, one row per day, and every figure is a few vectorised
+operations over those rows:
+
+- focus minutes per day and per week (weeks start on Monday);
+- the focus score distribution;
+- sessions, focus minutes and mean score by task and by mood, with
+  labels compared case- and whitespace-insensitively;
+- a weekday x hour heatmap of focused minutes, with long sessions spread
+  over every hour they cover;
+- the cycle completion rate: focus cycles that ended while focused, out
+  of the focus cycles that ran to their end;
+- the day streak and this week against the last.
+
+The cost depends on the number of days in the history, not the number of
+sessions, and a dashboard kept open only re-reads the days that new
+sessions changed. HistoryArrays loads the raw history into columns
+instead; --check uses it to confirm the rollups match a full scan.
+    
+    python seemyfocus_analytics.py                 # summary of seemyfocus_history.json
+    python seemyfocus_analytics.py --check         # rollups against a full scan of the history
+    python seemyfocus_analytics.py --bench 10000   # dashboard time on synthetic sessions
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from seemyfocus_rollups import (Rollups, ROLLUPS_FILE, SCORE_BUCKETS, describe_week,
+                                session_start, session_totals, week_of)
+
+SCORE_BINS = np.linspace(0, 100, SCORE_BUCKETS + 1)
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+
+
+def weekday(days):
+    """Monday = 0 for a datetime64[D] array"""
+    return (days.astype(np.int64) + EPOCH_WEEKDAY) % 7
+
+
+class DayArrays:
+    """Rollup day rows between first and last (default: all of them) as NumPy columns.
+    
+    update() brings the columns in step with rows the rollups changed since,
+    so a dashboard kept open only re-reads the days new sessions touched.
+    """
+    
+    COLUMNS = ("sessions", "focus_seconds", "away_seconds", "cycles", "cycles_ended")
+    
+    def __init__(self, rollups, first=None, last=None):
+        self.rollups = rollups
+        self.first = first and first.isoformat()
+        self.last = last and last.isoformat()
+        self.seen = len(rollups.changed_days)
+        self.load(sorted(key for key in rollups.days if self.covers(key)))
+    
+    def covers(self, key):
+        return (self.first is None or key >= self.first) and (self.last is None or key <= self.last)
+    
+    def load(self, keys):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.day = np.array(keys, dtype="datetime64[D]")
+        for name, values in self.read(keys).items():
+            setattr(self, name, values)
+    
+    def read(self, keys):
+        """Columns of the given day rows"""
+        rows = [self.rollups.days[key] for key in keys]
+        count = len(rows)
+        columns = {name: np.fromiter((row[name] for row in rows), dtype=np.float64, count=count)
+                   for name in self.COLUMNS}
+        columns["score_counts"] = np.array([row["score_counts"] for row in rows],
+                                           dtype=np.float64).reshape(count, SCORE_BUCKETS)
+        columns["hour_focus"] = np.array([row["hour_focus"] for row in rows], dtype=np.float64).reshape(count, 24)
+        columns["tasks"] = [row["tasks"] for row in rows]
+        columns["moods"] = [row["moods"] for row in rows]
+        return columns
+    
+    def update(self):
+        """Re-read the day rows changed since the last read; returns how many were read"""
+        changed = {key for key in self.rollups.changed_days[self.seen:] if self.covers(key)}
+        self.seen = len(self.rollups.changed_days)
+        if not changed:
+            return 0
+        known = sorted(key for key in changed if key in self.index)
+        if known:
+            rows = [self.index[key] for key in known]
+            for name, values in self.read(known).items():
+                column = getattr(self, name)
+                if isinstance(column, list):
+                    for row, value in zip(rows, values):
+                        column[row] = value
+                else:
+                    column[rows] = values
+        added = sorted(changed.difference(known))
+        if added:
+            if self.keys and added[0] < self.keys[-1]:
+                # A session recorded for an earlier day than the newest one: read everything in order
+                self.load(sorted(self.keys + added))
+            else:
+                for name, values in self.read(added).items():
+                    column = getattr(self, name)
+                    if isinstance(column, list):
+                        column.extend(values)
+                    else:
+                        setattr(self, name, np.concatenate((column, values)))
+                self.index.update((key, len(self.keys) + i) for i, key in enumerate(added))
+                self.keys.extend(added)
+                self.day = np.concatenate((self.day, np.array(added, dtype="datetime64[D]")))
+        return len(changed)
+    
+    def __len__(self):
+        return len(self.day)
+
+
+class HistoryArrays:
+    """The raw session history as NumPy columns, one row per session with a readable start time"""
+    
+    def __init__(self, history):
+        stamps = [session_start(session) or "NaT" for session in history]
+        try:
+            start = np.array(stamps, dtype="datetime64[s]")
+        except ValueError:
+            start = np.array([self.parse(stamp) for stamp in stamps], dtype="datetime64[s]")
+        keep = ~np.isnat(start)
+        if not keep.all():
+            history = [session for session, ok in zip(history, keep) if ok]
+            start = start[keep]
+        count = len(history)
+        totals = [session_totals(session) for session in history]
+        
+        def column(key):
+            return np.fromiter((row[key] for row in totals), dtype=np.float64, count=count)
+        
+        self.start = start
+        self.day = start.astype("datetime64[D]")
+        self.focus_seconds = column("focus_seconds")
+        self.away_seconds = column("away_seconds")
+        self.cycles = column("cycles")
+        self.cycles_ended = column("cycles_ended")
+        self.wellness = column("wellness")
+        self.xp = column("xp")
+    
+    @staticmethod
+    def parse(stamp):
+        try:
+            return np.datetime64(stamp, "s")
+        except ValueError:
+            return np.datetime64("NaT")
+    
+    def __len__(self):
+        return len(self.start)
+
+
+def focus_per_day(rollups, first, last):
+    """(days, focused minutes) for every calendar day from first to last"""
+    rows = rollups.day_rows(first, last)
+    days = np.array([day.isoformat() for day, _ in rows], dtype="datetime64[D]")
+    minutes = np.fromiter((row["focus_seconds"] / 60 if row else 0.0 for _, row in rows), dtype=np.float64,
+                          count=len(rows))
+    return days, minutes
+
+
+def focus_per_week(rollups):
+    """(Monday of each week, focused minutes), oldest first"""
+    keys = sorted(rollups.weeks)
+    minutes = np.fromiter((rollups.weeks[key]["focus_seconds"] / 60 for key in keys), dtype=np.float64,
+                          count=len(keys))
+    return np.array(keys, dtype="datetime64[D]"), minutes
+
+
+def score_distribution(days):
+    """Histogram of session focus scores, with mean, median and 90th percentile read off it"""
+    counts = days.score_counts.sum(axis=0) if len(days) else np.zeros(SCORE_BUCKETS)
+    total = counts.sum()
+    if not total:
+        return {"bins": SCORE_BINS, "counts": counts, "mean": 0.0, "median": 0.0, "p90": 0.0}
+    score_sum = sum(entry[2] for tasks in days.tasks for entry in tasks.values())
+    # Percentiles interpolated within their 10-point bucket
+    cumulative = np.concatenate(([0.0], np.cumsum(counts))) / total
+    median, p90 = np.interp([0.5, 0.9], cumulative, SCORE_BINS)
+    return {"bins": SCORE_BINS, "counts": counts, "mean": score_sum / total,
+            "median": float(median), "p90": float(p90)}
+
+
+def breakdown(days, by="task"):
+    """Rows of {name, sessions, focus_minutes, mean_score}, most focused first"""
+    merged = {}
+    for entries in (days.tasks if by == "task" else days.moods):
+        for name, (sessions, focused, score_sum) in entries.items():
+            total = merged.setdefault(name, [0, 0.0, 0.0])
+            total[0] += sessions
+            total[1] += focused
+            total[2] += score_sum
+    if not merged:
+        return []
+    names = list(merged)
+    values = np.array([merged[name] for name in names], dtype=np.float64)
+    order = np.argsort(-values[:, 1], kind="stable")
+    return [{"name": names[i] or "(none)", "sessions": int(values[i, 0]),
+             "focus_minutes": float(values[i, 1] / 60), "mean_score": float(values[i, 2] / max(values[i, 0], 1))}
+            for i in order]
+
+
+def focus_heatmap(days):
+    """7 x 24 focused minutes by weekday (Monday first) and hour"""
+    heat = np.zeros((7, 24))
+    if len(days):
+        np.add.at(heat, weekday(days.day), days.hour_focus / 60)
+    return heat
+
+
+def cycle_completion(days):
+    completed, ended = float(days.cycles.sum()), float(days.cycles_ended.sum())
+    return {"completed": int(completed), "ended": int(ended), "rate": completed / ended if ended else 0.0}
+
+
+def day_arrays(rollups, days=None):
+    """DayArrays over every day of rollups; days from an earlier call is updated in place if it reads these rollups"""
+    if days is None or days.rollups is not rollups or days.first or days.last:
+        return DayArrays(rollups)
+    days.update()
+    return days
+
+
+def dashboard(rollups, today=None, last_days=30, days=None):
+    """Everything the dashboard screen shows, read from the rollups; pass days to reuse day_arrays() columns"""
+    today = today or date.today()
+    days = day_arrays(rollups, days)
+    day_list, day_minutes = focus_per_day(rollups, today - timedelta(days=last_days - 1), today)
+    weeks, week_minutes = focus_per_week(rollups)
+    return {
+        "sessions": int(days.sessions.sum()),
+        "focus_hours": float(days.focus_seconds.sum()) / 3600,
+        "days": day_list, "day_minutes": day_minutes,
+        "weeks": weeks, "week_minutes": week_minutes,
+        "scores": score_distribution(days),
+        "tasks": breakdown(days, "task"),
+        "moods": breakdown(days, "mood"),
+        "heatmap": focus_heatmap(days),
+        "cycles": cycle_completion(days),
+        "day_streak": rollups.day_streak(today),
+        "week": rollups.weekly_report(week_of(today))
+    }
+
+
+def check(rollups, history):
+    """Differences between the rollups and a full scan of history, by total; empty when they agree"""
+    arrays = HistoryArrays(history)
+    days = DayArrays(rollups)
+    differences = {}
+    for key in ("focus_seconds", "away_seconds", "cycles", "cycles_ended"):
+        rolled, scanned = getattr(days, key).sum(), getattr(arrays, key).sum()
+        if not np.isclose(rolled, scanned):
+            differences[key] = (float(rolled), float(scanned))
+    # Sessions per day as well, so a session counted on the wrong day shows up
+    scanned_days, scanned_sessions = np.unique(arrays.day, return_counts=True)
+    has_sessions = days.sessions > 0
+    if (not np.array_equal(scanned_days, days.day[has_sessions])
+            or not np.array_equal(scanned_sessions, days.sessions[has_sessions])):
+        differences["sessions_per_day"] = (int(days.sessions.sum()), len(arrays))
+    return differences
+
+
+def plot_dashboard(fig, summary, text_color="#111827", face_color="#f9fafb", top_tasks=8):
+    """Draw the four dashboard charts onto a matplotlib Figure"""
+    fig.clear()
+    daily, heat, scores, tasks = fig.subplots(2, 2).ravel()
+    for ax in (daily, heat, scores, tasks):
+        ax.set_facecolor(face_color)
+        ax.tick_params(colors=text_color, labelsize=8)
+        for spine in ax.spines.values():
+            spine.set_edgecolor(text_color)
+    
+    days = summary["days"]
+    daily.bar(np.arange(len(days)), summary["day_minutes"], color="#3b82f6")
+    if len(days):
+        ticks = np.arange(0, len(days), max(1, len(days) // 6))
+        daily.set_xticks(ticks)
+        daily.set_xticklabels([str(days[i])[5:] for i in ticks])
+    daily.set_title(f"Focused minutes, last {len(days)} days", color=text_color, fontsize=10)
+    
+    image = heat.imshow(summary["heatmap"], aspect="auto", cmap="Blues")
+    heat.set_yticks(range(7))
+    heat.set_yticklabels(WEEKDAYS)
+    heat.set_xticks(range(0, 24, 3))
+    heat.set_title("Focused minutes by weekday and hour", color=text_color, fontsize=10)
+    fig.colorbar(image, ax=heat)
+    
+    distribution = summary["scores"]
+    scores.bar(distribution["bins"][:-1], distribution["counts"], width=9, align="edge", color="#22c55e")
+    scores.set_title(f"Focus scores (median {distribution['median']:.0f}%)", color=text_color, fontsize=10)
+    
+    rows = summary["tasks"][:top_tasks][::-1]
+    tasks.barh([row["name"][:18] for row in rows], [row["focus_minutes"] / 60 for row in rows], color="#8b5cf6")
+    tasks.set_title("Focused hours by task", color=text_color, fontsize=10)
+    
+    # Fixed margins; tight_layout would draw the whole figure once more to measure it
+    fig.subplots_adjust(left=0.13, right=0.97, bottom=0.07, top=0.94, wspace=0.35, hspace=0.35)
+    return fig
+
+
+def benchmark(sessions):
+    """Rebuild the rollups, then compute and render the dashboard; milliseconds per step"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from seemyfocus_bench import synthetic_history
+    
+    history = synthetic_history(sessions)
+    timings = {}
+    start = time.perf_counter()
+    rollups = Rollups.rebuild(history)
+    timings["rebuild_ms"] = (time.perf_counter() - start) * 1000
+    today = date.fromisoformat(max(rollups.days))
+    start = time.perf_counter()
+    summary = dashboard(rollups, today)
+    timings["compute_ms"] = (time.perf_counter() - start) * 1000
+    fig = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    start = time.perf_counter()
+    plot_dashboard(fig, summary)
+    canvas.draw()
+    timings["render_ms"] = (time.perf_counter() - start) * 1000
+    timings["days"] = len(rollups.days)
+    return timings, summary
+
+
+def print_summary(summary):
+    print(f"{summary['sessions']} sessions, {summary['focus_hours']:.1f} focused hours, "
+          f"day streak {summary['day_streak']}")
+    cycles = summary["cycles"]
+    print(f"cycle completion {cycles['rate'] * 100:.0f}% ({cycles['completed']} of {cycles['ended']} focus cycles)")
+    scores = summary["scores"]
+    print(f"focus score mean {scores['mean']:.0f}%, median {scores['median']:.0f}%, 90th percentile {scores['p90']:.0f}%")
+    for by in ("tasks", "moods"):
+        for row in summary[by][:5]:
+            print(f"  {by[:-1]:4s} {row['name'][:24]:24s} {row['sessions']:5d} sessions "
+                  f"{row['focus_minutes'] / 60:7.1f} h  mean score {row['mean_score']:.0f}%")
+    heat = summary["heatmap"]
+    if heat.any():
+        day, hour = np.unravel_index(np.argmax(heat), heat.shape)
+        print(f"most focused hour: {WEEKDAYS[day]} {hour:02d}:00")
+    print(describe_week(summary["week"]))
+
+
+if __name__ == "__main__":
+    from seemyfocus_engine import HISTORY_FILE
+    
+    parser = argparse.ArgumentParser(description="SeeMyFocus history analytics")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--check", action="store_true", help="compare the rollups with a full scan of the history")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS", help="time the dashboard on synthetic sessions")
+    args = parser.parse_args()
+    
+    if args.bench:
+        for count in (args.bench // 10, args.bench):
+            timings, summary = benchmark(count)
+            total = timings["compute_ms"] + timings["render_ms"]
+            print(f"{count:6d} sessions ({timings['days']} days): compute {timings['compute_ms']:.1f} ms, "
+                  f"render {timings['render_ms']:.0f} ms, dashboard {total:.0f} ms "
+                  f"(one-off rebuild of the rollups {timings['rebuild_ms']:.0f} ms)")
+        print_summary(summary)
+        raise SystemExit
+    
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    path = os.path.join(os.path.dirname(os.path.abspath(args.history)), ROLLUPS_FILE)
+    rollups = Rollups.load(path)
+    if rollups is None or rollups.sessions != len(history):
+        rollups = Rollups.rebuild(history)
+    if args.check:
+        differences = check(rollups, history)
+        print("rollups match the history" if not differences else f"rollups differ: {differences}")
+    else:
+        print_summary(dashboard(rollups))
\ No newline at end of file
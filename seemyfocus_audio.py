@@ -0,0 +1,175 @@
+"""Audio cues for SeeMyFocus
+
+pyttsx3's runAndWait() blocks for as long as the sentence takes to say, so
+all speech happens on one worker thread fed by a small priority queue. The
+fixed phrases are rendered to audio files once (while the worker is idle)
+and cached on disk; after that a cue is just a file playback.
+"""
+import hashlib
+import heapq
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+CACHE_DIR = "seemyfocus_audio_cache"
+
+# Phrases that are spoken often enough to be worth pre-rendering
+FIXED_CUES = {
+    "session_start": "Session started. Let's focus.",
+    "reminder": "Hey, your focus drifted. Let's get back on track.",
+    "streak_broken": "Streak broken. You can start a new one right now.",
+    "focus_complete": "Focus cycle complete. Time for a break.",
+    "break_over": "Break over. Back to focus.",
+    "level_up": "Level up! Great work.",
+    "achievement": "Achievement unlocked!"
+}
+
+
+def find_player():
+    """Command used to play cached cue files, or None to always synthesize"""
+    if sys.platform == "win32":
+        return "winsound"
+    for command in (["afplay"], ["paplay"], ["aplay", "-q"]):
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+class AudioCueEngine:
+    """Speaks cues on a dedicated worker so the Tk and camera loops never wait"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    
+    def __init__(self, rate=150, volume=0.7, max_pending=4, cache_dir=CACHE_DIR):
+        self.rate = rate
+        self.volume = volume
+        self.max_pending = max_pending
+        self.cache_dir = cache_dir
+        self.player = find_player()
+        
+        self.pending = []  # heap of (-priority, seq, text, cacheable)
+        self.seq = 0
+        self.condition = threading.Condition()
+        self.running = True
+        self.available = True  # becomes False if the TTS engine cannot start
+        self.thread = threading.Thread(target=self.run, name="audio-cues", daemon=True)
+        self.thread.start()
+    
+    def say(self, cue, priority=NORMAL):
+        """Queue a cue key from FIXED_CUES or free text. Returns False if dropped"""
+        cacheable = cue in FIXED_CUES
+        text = FIXED_CUES.get(cue, cue)
+        
+        with self.condition:
+            if not self.running or not self.available:
+                return False
+            # The same sentence twice in a row adds nothing
+            if any(entry[2] == text for entry in self.pending):
+                return False
+            
+            if len(self.pending) >= self.max_pending:
+                # Full: evict the least important queued cue, or drop this one
+                lowest = max(self.pending)
+                if -lowest[0] >= priority:
+                    return False
+                self.pending.remove(lowest)
+                heapq.heapify(self.pending)
+            
+            self.seq += 1
+            heapq.heappush(self.pending, (-priority, self.seq, text, cacheable))
+            self.condition.notify()
+        return True
+    
+    def cache_path(self, text):
+        key = f"{text}|{self.rate}|{self.volume}".encode("utf-8")
+        return os.path.join(self.cache_dir, hashlib.sha1(key).hexdigest()[:16] + ".wav")
+    
+    def create_engine(self):
+        # pyttsx3 engines must be created and driven from the same thread
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+            return engine
+        except Exception:
+            return None
+    
+    def run(self):
+        engine = self.create_engine()
+        if engine is None:
+            with self.condition:
+                self.available = False
+                self.pending.clear()
+            return
+        
+        while True:
+            with self.condition:
+                if not self.pending and self.running:
+                    self.condition.wait(timeout=0.5)
+                if not self.running:
+                    break
+                item = heapq.heappop(self.pending) if self.pending else None
+            
+            if item is None:
+                # Idle - use the time to pre-render one missing cue
+                self.render_next_missing(engine)
+                continue
+            
+            _, _, text, cacheable = item
+            path = self.cache_path(text)
+            if cacheable and self.player and os.path.exists(path):
+                self.play_file(path)
+            else:
+                self.speak(engine, text)
+    
+    def speak(self, engine, text):
+        try:
+            engine.say(text)
+            engine.runAndWait()
+        except Exception:
+            pass
+    
+    def render_next_missing(self, engine):
+        """Render one fixed phrase to the disk cache; False when all are cached"""
+        if not self.player:
+            return False
+        for text in FIXED_CUES.values():
+            path = self.cache_path(text)
+            if os.path.exists(path):
+                continue
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                partial = path + ".part"
+                engine.save_to_file(text, partial)
+                engine.runAndWait()
+                if os.path.exists(partial) and os.path.getsize(partial) > 0:
+                    os.replace(partial, path)
+                    return True
+            except Exception:
+                pass
+            # Rendering is not supported here - stop trying and synthesize live
+            self.player = None
+            return False
+        return False
+    
+    def play_file(self, path):
+        try:
+            if self.player == "winsound":
+                import winsound
+                winsound.PlaySound(path, winsound.SND_FILENAME)
+            else:
+                subprocess.run(self.player + [path], timeout=30,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception:
+            pass
+    
+    def shutdown(self):
+        with self.condition:
+            self.running = False
+            self.pending.clear()
+            self.condition.notify()
+        self.thread.join(timeout=1.0)
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""Benchmarks for SeeMyFocus
+
+Runs without a webcam: frames are synthetic (or read from a recording with
+--video) and the history is a generated 10k-session file in a temporary
+directory, so real progress is never touched. Results are written as JSON
+and two result files can be compared to spot regressions between commits.
+    
+    python seemyfocus_bench.py                        # writes bench_results/<commit>.json
+    python seemyfocus_bench.py --video desk.mp4 --ui-sessions 10000
+    python seemyfocus_bench.py --compare old.json new.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import cv2
+import numpy as np
+
+from seemyfocus_engine import FocusEngine
+from seemyfocus_query import HistoryIndex
+
+RESULTS_DIR = "bench_results"
+FRAME_SIZE = (480, 640)
+FACE_BOX = (220, 120, 200, 200)  # a plausible face position in a 640x480 frame
+REGRESSION_THRESHOLD = 0.10      # flag changes of more than 10% in --compare
+
+TASKS = ["Essay draft", "Math homework", "Code review", "Reading papers", "Email", "Study for exam"]
+MOODS = ["Energized", "Focused", "Tired", "Stressed", "Calm"]
+
+
+def synthetic_frames(count, size=FRAME_SIZE, seed=7):
+    """Textured frames with a bright oval where a face would be; deterministic"""
+    rng = np.random.default_rng(seed)
+    height, width = size
+    gradient = np.tile(np.linspace(40, 200, width, dtype=np.float32), (height, 1))
+    frames = []
+    for _ in range(count):
+        noise = rng.normal(0, 18, (height, width)).astype(np.float32)
+        gray = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        x, y, w, h = FACE_BOX
+        cv2.ellipse(gray, (x + w // 2, y + h // 2), (w // 2 - 10, h // 2), 0, 0, 360, 190, -1)
+        for eye_x in (x + w // 3, x + 2 * w // 3):
+            cv2.circle(gray, (eye_x, y + h // 3), 12, 40, -1)
+        frames.append(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+    return frames
+
+
+def video_frames(path, count):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def synthetic_history(count, seed=11):
+    """Session records shaped like the ones end_session writes"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    sessions = []
+    for number in range(count):
+        when = start + timedelta(hours=number * 2.7 + rng.random())
+        session_time = rng.randint(5, 120) * 60
+        timeline = [1 if rng.random() < 0.8 else 0 for _ in range(session_time // 5)]
+        sessions.append({
+            # Older files used a space separator; both appear in real histories
+            "timestamp": when.isoformat() if number % 3 else when.strftime("%Y-%m-%d %H:%M:%S"),
+            "task": rng.choice(TASKS),
+            "mood": rng.choice(MOODS),
+            "session_time": session_time,
+            "focus_score": int(sum(timeline) * 100 / max(len(timeline), 1)),
+            "streak_count": session_time // 1500,
+            "longest_streak": rng.randint(0, 1200),
+            "wellness_points": rng.randint(0, 60),
+            "break_time": rng.randint(0, 600),
+            "focus_timeline": timeline
+        })
+    return sessions
+
+
+def measure(func, min_time=0.5, max_runs=1000, min_runs=3):
+    """Call func repeatedly; returns per-call statistics in milliseconds"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_runs and (len(times) < min_runs or time.perf_counter() - started < min_time):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "runs": len(times),
+        "mean_ms": statistics.fmean(times) * 1000,
+        "median_ms": times[len(times) // 2] * 1000,
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        "min_ms": times[0] * 1000
+    }
+
+
+def cycling(items):
+    """Endless iterator over a list"""
+    index = 0
+    while True:
+        yield items[index % len(items)]
+        index += 1
+
+
+def bench_detection(engine, frames):
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+    pairs = cycling(list(zip(frames, grays)))
+    results = {}
+    
+    results["detect_faces"] = measure(lambda: engine.detect_faces(next(pairs)[1]))
+    results["detect_eye_gaze"] = measure(lambda: engine.detect_eye_gaze(*next(pairs), FACE_BOX))
+    
+    engine.start_session()
+    face = np.array([FACE_BOX])
+    no_face = ()
+    
+    def process(faces):
+        frame, gray = next(pairs)
+        engine.process_face_detection(frame, faces, gray)
+    
+    results["process_face_detection_face"] = measure(lambda: process(face))
+    results["process_face_detection_no_face"] = measure(lambda: process(no_face))
+    
+    def pipeline():
+        frame, gray = next(pairs)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        engine.process_face_detection(frame, engine.detect_faces(gray), gray)
+        engine.update_cycle_timer()
+    
+    results["frame_pipeline"] = measure(pipeline, min_time=1.0)
+    results["frame_pipeline"]["fps"] = 1000 / results["frame_pipeline"]["mean_ms"]
+    for stats in results.values():
+        if "fps" not in stats:
+            stats["per_second"] = 1000 / stats["mean_ms"] if stats["mean_ms"] else None
+    return results
+
+
+def bench_persistence(work_dir, sessions):
+    engine = FocusEngine(os.path.join(work_dir, "progress.json"), os.path.join(work_dir, "history.json"))
+    engine.session_history = synthetic_history(sessions)
+    results = {
+        "save_session_history": measure(engine.save_session_history, min_time=1.0, max_runs=20),
+        "save_user_progress": measure(engine.save_user_progress, min_time=0.5, max_runs=200),
+        "rebuild_rollups": measure(engine.rebuild_rollups, min_time=1.0, max_runs=20),
+        "save_rollups": measure(engine.save_rollups, min_time=0.5, max_runs=200),
+    }
+    
+    def load():
+        engine.session_history = []
+        engine.load_session_history()
+    
+    results["load_session_history"] = measure(load, min_time=1.0, max_runs=20)
+    results["history_index_build"] = measure(lambda: HistoryIndex(engine.session_history), min_time=1.0, max_runs=20)
+    first = engine.history_index.all.starts[len(engine.session_history) // 4]
+    last = engine.history_index.all.starts[len(engine.session_history) // 2]
+    results["history_query_range_task"] = measure(
+        lambda: engine.history_index.aggregate(first, last, task=TASKS[0]), min_time=0.5, max_runs=10000)
+    results["history_file_bytes"] = os.path.getsize(engine.history_file)
+    results["sessions"] = len(engine.session_history)
+    return results
+
+
+def bench_history_screen(work_dir, sessions):
+    """Time setup_history_screen on a hidden window; marked skipped without a display"""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as error:
+        return {"skipped": f"no display ({error.__class__.__name__})"}
+    
+    root.withdraw()
+    previous_dir = os.getcwd()
+    os.chdir(work_dir)  # the app reads and writes its files in the working directory
+    try:
+        from SeeMyFocus_app import SeeMyFocusApp
+        app = SeeMyFocusApp(root)
+        app.session_history = synthetic_history(sessions)
+        app.history_index = HistoryIndex(app.session_history)
+        root.update()
+        
+        start = time.perf_counter()
+        app.setup_history_screen()
+        root.update_idletasks()
+        first_build = time.perf_counter() - start
+        
+        app.setup_home_screen()
+        root.update_idletasks()
+        start = time.perf_counter()
+        app.setup_history_screen()
+        root.update_idletasks()
+        cached_show = time.perf_counter() - start
+        
+        app.cleanup()
+        return {"sessions": sessions, "first_build_ms": first_build * 1000, "cached_show_ms": cached_show * 1000}
+    finally:
+        os.chdir(previous_dir)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(video=None, frames=60, sessions=10000, ui_sessions=1000, skip_ui=False):
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "opencv": cv2.__version__, "cpus": os.cpu_count()},
+        "frames": "video" if video else "synthetic"
+    }
+    
+    frame_list = video_frames(video, frames) if video else synthetic_frames(frames)
+    if not frame_list:
+        raise SystemExit(f"Could not read frames from {video}")
+    
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_bench_")
+    try:
+        engine = FocusEngine(os.path.join(work_dir, "progress.json"), os.path.join(work_dir, "history.json"))
+        results["detection"] = bench_detection(engine, frame_list)
+        results["persistence"] = bench_persistence(work_dir, sessions)
+        if not skip_ui:
+            results["ui"] = {"history_screen": bench_history_screen(work_dir, ui_sessions)}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def flatten(results, prefix=""):
+    """{'detection.detect_faces.mean_ms': ...} for every number"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = flatten(json.load(f))
+    with open(new_path) as f:
+        new = flatten(json.load(f))
+    for name in sorted(old.keys() & new.keys()):
+        if not name.endswith(("mean_ms", "median_ms", "first_build_ms", "cached_show_ms")):
+            continue
+        before, after = old[name], new[name]
+        change = (after - before) / before if before else 0.0
+        flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ("  faster" if change < -REGRESSION_THRESHOLD else "")
+        print(f"{name:55s} {before:10.3f} -> {after:10.3f} ms  {change * 100:+6.1f}%{flag}")
+
+
+def print_summary(results):
+    for name, value in flatten(results).items():
+        if name.endswith(("mean_ms", "fps", "_bytes", "first_build_ms", "cached_show_ms")):
+            print(f"{name:55s} {value:12.3f}")
+    skipped = results.get("ui", {}).get("history_screen", {}).get("skipped")
+    if skipped:
+        print(f"ui.history_screen skipped: {skipped}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeeMyFocus benchmarks (no webcam needed)")
+    parser.add_argument("--video", help="use frames from a recording instead of synthetic ones")
+    parser.add_argument("--frames", type=int, default=60, help="distinct frames to cycle through")
+    parser.add_argument("--sessions", type=int, default=10000, help="history size for persistence benchmarks")
+    parser.add_argument("--ui-sessions", type=int, default=1000, help="history size for the history screen build")
+    parser.add_argument("--skip-ui", action="store_true", help="do not open a Tk window")
+    parser.add_argument("--output", help="result file (default bench_results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+    else:
+        results = run_benchmarks(args.video, args.frames, args.sessions, args.ui_sessions, args.skip_ui)
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"{results['commit'] or datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print_summary(results)
+        print(f"Results written to {output}")
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""Detector calibration for SeeMyFocus
+
+The face and eye cascades used the same settings on every machine and
+camera. That is too slow for an old laptop and wastes accuracy on a fast
+desktop. A calibration samples a couple of dozen frames and measures
+candidate settings on them. It then keeps the most accurate candidate that
+fits a per-frame CPU budget the user chooses under Settings → Camera.
+
+Candidate settings:
+- the detection scale: the frame is shrunk before the face cascade runs;
+- the face cascade's scaleFactor and minSize;
+- the eye cascade's scaleFactor and minSize.
+
+Accuracy is agreement with the slowest, most thorough candidate on the same
+frames: the same face (IoU >= 0.5) and the same eyes, or none where it
+found none. The cost counted is the face cascade plus the eye cascade
+spread over the frames the eye tracker follows by template, which is what
+an average frame costs. Results are stored per camera in the progress
+file. The app calibrates again if detection becomes much slower than it
+measured, for example when the machine is busy or the light changes.
+
+minNeighbors is not swept for either cascade: it changes false positives
+more than cost, and agreement with a reference run cannot judge those.
+    
+    python seemyfocus_calibration.py --video desk.mp4 --budget 20
+    python seemyfocus_calibration.py --image portrait.jpg --budget 10
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import cv2
+
+from seemyfocus_eyes import EyeTracker, REDETECT_EVERY
+from seemyfocus_faces import iou
+
+DEFAULT_DETECTOR = {
+    "scale": 1.0,
+    "face_scale_factor": 1.1,
+    "face_min_size": 100,
+    "face_min_neighbors": 5,
+    "eye_scale_factor": 1.1,
+    "eye_min_size": 20,
+    "eye_min_neighbors": 5
+}
+
+# The most thorough settings; every candidate is scored against what these find
+REFERENCE_DETECTOR = dict(DEFAULT_DETECTOR, face_scale_factor=1.05, face_min_size=80, eye_scale_factor=1.05)
+
+SCALES = (1.0, 0.75, 0.5)
+FACE_SCALE_FACTORS = (1.05, 1.1, 1.2, 1.3)
+FACE_MIN_SIZES = (80, 100, 140)
+EYE_SCALE_FACTORS = (1.05, 1.1, 1.2)
+EYE_MIN_SIZES = (20, 28, 36)
+
+BUDGET_CHOICES = ("Off", "10", "20", "40")  # milliseconds per frame for face and eye detection
+CALIBRATION_FRAMES = 24
+SAMPLE_EVERY = 3          # frames skipped between samples, so a couple of seconds are covered
+DRIFT_FACTOR = 1.5        # detection this much slower than calibrated...
+DRIFT_SECONDS = 30        # ...for this long starts a new calibration
+RECALIBRATE_AFTER = 600   # seconds; never calibrate more often than this
+
+CASCADE_WINDOW = 24       # the face cascade's own window; smaller minSize values mean nothing
+                          # (the eye cascade's is 20, the smallest of EYE_MIN_SIZES)
+
+
+def face_cascade():
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def eye_cascade():
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+
+
+def run_face_cascade(cascade, gray, detector, buffers=None):
+    """Face boxes in full-frame coordinates; buffers (a dict) keeps the shrunk frame between calls"""
+    scale = detector["scale"]
+    min_size = max(CASCADE_WINDOW, int(detector["face_min_size"] * scale))
+    if scale != 1.0:
+        size = (int(gray.shape[1] * scale), int(gray.shape[0] * scale))
+        small = buffers.get("small") if buffers is not None else None
+        if small is None or small.shape[::-1] != size:
+            small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+            if buffers is not None:
+                buffers["small"] = small
+        else:
+            cv2.resize(gray, size, dst=small, interpolation=cv2.INTER_AREA)
+        gray = small
+    faces = cascade.detectMultiScale(gray, scaleFactor=detector["face_scale_factor"],
+                                     minNeighbors=detector["face_min_neighbors"], minSize=(min_size, min_size))
+    if scale != 1.0 and len(faces):
+        faces = (faces / scale).astype(int)
+    return faces
+
+
+def largest(faces):
+    if len(faces) == 0:
+        return None
+    return tuple(int(v) for v in max(faces, key=lambda face: face[2] * face[3]))
+
+
+def eyes_agree(found, reference, face_w):
+    if found is None or reference is None:
+        return found is None and reference is None
+    return all(abs(a[0] - b[0]) + abs(a[1] - b[1]) <= 0.15 * face_w for a, b in zip(found, reference))
+
+
+def sweep(grays, budget_ms):
+    """Measure every candidate on grays; returns (chosen detector, candidate rows)"""
+    faces_cascade, eyes_cascade = face_cascade(), eye_cascade()
+    
+    def faces_with(detector):
+        found, times = [], []
+        for gray in grays:
+            start = time.perf_counter()
+            found.append(largest(run_face_cascade(faces_cascade, gray, detector)))
+            times.append(time.perf_counter() - start)
+        return found, statistics.median(times) * 1000
+    
+    def eyes_with(scale_factor, min_size, faces):
+        tracker = EyeTracker(eyes_cascade, scale_factor=scale_factor, min_size=min_size)
+        found, times = [], []
+        for gray, face in zip(grays, faces):
+            if face is None:
+                found.append(None)
+                continue
+            start = time.perf_counter()
+            found.append(tracker.detect(gray, face))
+            times.append(time.perf_counter() - start)
+        return found, statistics.median(times) * 1000 if times else 0.0
+    
+    reference_faces, _ = faces_with(REFERENCE_DETECTOR)
+    reference_eyes, _ = eyes_with(REFERENCE_DETECTOR["eye_scale_factor"], REFERENCE_DETECTOR["eye_min_size"],
+                                  reference_faces)
+    
+    # Face and eye settings are independent, so they are measured separately and combined
+    face_rows = []
+    for scale in SCALES:
+        for scale_factor in FACE_SCALE_FACTORS:
+            for min_size in FACE_MIN_SIZES:
+                detector = dict(DEFAULT_DETECTOR, scale=scale, face_scale_factor=scale_factor, face_min_size=min_size)
+                faces, ms = faces_with(detector)
+                agree = [(a is None and b is None) or (a is not None and b is not None and iou(a, b) >= 0.5)
+                         for a, b in zip(faces, reference_faces)]
+                face_rows.append((detector, ms, sum(agree) / len(agree)))
+    
+    eye_rows = []
+    for scale_factor in EYE_SCALE_FACTORS:
+        for min_size in EYE_MIN_SIZES:
+            eyes, ms = eyes_with(scale_factor, min_size, reference_faces)
+            agree = [eyes_agree(a, b, face[2] if face else 0) for a, b, face in zip(eyes, reference_eyes, reference_faces)]
+            eye_rows.append(({"eye_scale_factor": scale_factor, "eye_min_size": min_size}, ms, sum(agree) / len(agree)))
+    
+    rows = []
+    for detector, face_ms, face_accuracy in face_rows:
+        for eye_detector, eye_ms, eye_accuracy in eye_rows:
+            rows.append({"detector": dict(detector, **eye_detector),
+                         "frame_ms": face_ms + eye_ms / REDETECT_EVERY,
+                         "accuracy": face_accuracy * eye_accuracy})
+    return choose(rows, budget_ms), rows
+
+
+def choose(rows, budget_ms):
+    """The most accurate row within budget, the cheaper on a tie; the cheapest when nothing fits"""
+    fitting = [row for row in rows if row["frame_ms"] <= budget_ms]
+    if fitting:
+        return max(fitting, key=lambda row: (round(row["accuracy"], 3), -row["frame_ms"]))
+    return min(rows, key=lambda row: row["frame_ms"])
+
+
+class DetectorCalibrator:
+    """Samples frames, sweeps detector settings on a thread, then watches for drift.
+    
+    observe() is called once per processed frame from the Tk thread and
+    returns a finished calibration exactly once; everything slow happens on
+    the calibration thread.
+    """
+    IDLE = "idle"
+    SAMPLING = "sampling"
+    SWEEPING = "sweeping"
+    WATCHING = "watching"
+    
+    def __init__(self, budget_ms, frames=CALIBRATION_FRAMES, clock=time.monotonic):
+        self.budget_ms = budget_ms
+        self.frames = frames
+        self.clock = clock
+        self.state = self.IDLE
+        self.samples = []
+        self.seen = 0
+        self.thread = None
+        self.result = None
+        
+        self.frame_ms = None       # what the chosen settings cost when calibrated
+        self.slow_since = None
+        self.last_calibration = None
+        self.runs = 0
+    
+    def start(self):
+        """Collect frames for a new calibration"""
+        self.state = self.SAMPLING
+        self.samples = []
+        self.seen = 0
+    
+    def watch(self, frame_ms):
+        """Use a stored calibration and only watch for drift"""
+        self.frame_ms = frame_ms
+        self.slow_since = None
+        self.state = self.WATCHING
+    
+    def observe(self, gray, detection_ms):
+        """Feed one frame; returns the chosen row once a calibration finishes"""
+        if self.state == self.SAMPLING:
+            self.seen += 1
+            if self.seen % SAMPLE_EVERY == 0:
+                self.samples.append(gray.copy())
+            if len(self.samples) >= self.frames:
+                self.state = self.SWEEPING
+                samples, self.samples = self.samples, []
+                self.thread = threading.Thread(target=self.run, args=(samples,), name="detector-calibration", daemon=True)
+                self.thread.start()
+        elif self.state == self.SWEEPING:
+            if self.result is not None:
+                result, self.result = self.result, None
+                self.watch(result["frame_ms"])
+                return result
+        elif self.state == self.WATCHING:
+            self.check_drift(detection_ms)
+        return None
+    
+    def run(self, samples):
+        chosen, _ = sweep(samples, self.budget_ms)
+        self.last_calibration = self.clock()
+        self.runs += 1
+        self.result = chosen
+    
+    def check_drift(self, detection_ms):
+        now = self.clock()
+        limit = max(self.budget_ms, self.frame_ms or 0.0) * DRIFT_FACTOR
+        if detection_ms <= limit:
+            self.slow_since = None
+            return
+        if self.slow_since is None:
+            self.slow_since = now
+        recently = self.last_calibration is not None and now - self.last_calibration < RECALIBRATE_AFTER
+        if now - self.slow_since >= DRIFT_SECONDS and not recently:
+            self.start()
+
+
+def describe(detector):
+    return (f"scale {detector['scale']:.2f}, face scaleFactor {detector['face_scale_factor']}, "
+            f"minSize {detector['face_min_size']}, eye scaleFactor {detector['eye_scale_factor']}, "
+            f"minSize {detector['eye_min_size']}")
+
+
+if __name__ == "__main__":
+    from seemyfocus_eyes import drifting_frames, video_frames
+    
+    parser = argparse.ArgumentParser(description="Calibrate the SeeMyFocus detectors to a CPU budget")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="recording from the camera to calibrate for")
+    source.add_argument("--image", help="photo of a face, moved around the frame")
+    parser.add_argument("--budget", type=float, default=20.0, help="milliseconds per frame for face and eye detection")
+    parser.add_argument("--frames", type=int, default=CALIBRATION_FRAMES)
+    args = parser.parse_args()
+    
+    frames = (video_frames(args.video, args.frames * SAMPLE_EVERY) if args.video
+              else drifting_frames(args.image, args.frames * SAMPLE_EVERY, scale=2.0))
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames[::SAMPLE_EVERY]]
+    start = time.perf_counter()
+    chosen, rows = sweep(grays, args.budget)
+    print(f"Swept {len(rows)} combinations on {len(grays)} frames in {time.perf_counter() - start:.1f} s")
+    default = next(row for row in rows if row["detector"] == DEFAULT_DETECTOR)
+    print(f"default : {default['frame_ms']:6.1f} ms/frame, accuracy {default['accuracy'] * 100:5.1f}%  ({describe(DEFAULT_DETECTOR)})")
+    print(f"chosen  : {chosen['frame_ms']:6.1f} ms/frame, accuracy {chosen['accuracy'] * 100:5.1f}%  ({describe(chosen['detector'])})")
+    if chosen["frame_ms"] > args.budget:
+        print(f"Nothing fits {args.budget:g} ms on this machine; using the cheapest settings")
\ No newline at end of file
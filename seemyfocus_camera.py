@@ -0,0 +1,740 @@
+"""Webcam lifecycle management for SeeMyFocus
+
+Opening a USB camera can take a second or more, so the device is opened and
+warmed up on a background thread while the user is still on the home screen.
+The Tk thread only ever sees a camera that is ready to deliver frames.
+
+Reads happen on that thread too: the Tk thread picks up the newest frame
+without waiting, so an unplugged or hung webcam cannot freeze the window.
+When frames stop the supervisor releases the device and reopens it with
+exponential backoff until it comes back.
+
+Run ``python seemyfocus_camera.py --measure`` to print the glass-to-state
+latency of every capture profile on this machine, and ``--reconnect VIDEO``
+to time the recovery from a simulated unplug and hang. ``--allocations
+SOURCE`` fails when the frame loop allocates more than ALLOCATION_LIMIT bytes
+per frame; tests/test_camera.py runs the same check.
+"""
+import argparse
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Capture profiles applied right after the device opens. Driver defaults often
+# pick a large resolution, raw YUYV and a 4+ frame buffer, which adds lag.
+# "fourcc" must be set before the frame size for V4L2 to honour it.
+CAPTURE_PROFILES = {
+    "low_latency": {"fourcc": "MJPG", "width": 640, "height": 480, "fps": 30, "buffer_size": 1},
+    "balanced": {"fourcc": "YUYV", "width": 640, "height": 480, "fps": 30, "buffer_size": 2},
+    "hd": {"fourcc": "MJPG", "width": 1280, "height": 720, "fps": 30, "buffer_size": 1},
+    "driver_default": {}
+}
+DEFAULT_PROFILE = "low_latency"
+
+# A grab() that returns faster than this was served from the driver's queue,
+# i.e. the frame was already waiting and is older than the newest one
+STALE_GRAB_SECONDS = 0.004
+
+# Mean bytes a steady-state frame may allocate. A 640x480 gray image alone is
+# 300 KB, so one per-frame conversion is far over; the reader thread still
+# allocates a frame now and then (e.g. when a recording loops)
+ALLOCATION_LIMIT = 32 * 1024
+
+
+def fourcc_to_str(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+class CameraManager:
+    """Supervises the webcam off the Tk thread.
+    
+    A supervisor thread opens and warms up the device, and a reader thread
+    pulls frames from it. read() only hands over the newest frame and never
+    blocks the caller. A read that hangs for READ_TIMEOUT, or keeps failing,
+    counts as the device disappearing. The supervisor then reconnects with
+    exponential backoff until the camera is back or release() is called.
+    """
+    CLOSED = "closed"
+    OPENING = "opening"
+    READY = "ready"
+    RECONNECTING = "reconnecting"  # no device right now; retrying with backoff
+    
+    READ_TIMEOUT = 2.0        # seconds a single read may hang before the device counts as lost
+    MAX_READ_FAILURES = 10    # consecutive failed reads that count as lost
+    BACKOFF_START = 0.5
+    BACKOFF_MAX = 10.0
+    
+    def __init__(self, index=0, warmup_frames=5, profile=DEFAULT_PROFILE, drop_stale=None,
+                 max_stale_drop=4):
+        self.index = index
+        self.warmup_frames = warmup_frames
+        self.profile = profile if profile in CAPTURE_PROFILES else DEFAULT_PROFILE
+        # Live devices skip queued frames; recorded files must be read in order
+        self.drop_stale = isinstance(index, int) if drop_stale is None else drop_stale
+        self.max_stale_drop = max_stale_drop
+        self.applied = {}  # settings the driver actually accepted
+        
+        self.cap = None
+        self.state = self.CLOSED
+        self.lock = threading.Lock()
+        self.opened = threading.Event()  # set once an open attempt has finished
+        self.generation = 0  # bumped by release() so stale threads clean up after themselves
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.reader = None
+        
+        # Newest frame from the reader thread, handed over by read()
+        self.frame_ready = threading.Condition()
+        self.latest = None
+        self.latest_seq = 0
+        self.returned_seq = 0
+        self.latest_capture_time = None
+        self.consumed = threading.Event()  # recorded files: the reader waits for read()
+        self.read_started = None  # monotonic start of the read in progress, for the watchdog
+        # Low-power mode (breaks): seconds between decoded frames; the queue is drained in between
+        self.frame_interval = 0.0
+        self.frames_skipped = 0
+        
+        self.open_latency = None  # seconds from open request to first usable frame
+        self.fps = 0.0
+        self.last_frame_time = None
+        
+        # Latency tracking: when the last frame hit the sensor, and how long
+        # it took from there until the focus state was updated
+        self.last_capture_time = None
+        self.frames_dropped = 0
+        self.latency_samples = []
+        self.latency_window = 120
+        
+        # Recovery tracking
+        self.read_failures = 0
+        self.read_timeouts = 0
+        self.disconnects = 0
+        self.lost_at = None  # when frames stopped arriving
+        self.reconnect_latencies = []  # seconds from losing the device to its first frame back
+        self.backoff = 0.0
+    
+    def open_async(self):
+        """Start supervising the camera in the background. Safe to call repeatedly"""
+        with self.lock:
+            if self.state in (self.OPENING, self.READY, self.RECONNECTING):
+                return
+            self.generation += 1
+            generation = self.generation
+            self.stop_event = threading.Event()
+            self.state = self.OPENING
+            self.opened.clear()
+        
+        self.thread = threading.Thread(target=self.supervise, args=(generation, self.stop_event),
+                                       name="camera-supervisor", daemon=True)
+        self.thread.start()
+    
+    def create_capture(self):
+        """The device handle; overridden to inject faults when measuring recovery"""
+        return cv2.VideoCapture(self.index)
+    
+    def open_device(self):
+        """Open, configure and warm up the device; None if it delivers nothing"""
+        cap = self.create_capture()
+        if not cap.isOpened():
+            cap.release()
+            return None
+        self.apply_profile(cap)
+        
+        # Discard the first frames while exposure and white balance settle
+        good_frames = 0
+        for _ in range(self.warmup_frames * 3):
+            ret, _ = cap.read()
+            if ret:
+                good_frames += 1
+                if good_frames >= self.warmup_frames:
+                    return cap
+        if good_frames:
+            return cap
+        cap.release()
+        return None
+    
+    def supervise(self, generation, stop):
+        """Open, watch and reopen the device until release()"""
+        requested = time.time()
+        self.backoff = self.BACKOFF_START
+        while not stop.is_set():
+            cap = self.open_device()
+            with self.lock:
+                if generation != self.generation:
+                    # release() was called while we were opening
+                    if cap is not None:
+                        cap.release()
+                    return
+                if cap is None:
+                    self.state = self.RECONNECTING
+                else:
+                    self.cap = cap
+                    self.state = self.READY
+                    if self.open_latency is None or self.lost_at is None:
+                        self.open_latency = time.time() - requested
+                    self.fps = 0.0
+                    self.last_frame_time = None
+                self.opened.set()
+            
+            if cap is None:
+                stop.wait(self.backoff)
+                self.backoff = min(self.backoff * 2, self.BACKOFF_MAX)
+                continue
+            
+            self.backoff = self.BACKOFF_START
+            self.consumed.set()
+            reader = self.reader = threading.Thread(target=self.read_worker, args=(cap, generation, stop),
+                                                    name="camera-reader", daemon=True)
+            reader.start()
+            self.watch(reader, stop)
+            
+            with self.lock:
+                if generation != self.generation:
+                    return
+                # The device went away; the reader releases it once its read returns.
+                # A hung reader may never return, so its generation is abandoned
+                self.generation += 1
+                generation = self.generation
+                self.cap = None
+                self.state = self.RECONNECTING
+                self.disconnects += 1
+                self.lost_at = self.last_frame_time or time.time()
+                self.opened.clear()
+    
+    def watch(self, reader, stop):
+        """Return when the reader stops or a read hangs past READ_TIMEOUT"""
+        while not stop.is_set() and reader.is_alive():
+            reader.join(0.1)
+            started = self.read_started
+            if started is not None and time.monotonic() - started > self.READ_TIMEOUT:
+                self.read_timeouts += 1
+                return
+    
+    def read_worker(self, cap, generation, stop):
+        """Reader thread: pull frames and publish the newest one"""
+        buffers = [None, None]
+        index = 0
+        failures = 0
+        last_publish = 0.0
+        try:
+            while generation == self.generation and not stop.is_set():
+                if self.drop_stale and self.frame_interval:
+                    wait = last_publish + self.frame_interval - time.monotonic()
+                    if wait > 0:
+                        stop.wait(min(wait, 0.1))
+                        continue
+                if not self.drop_stale:
+                    # Recorded files are read in order, one frame per read() call
+                    if not self.consumed.wait(0.1):
+                        continue
+                    self.consumed.clear()
+                
+                self.read_started = time.monotonic()
+                if self.drop_stale:
+                    ret, frame = self.read_latest(cap, buffers[index])
+                else:
+                    ret, frame = cap.read(buffers[index])
+                self.read_started = None
+                if generation != self.generation:
+                    break
+                
+                if not ret:
+                    failures += 1
+                    self.read_failures += 1
+                    if failures >= self.MAX_READ_FAILURES:
+                        break
+                    if not self.drop_stale:
+                        self.consumed.set()
+                    time.sleep(0.01)
+                    continue
+                failures = 0
+                
+                now = time.time()
+                capture_time = now - self.frame_age(cap)
+                with self.frame_ready:
+                    if self.latest_seq != self.returned_seq:
+                        self.frames_dropped += 1  # the previous frame was never used
+                    buffers[index] = frame
+                    self.latest = frame
+                    self.latest_capture_time = capture_time
+                    self.latest_seq += 1
+                    self.frame_ready.notify_all()
+                if self.lost_at is not None:
+                    self.reconnect_latencies.append(now - self.lost_at)
+                    del self.reconnect_latencies[:-self.latency_window]
+                    self.lost_at = None
+                self.track_fps(now)
+                last_publish = time.monotonic()
+                # Write the next frame into the other buffer; read() may be copying this one
+                index = 1 - index
+        finally:
+            self.read_started = None
+            cap.release()
+    
+    def read(self, out=None, timeout=None):
+        """The newest frame not handed out yet, copied into out if given.
+        
+        Returns (False, None) when there is no new frame - the camera is
+        opening, reconnecting or simply has not produced the next frame.
+        Waits up to timeout seconds for one; by default it never blocks.
+        """
+        with self.frame_ready:
+            if timeout and self.latest_seq == self.returned_seq:
+                self.frame_ready.wait_for(lambda: self.latest_seq != self.returned_seq, timeout)
+            if self.latest_seq == self.returned_seq or self.latest is None:
+                return False, None
+            if out is not None and out.shape == self.latest.shape:
+                np.copyto(out, self.latest)
+                frame = out
+            else:
+                frame = self.latest.copy()
+            self.returned_seq = self.latest_seq
+            self.last_capture_time = self.latest_capture_time
+        if not self.drop_stale:
+            self.consumed.set()
+        return True, frame
+    
+    def apply_profile(self, cap):
+        """Configure format, size, rate and queue depth, then record what stuck"""
+        settings = CAPTURE_PROFILES[self.profile]
+        if "fourcc" in settings:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*settings["fourcc"]))
+        if "width" in settings:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, settings["width"])
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, settings["height"])
+        if "fps" in settings:
+            cap.set(cv2.CAP_PROP_FPS, settings["fps"])
+        if "buffer_size" in settings:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, settings["buffer_size"])
+        
+        self.applied = {
+            "fourcc": fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": cap.get(cv2.CAP_PROP_FPS),
+            "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        }
+    
+    def set_profile(self, profile):
+        """Switch capture profile; takes effect the next time the device opens"""
+        if profile in CAPTURE_PROFILES:
+            self.profile = profile
+    
+    def wait_ready(self, timeout=None):
+        """Block until the current open attempt finishes; True if the camera is ready"""
+        self.opened.wait(timeout)
+        return self.is_ready()
+    
+    def is_ready(self):
+        return self.state == self.READY
+    
+    def read_latest(self, cap, out=None):
+        """grab() until the driver queue is empty, then decode only the newest frame"""
+        start = time.perf_counter()
+        if not cap.grab():
+            return False, None
+        took = time.perf_counter() - start
+        
+        dropped = 0
+        while took < STALE_GRAB_SECONDS and dropped < self.max_stale_drop:
+            start = time.perf_counter()
+            if not cap.grab():
+                break
+            took = time.perf_counter() - start
+            dropped += 1
+        if self.frame_interval:
+            self.frames_skipped += dropped  # left in the queue on purpose while in low-power mode
+        else:
+            self.frames_dropped += dropped
+        
+        return cap.retrieve(out)
+    
+    def frame_age(self, cap):
+        """Seconds between the sensor capturing the frame and now"""
+        # V4L2 reports the buffer timestamp on the monotonic clock
+        stamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+        age_ms = time.monotonic() * 1000 - stamp_ms
+        if 0 < age_ms < 2000:
+            return age_ms / 1000
+        
+        # Otherwise assume mid-exposure of a frame that just arrived
+        nominal_fps = self.applied.get("fps") or 30
+        return 0.5 / nominal_fps
+    
+    def mark_state_updated(self):
+        """Record glass-to-state latency once the focus state reflects the last frame"""
+        if self.last_capture_time is None:
+            return
+        self.latency_samples.append(time.time() - self.last_capture_time)
+        if len(self.latency_samples) > self.latency_window:
+            del self.latency_samples[0]
+    
+    def latency_ms(self):
+        """Median and 95th percentile glass-to-state latency in milliseconds"""
+        if not self.latency_samples:
+            return None, None
+        samples = np.array(self.latency_samples) * 1000
+        return float(np.median(samples)), float(np.percentile(samples, 95))
+    
+    def track_fps(self, now):
+        if self.last_frame_time is not None:
+            dt = now - self.last_frame_time
+            if dt > 0:
+                instant = 1.0 / dt
+                # Exponential moving average keeps the readout steady
+                self.fps = instant if self.fps == 0 else self.fps * 0.9 + instant * 0.1
+        self.last_frame_time = now
+    
+    def release(self):
+        """Stop and release the device. An open in progress is abandoned"""
+        with self.lock:
+            self.generation += 1
+            self.cap = None
+            self.state = self.CLOSED
+            self.stop_event.set()
+            self.opened.set()
+            reader, self.reader = self.reader, None
+        
+        # The reader releases the device after its current read; give it a
+        # moment so a quick reopen does not find the device still busy
+        if reader is not None:
+            reader.join(0.2)
+        with self.frame_ready:
+            self.latest = None
+            self.returned_seq = self.latest_seq
+        self.fps = 0.0
+        self.last_frame_time = None
+        self.last_capture_time = None
+        self.latency_samples = []
+        self.lost_at = None
+    
+    def stats(self):
+        """Snapshot of the camera state for display and diagnostics"""
+        median_ms, p95_ms = self.latency_ms()
+        reconnects = self.reconnect_latencies
+        return {
+            "state": self.state,
+            "profile": self.profile,
+            "applied": self.applied,
+            "open_latency": self.open_latency,
+            "fps": round(self.fps, 1),
+            "frames_dropped": self.frames_dropped,
+            "frames_skipped": self.frames_skipped,
+            "glass_to_state_ms": median_ms,
+            "glass_to_state_p95_ms": p95_ms,
+            "read_failures": self.read_failures,
+            "read_timeouts": self.read_timeouts,
+            "disconnects": self.disconnects,
+            "reconnect_ms": reconnects[-1] * 1000 if reconnects else None,
+            "reconnect_max_ms": max(reconnects) * 1000 if reconnects else None,
+            "backoff": self.backoff if self.state == self.RECONNECTING else 0.0
+        }
+
+
+class FramePool:
+    """Preallocated per-frame buffers so the frame loop does not allocate.
+    
+    Capture rotates through a few frame buffers (a frame can still be in use
+    while the next one is read), and every conversion writes into its own
+    dst array. Detection works on the unmirrored frame; only the display copy
+    is flipped.
+    """
+    
+    def __init__(self, capture_buffers=2):
+        self.capture_buffers = capture_buffers
+        self.shape = None
+        self.frames = []
+        self.next_index = 0
+        self.gray = None
+        self.display = None
+        self.rgba = None
+    
+    def ensure(self, shape):
+        """(Re)allocate the buffers when the frame size changes"""
+        if shape == self.shape:
+            return
+        height, width = shape[:2]
+        self.shape = shape
+        self.frames = [np.empty(shape, np.uint8) for _ in range(self.capture_buffers)]
+        self.next_index = 0
+        self.gray = np.empty((height, width), np.uint8)
+        self.display = np.empty(shape, np.uint8)
+        self.rgba = np.empty((height, width, 4), np.uint8)
+    
+    def next_frame(self):
+        """Buffer to capture the next frame into, or None until the size is known"""
+        if not self.frames:
+            return None
+        frame = self.frames[self.next_index]
+        self.next_index = (self.next_index + 1) % len(self.frames)
+        return frame
+    
+    def adopt(self, frame):
+        """Size the pool from a captured frame"""
+        self.ensure(frame.shape)
+    
+    def to_gray(self, frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.gray)
+    
+    def to_display(self, frame, mirror=True):
+        """Mirrored copy of the frame for drawing the overlay on"""
+        if mirror:
+            return cv2.flip(frame, 1, dst=self.display)
+        np.copyto(self.display, frame)
+        return self.display
+    
+    def to_rgba(self, display):
+        """RGBA view for Tk; Image.fromarray shares this memory without copying"""
+        return cv2.cvtColor(display, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+
+
+def mirror_faces(faces, width):
+    """Map face rectangles from the raw frame onto the mirrored display frame"""
+    if len(faces) == 0:
+        return faces
+    mirrored = np.array(faces)
+    mirrored[:, 0] = width - mirrored[:, 0] - mirrored[:, 2]
+    return mirrored
+
+
+def measure_allocations(source, frames=300, warmup=30):
+    """Bytes allocated per frame by the capture and preprocessing stages.
+    
+    Uses tracemalloc, which also sees NumPy array data. For every frame the
+    traced peak above the starting level is recorded, so a buffer that is
+    allocated and freed within the frame still shows up. After warm-up the
+    steady state should be (close to) zero bytes per frame.
+    """
+    import tracemalloc
+    
+    camera = CameraManager(source)
+    camera.open_async()
+    if not camera.wait_ready(timeout=10):
+        camera.release()
+        return None
+    
+    pool = FramePool()
+    
+    def step():
+        buffer = pool.next_frame()
+        ret, frame = camera.read(out=buffer, timeout=1.0)
+        if not ret:
+            return False
+        if frame is not buffer:
+            pool.adopt(frame)
+        pool.to_gray(frame)
+        display = pool.to_display(frame)
+        pool.to_rgba(display)
+        return True
+    
+    for _ in range(warmup):
+        step()
+    
+    tracemalloc.start()
+    start_level = tracemalloc.get_traced_memory()[0]
+    peaks = []
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        level = tracemalloc.get_traced_memory()[0]
+        if step():
+            peaks.append(tracemalloc.get_traced_memory()[1] - level)
+    end_level = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    camera.release()
+    
+    return {
+        "frames": len(peaks),
+        "bytes_per_frame": float(np.mean(peaks)) if peaks else 0.0,
+        "max_bytes_per_frame": max(peaks) if peaks else 0,
+        "retained_bytes": end_level - start_level
+    }
+
+
+class FlakyCapture:
+    """VideoCapture stand-in whose device can be unplugged or hung on demand.
+    
+    Recordings are paced to their frame rate and loop, like a live camera.
+    """
+    
+    def __init__(self, source, faults):
+        self.faults = faults
+        self.cap = cv2.VideoCapture(source)
+        self.interval = 1.0 / (self.cap.get(cv2.CAP_PROP_FPS) or 30)
+        self.next_frame_at = time.monotonic()
+    
+    def isOpened(self):
+        return self.faults["mode"] == "ok" and self.cap.isOpened()
+    
+    def grab(self):
+        if self.faults["mode"] == "hung":
+            self.faults["unhung"].wait()
+        if self.faults["mode"] != "ok":
+            return False
+        delay = self.next_frame_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.next_frame_at = max(self.next_frame_at + self.interval, time.monotonic() - self.interval)
+        if not self.cap.grab():
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            return self.cap.grab()
+        return True
+    
+    def retrieve(self, out=None):
+        return self.cap.retrieve(out)
+    
+    def read(self, out=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(out)
+    
+    def get(self, prop):
+        return self.cap.get(prop)
+    
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+    
+    def release(self):
+        self.cap.release()
+
+
+def measure_reconnect(source, outages=(1.0, 5.0), hang=3.0):
+    """Unplug and hang a simulated camera while a fake UI loop polls read().
+    
+    For every outage reports how long the loss took to notice, how long the
+    first frame took after the device came back and the slowest read() call
+    on the polling (UI) thread.
+    """
+    faults = {"mode": "ok", "unhung": threading.Event()}
+    
+    class FaultyCamera(CameraManager):
+        def create_capture(self):
+            return FlakyCapture(source, faults)
+    
+    camera = FaultyCamera(source, drop_stale=True)
+    camera.open_async()
+    if not camera.wait_ready(timeout=10):
+        camera.release()
+        return None
+    
+    def poll(seconds, until=None):
+        """Read like the Tk loop does; returns (seconds until `until` held, slowest read)"""
+        slowest = 0.0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            call = time.perf_counter()
+            ret, _ = camera.read()
+            slowest = max(slowest, time.perf_counter() - call)
+            if until is not None and until(ret):
+                return time.perf_counter() - start, slowest
+            time.sleep(0.005)
+        return None, slowest
+    
+    results = []
+    trials = [("unplugged", outage) for outage in outages] + [("hung", hang)]
+    for mode, outage in trials:
+        poll(1.0)
+        faults["unhung"].clear()
+        faults["mode"] = mode
+        detected, slow_lost = poll(outage + CameraManager.READ_TIMEOUT + 1,
+                                   until=lambda ret: camera.state == CameraManager.RECONNECTING)
+        remaining = outage - (detected or 0)
+        if remaining > 0:
+            _, slow_out = poll(remaining)
+        else:
+            slow_out = 0.0
+        faults["mode"] = "ok"
+        faults["unhung"].set()
+        recovered, slow_back = poll(CameraManager.BACKOFF_MAX + 5, until=lambda ret: ret)
+        results.append({
+            "fault": mode,
+            "outage_s": outage,
+            "detected_s": detected,
+            "first_frame_after_fix_s": recovered,
+            "reconnect_ms": camera.stats()["reconnect_ms"],
+            "slowest_read_ms": max(slow_lost, slow_out, slow_back) * 1000
+        })
+    stats = camera.stats()
+    camera.release()
+    return {"trials": results, "disconnects": stats["disconnects"], "read_timeouts": stats["read_timeouts"]}
+
+
+def measure_profiles(index=0, frames=150, profiles=None):
+    """Run the face detection step on live frames for each capture profile.
+    
+    Returns {profile: stats} where glass_to_state_ms covers sensor exposure,
+    driver queueing, decode and the face cascade that decides the state.
+    """
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    results = {}
+    for profile in profiles or CAPTURE_PROFILES:
+        camera = CameraManager(index, profile=profile)
+        camera.open_async()
+        if not camera.wait_ready(timeout=10):
+            results[profile] = {"state": camera.state}
+            camera.release()
+            continue
+        
+        for _ in range(frames):
+            ret, frame = camera.read(timeout=1.0)
+            if not ret:
+                continue
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100))
+            camera.mark_state_updated()
+        
+        results[profile] = camera.stats()
+        camera.release()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure glass-to-state latency per capture profile")
+    parser.add_argument("--measure", action="store_true", help="run the latency measurement")
+    parser.add_argument("--allocations", metavar="SOURCE",
+                        help="measure per-frame allocations on a camera index or video file")
+    parser.add_argument("--reconnect", metavar="VIDEO",
+                        help="unplug and hang a simulated camera playing VIDEO and time the recovery")
+    parser.add_argument("--index", type=int, default=0, help="camera index")
+    parser.add_argument("--frames", type=int, default=150, help="frames per profile")
+    args = parser.parse_args()
+    
+    if args.measure:
+        for profile, stats in measure_profiles(args.index, args.frames).items():
+            if stats.get("glass_to_state_ms") is None:
+                print(f"{profile:15s} unavailable ({stats.get('state')})")
+                continue
+            applied = stats["applied"]
+            print(f"{profile:15s} {applied['width']}x{applied['height']} {applied['fourcc']:4s} "
+                  f"@{applied['fps']:.0f} buf={applied['buffer_size']}  "
+                  f"open {stats['open_latency'] * 1000:.0f} ms  {stats['fps']:.1f} fps  "
+                  f"glass-to-state {stats['glass_to_state_ms']:.1f} ms (p95 {stats['glass_to_state_p95_ms']:.1f})  "
+                  f"dropped {stats['frames_dropped']}")
+    elif args.reconnect:
+        result = measure_reconnect(args.reconnect)
+        if result is None:
+            print("Could not open", args.reconnect)
+        else:
+            for trial in result["trials"]:
+                detected = trial["detected_s"]
+                recovered = trial["first_frame_after_fix_s"]
+                print(f"{trial['fault']:9s} for {trial['outage_s']:.0f} s: noticed after "
+                      f"{'never' if detected is None else f'{detected:.2f} s'}, first frame "
+                      f"{'never' if recovered is None else f'{recovered:.2f} s'} after the device came back "
+                      f"(frame gap {trial['reconnect_ms'] or 0:.0f} ms), slowest read() {trial['slowest_read_ms']:.2f} ms")
+            print(f"{result['disconnects']} disconnects, {result['read_timeouts']} read timeouts")
+    elif args.allocations is not None:
+        source = int(args.allocations) if args.allocations.isdigit() else args.allocations
+        result = measure_allocations(source)
+        if result is None:
+            print("Could not open", args.allocations)
+        else:
+            print(f"{result['frames']} frames, {result['bytes_per_frame']:.0f} bytes/frame allocated "
+                  f"(max {result['max_bytes_per_frame']}), {result['retained_bytes']} bytes retained")
+            if result["bytes_per_frame"] > ALLOCATION_LIMIT:
+                raise SystemExit(f"FAIL: over the {ALLOCATION_LIMIT} bytes/frame limit")
+    else:
+        parser.print_help()
\ No newline at end of file
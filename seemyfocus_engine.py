@@ -0,0 +1,955 @@
+"""Headless focus engine for SeeMyFocus
+
+Everything that decides focus state - face/eye detection, the distraction
+buffers, Pomodoro cycles, streaks, XP and achievements - lives here without
+any Tk dependency. SeeMyFocusApp subclasses FocusEngine and overrides the
+display hooks; multi-station workers drive it directly.
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from seemyfocus_calibration import DEFAULT_DETECTOR, run_face_cascade
+from seemyfocus_eyes import EyeTracker
+from seemyfocus_faces import PrimaryFaceTracker
+from seemyfocus_kalman import face_filter, eye_filter
+from seemyfocus_memory import SpillingTimeline, SPILL_DIR
+from seemyfocus_metrics import FrameMetrics
+from seemyfocus_query import HistoryIndex
+from seemyfocus_rollups import Rollups, ROLLUPS_FILE
+
+PROGRESS_FILE = "seemyfocus_progress.json"
+HISTORY_FILE = "seemyfocus_history.json"
+
+# Eyes not yet looked for; DetectionPipeline passes the ones its workers found
+NOT_LOCATED = object()
+
+
+class Setting:
+    """Minimal stand-in for a Tk variable when running without a UI"""
+    
+    def __init__(self, value=None):
+        self.value = value
+    
+    def get(self):
+        return self.value
+    
+    def set(self, value):
+        self.value = value
+
+
+class SystemClock:
+    """Wall-clock time, as the app uses it"""
+    
+    def time(self):
+        return time.time()
+    
+    def now(self):
+        return datetime.now()
+
+
+class SimulatedClock:
+    """Clock that only moves when told to, for running hours of session in seconds"""
+    
+    def __init__(self, start=None):
+        self.current = time.time() if start is None else start
+    
+    def time(self):
+        return self.current
+    
+    def now(self):
+        return datetime.fromtimestamp(self.current)
+    
+    def advance(self, seconds):
+        self.current += seconds
+    
+    def advance_to(self, when):
+        self.current = max(self.current, when)
+
+
+class FocusEngine:
+    """Focus tracking state machine shared by the app and headless stations"""
+    # Message priorities, matching NotificationQueue and AudioCueEngine
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    
+    # focus_timeline samples
+    TIMELINE_AWAY = 0
+    TIMELINE_FOCUSED = 1
+    TIMELINE_NO_CAMERA = 2
+    
+    def __init__(self, progress_file=PROGRESS_FILE, history_file=HISTORY_FILE, clock=None):
+        self.progress_file = progress_file
+        self.history_file = history_file
+        # Every timestamp the engine takes comes from here
+        self.clock = clock or SystemClock()
+        
+        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+        # Cascade settings; a calibration to the user's CPU budget replaces them per camera
+        self.detector = dict(DEFAULT_DETECTOR)
+        self.detect_buffers = {}
+        self.detector_calibrations = {}  # camera key -> calibration row, stored in the progress file
+        # Upper face band only, left/right ordered, template-tracked between cascade runs
+        self.eye_tracker = EyeTracker(self.eye_cascade)
+        # The user's face across frames; anyone else is handled by other_faces_policy
+        self.face_tracker = PrimaryFaceTracker()
+        self.primary_face = None
+        self.other_faces = []
+        # Constant-velocity smoothing of the face box and eye centres, restarted per face track
+        self.track_smoothing = True
+        self.face_filter = face_filter()
+        self.eye_filter = eye_filter()
+        self.face_track_id = None
+        
+        # Enhanced eye tracking - focused on eye gaze, not head movement
+        self.eye_history = []
+        self.eye_history_length = 15  # Longer history for smoother tracking
+        self.gaze_deviation_threshold = 25  # LOWERED - more strict, catches side-eyeing
+        self.looking_away_frames = 0
+        self.looking_away_threshold = 8  # More frames needed to register looking away
+        self.eyes_looking_straight = False
+        
+        # Session variables
+        self.session_active = False
+        self.session_start_time = None
+        self.session_id = None
+        self.session_task = ""
+        self.session_mood = ""
+        
+        # Pomodoro-style session management
+        self.focus_cycle_duration = 20 * 60  # 20 minutes in seconds
+        self.break_cycle_duration = 5 * 60   # 5 minutes in seconds
+        self.current_cycle_type = "focus"  # "focus" or "break"
+        self.cycle_start_time = None
+        self.cycles_completed = 0
+        self.CYCLE_CATCH_UP_LIMIT = 60  # seconds late before a cycle restarts from now
+        
+        # NEW: Off-screen / Paper Mode
+        self.offscreen_mode = self.make_setting(False)
+        
+        # NEW: Persistent streak counter
+        self.persistent_streak_count = 0  # Total streak across sessions
+        self.session_cycles = 0  # Cycles in current session only
+        
+        self.coaching_style = self.make_setting("Gentle")
+        self.other_faces_policy = self.make_setting("Ignore")  # or "Distraction"
+        self.privacy_shield = self.make_setting(True)
+        self.audio_cues = self.make_setting(True)
+        
+        # Focus tracking with buffer
+        self.current_state = "Away"
+        self.streak_time_sec = 0
+        self.streak_count = 0
+        self.longest_streak = 0
+        self.wellness_points = 0
+        self.focus_score = 0
+        self.focused_frames = 0
+        self.total_frames = 0
+        self.deep_work_meter = 0
+        
+        # Gamification with XP rewards
+        self.level = 1
+        self.xp = 0
+        self.xp_to_next_level = 100
+        self.total_sessions = 0
+        self.lifetime_wellness = 0
+        self.health_streak = 0
+        
+        # XP rewards system
+        self.xp_rewards = {
+            "complete_cycle": 50,
+            "maintain_focus_10min": 25,
+            "take_break": 20,
+            "complete_session": 100,
+            "perfect_focus": 150
+        }
+        
+        # NEW: Achievement system
+        self.achievements = {
+            "first_session": {"unlocked": False, "title": "First Steps", "description": "Complete your first session"},
+            "focus_master": {"unlocked": False, "title": "Focus Master", "description": "Reach 10 cycle streak"},
+            "wellness_warrior": {"unlocked": False, "title": "Wellness Warrior", "description": "Earn 500 wellness points"},
+            "level_5": {"unlocked": False, "title": "Rising Star", "description": "Reach level 5"},
+            "perfect_day": {"unlocked": False, "title": "Perfect Day", "description": "Complete 5 cycles in one session"},
+            "streak_legend": {"unlocked": False, "title": "Streak Legend", "description": "Maintain 20 cycle streak"}
+        }
+        
+        self.break_start_time = None
+        self.total_break_time = 0
+        self.no_camera_since = None  # set while the camera is gone
+        self.no_camera_time = 0
+        self.eligible_for_break_reward = False
+        self.break_rewarded = False
+        
+        self.eyes_detected_count = 0
+        self.no_eyes_count = 0
+        self.eye_detection_threshold = 3
+        
+        # Enhanced buffer system - more forgiving (INCREASED FROM 3 to 5 seconds)
+        self.away_buffer_start = None
+        self.return_buffer_start = None
+        self.last_state = "Away"
+        self.streak_start_time = None
+        self.last_focus_award = None  # (streak start, mark) of the last 10-minute award
+        self.distraction_buffer = 5.0  # 5 second buffer before breaking streak
+        self.distraction_start_time = None
+        
+        self.focus_timeline = self.new_timeline()
+        self.timeline_interval = 5
+        self.last_timeline_update = None
+        
+        # Unfocus reminder system
+        self.last_reminder_time = None
+        self.reminder_cooldown = 30  # Remind every 30 seconds when unfocused
+        self.reminder_count = 0
+        
+        self.FOCUS_TIME_REQUIRED = 60
+        self.BREAK_TIME_REQUIRED = 15
+        self.AWAY_BUFFER = 2.0  # Increased buffer time
+        self.RETURN_BUFFER = 1.0
+        self.TOO_CLOSE_THRESHOLD = 0.35
+        
+        self.session_history = []
+        self.history_index = HistoryIndex(self.session_history)  # time, task and mood lookups
+        # Daily and weekly totals, kept in step with the history by finish_session
+        self.rollups = Rollups()
+        self.rollups_file = os.path.join(os.path.dirname(history_file), ROLLUPS_FILE)
+        self.session_xp = 0  # all XP earned this session, focus awards included
+        
+        # Stage timings of the frame loop and persistence writes
+        self.metrics = FrameMetrics()
+        self.metrics.add_collector(self.eye_tracker.stats)
+        self.metrics.add_collector(self.face_tracker.stats)
+    
+    def make_setting(self, value):
+        """Create a user setting; the Tk app returns Tk variables instead"""
+        return Setting(value)
+    
+    def new_timeline(self):
+        """Focus samples of one session; hours of them spill next to the history file"""
+        return SpillingTimeline(os.path.join(os.path.dirname(self.history_file), SPILL_DIR))
+    
+    def progress_settings(self):
+        """User settings stored in the progress file, by key"""
+        return {
+            "coaching_style": self.coaching_style,
+            "other_faces_policy": self.other_faces_policy,
+            "privacy_shield": self.privacy_shield,
+            "audio_cues": self.audio_cues
+        }
+    
+    # Display hooks - no-ops headless, overridden by the Tk app
+    
+    def update_motivation(self, message, priority=NORMAL):
+        pass
+    
+    def play_audio_cue(self, cue, priority=NORMAL):
+        pass
+    
+    def present_reminder(self, message, xp_lost):
+        pass
+    
+    def show_level_up_notification(self):
+        pass
+    
+    def show_achievement_notification(self, title):
+        pass
+    
+    def update_stats_display(self):
+        pass
+    
+    def show_cycle_timer(self, remaining):
+        pass
+    
+    def refresh_streak_display(self):
+        pass
+    
+    def camera_ready(self):
+        """Whether the video source is delivering frames"""
+        return True
+    
+    def load_user_progress(self):
+        if os.path.exists(self.progress_file):
+            try:
+                with open(self.progress_file, "r") as f:
+                    data = json.load(f)
+                    self.level = data.get("level", 1)
+                    self.xp = data.get("xp", 0)
+                    self.xp_to_next_level = data.get("xp_to_next_level", 100)
+                    self.total_sessions = data.get("total_sessions", 0)
+                    self.lifetime_wellness = data.get("lifetime_wellness", 0)
+                    self.health_streak = data.get("health_streak", 0)
+                    self.persistent_streak_count = data.get("persistent_streak_count", 0)
+                    self.achievements = data.get("achievements", self.achievements)
+                    self.detector_calibrations = data.get("detector_calibrations", {})
+                    for key, setting in self.progress_settings().items():
+                        if key in data:
+                            setting.set(data[key])
+            except:
+                pass
+    
+    def save_user_progress(self):
+        data = {
+            "level": self.level,
+            "xp": self.xp,
+            "xp_to_next_level": self.xp_to_next_level,
+            "total_sessions": self.total_sessions,
+            "lifetime_wellness": self.lifetime_wellness,
+            "health_streak": self.health_streak,
+            "persistent_streak_count": self.persistent_streak_count,
+            "achievements": self.achievements,
+            "detector_calibrations": self.detector_calibrations
+        }
+        for key, setting in self.progress_settings().items():
+            data[key] = setting.get()
+        start = self.metrics.now()
+        with open(self.progress_file, "w") as f:
+            json.dump(data, f, indent=2)
+        self.metrics.lap("persist_progress", start)
+    
+    def load_session_history(self):
+        """Load session history from file"""
+        if os.path.exists(self.history_file):
+            try:
+                with open(self.history_file, "r") as f:
+                    self.session_history = json.load(f)
+            except:
+                self.session_history = []
+        self.history_index = HistoryIndex(self.session_history)
+        rollups = Rollups.load(self.rollups_file)
+        if rollups is None or rollups.sessions != len(self.session_history):
+            # Missing, from an older version or out of step with a hand-edited history
+            self.rebuild_rollups()
+        else:
+            self.rollups = rollups
+    
+    def save_session_history(self):
+        """Save session history to file"""
+        start = self.metrics.now()
+        with open(self.history_file, "w") as f:
+            json.dump(self.session_history, f, indent=2)
+        self.metrics.lap("persist_history", start)
+    
+    def save_rollups(self):
+        start = self.metrics.now()
+        self.rollups.save(self.rollups_file)
+        self.metrics.lap("persist_rollups", start)
+    
+    def rebuild_rollups(self):
+        """Regenerate the daily and weekly rollups from the whole history"""
+        self.rollups = Rollups.rebuild(self.session_history)
+        self.save_rollups()
+    
+    def add_xp(self, amount, reason=""):
+        """Add XP with level up system"""
+        self.xp += amount
+        self.session_xp += amount
+        
+        # Check for level up
+        while self.xp >= self.xp_to_next_level:
+            self.xp -= self.xp_to_next_level
+            self.level += 1
+            self.xp_to_next_level = int(self.xp_to_next_level * 1.5)
+            self.show_level_up_notification()
+            self.check_achievements()  # Check for level achievements
+        
+        self.save_user_progress()
+    
+    def show_unfocus_reminder(self):
+        """Remind the user (at most once per cooldown) when unfocused"""
+        current_time = self.clock.time()
+        
+        # Check cooldown
+        if self.last_reminder_time and (current_time - self.last_reminder_time) < self.reminder_cooldown:
+            return
+        
+        self.last_reminder_time = current_time
+        self.reminder_count += 1
+        
+        messages = [
+            "👀 Hey! Your focus drifted. Let's get back on track!",
+            "⚡ Quick reminder: Your task awaits!",
+            "🎯 Refocus! You've got this!",
+            "💪 Your streak is waiting! Come back!",
+            "🌟 Stay strong! You're doing great!"
+        ]
+        
+        message = messages[self.reminder_count % len(messages)]
+        
+        # XP penalty info
+        xp_lost = 5
+        self.xp = max(0, self.xp - xp_lost)
+        
+        self.present_reminder(message, xp_lost)
+    
+    def check_achievements(self):
+        """Check and unlock achievements"""
+        if self.total_sessions >= 1 and not self.achievements["first_session"]["unlocked"]:
+            self.achievements["first_session"]["unlocked"] = True
+            self.show_achievement_notification("First Steps")
+        
+        if self.persistent_streak_count >= 10 and not self.achievements["focus_master"]["unlocked"]:
+            self.achievements["focus_master"]["unlocked"] = True
+            self.show_achievement_notification("Focus Master")
+        
+        if self.lifetime_wellness >= 500 and not self.achievements["wellness_warrior"]["unlocked"]:
+            self.achievements["wellness_warrior"]["unlocked"] = True
+            self.show_achievement_notification("Wellness Warrior")
+        
+        if self.level >= 5 and not self.achievements["level_5"]["unlocked"]:
+            self.achievements["level_5"]["unlocked"] = True
+            self.show_achievement_notification("Rising Star")
+        
+        if self.session_cycles >= 5 and not self.achievements["perfect_day"]["unlocked"]:
+            self.achievements["perfect_day"]["unlocked"] = True
+            self.show_achievement_notification("Perfect Day")
+        
+        if self.persistent_streak_count >= 20 and not self.achievements["streak_legend"]["unlocked"]:
+            self.achievements["streak_legend"]["unlocked"] = True
+            self.show_achievement_notification("Streak Legend")
+        
+        self.save_user_progress()
+    
+    def start_session(self):
+        """Start a new focus session"""
+        self.session_active = True
+        self.session_start_time = self.clock.time()
+        self.cycle_start_time = self.clock.time()
+        self.current_cycle_type = "focus"
+        self.session_id = self.clock.now().isoformat()
+        self.session_xp = 0
+        
+        # Reset session stats
+        self.streak_time_sec = 0
+        self.streak_count = 0
+        self.longest_streak = 0
+        self.wellness_points = 0
+        self.focus_score = 0
+        self.focused_frames = 0
+        self.total_frames = 0
+        self.deep_work_meter = 0
+        self.total_break_time = 0
+        self.no_camera_since = None
+        self.no_camera_time = 0
+        self.eye_history = []
+        self.eye_tracker.reset()
+        self.face_tracker.reset()
+        self.primary_face = None
+        self.other_faces = []
+        self.face_filter.reset()
+        self.eye_filter.reset()
+        self.focus_timeline.discard()
+        self.focus_timeline = self.new_timeline()
+        self.cycles_completed = 0
+        self.session_cycles = 0  # Reset session cycles
+        self.reminder_count = 0
+        self.last_reminder_time = None
+        
+        self.update_motivation("🎯 Session started! Stay focused!")
+        self.play_audio_cue("session_start")
+    
+    def finish_session(self):
+        """Close the session, record it in history and award XP.
+        
+        Returns (session_data, xp_earned).
+        """
+        self.session_active = False
+        session_duration = int(self.clock.time() - self.session_start_time)
+        if self.no_camera_since is not None:
+            self.no_camera_time += self.clock.time() - self.no_camera_since
+            self.no_camera_since = None
+        
+        # Calculate final stats
+        session_data = {
+            "timestamp": self.session_id,
+            "task": self.session_task,
+            "mood": self.session_mood,
+            "session_time": session_duration,
+            "focus_score": self.focus_score,
+            "streak_count": self.session_cycles,  # Use session cycles
+            "longest_streak": self.longest_streak,
+            "wellness_points": self.wellness_points,
+            "break_time": self.total_break_time,
+            "no_camera_time": int(self.no_camera_time),
+            "focus_timeline": self.focus_timeline.to_list()
+        }
+        self.focus_timeline.discard()
+        
+        # Update lifetime stats
+        self.total_sessions += 1
+        self.lifetime_wellness += self.wellness_points
+        
+        # Award completion XP
+        xp_earned = self.xp_rewards["complete_session"]
+        self.add_xp(xp_earned, "Session completed!")
+        
+        # Perfect focus bonus
+        if self.focus_score >= 90:
+            bonus_xp = self.xp_rewards["perfect_focus"]
+            self.add_xp(bonus_xp, "Perfect focus!")
+            xp_earned += bonus_xp
+        
+        # Save to history, with every XP point of the session, and add it to its day and week
+        session_data["xp_earned"] = self.session_xp
+        self.session_history.append(session_data)
+        self.save_session_history()
+        self.history_index.add(len(self.session_history) - 1)
+        self.rollups.add(session_data)
+        self.save_rollups()
+        
+        # Check achievements
+        self.check_achievements()
+        
+        self.save_user_progress()
+        
+        return session_data, xp_earned
+    
+    def cycle_duration(self):
+        return self.focus_cycle_duration if self.current_cycle_type == "focus" else self.break_cycle_duration
+    
+    def cycle_remaining(self):
+        """Seconds left in the current focus or break cycle"""
+        if not self.cycle_start_time:
+            return 0
+        return max(0, int(self.cycle_duration() - (self.clock.time() - self.cycle_start_time)))
+    
+    def next_cycle_start(self, now):
+        """The next cycle starts when this one was due to end, so a late check
+        never pushes later cycles back; after a long stall (e.g. the laptop
+        slept) it starts now instead of replaying the missed cycles."""
+        deadline = self.cycle_start_time + self.cycle_duration()
+        return deadline if now - deadline < self.CYCLE_CATCH_UP_LIMIT else now
+    
+    def live_state(self):
+        """What integrations see: the state pushed by the live-state API"""
+        return {
+            "session_active": self.session_active,
+            "state": self.current_state,
+            "cycle": self.current_cycle_type,
+            "remaining": self.cycle_remaining() if self.session_active else 0,
+            "streak": self.persistent_streak_count,
+            "score": self.focus_score
+        }
+    
+    def update_cycle_timer(self):
+        """Update cycle timer display"""
+        if not self.session_active or not self.cycle_start_time:
+            return
+        
+        current_time = self.clock.time()
+        elapsed = int(current_time - self.cycle_start_time)
+        
+        if self.current_cycle_type == "focus":
+            remaining = self.focus_cycle_duration - elapsed
+            if remaining <= 0:
+                # Focus cycle complete - only increment if actually focused OR in paper mode with face present
+                is_paper_mode_focused = self.offscreen_mode.get() and self.camera_ready()
+                
+                if self.current_state == "Focused" or is_paper_mode_focused:
+                    self.cycles_completed += 1
+                    self.session_cycles += 1
+                    self.persistent_streak_count += 1  # Increment persistent streak
+                    
+                    self.add_xp(self.xp_rewards["complete_cycle"], "Cycle complete!")
+                    self.update_motivation("🎉 Focus cycle complete! Take a break!")
+                    self.play_audio_cue("focus_complete", FocusEngine.HIGH)
+                    
+                    # Update displays
+                    self.refresh_streak_display()
+                    
+                    self.check_achievements()
+                    self.save_user_progress()
+                else:
+                    self.update_motivation("⚠️ Cycle ended but focus was lost. No streak bonus.")
+                
+                # Switch to break
+                self.cycle_start_time = self.next_cycle_start(current_time)
+                self.current_cycle_type = "break"
+                return
+        else:  # break
+            remaining = self.break_cycle_duration - elapsed
+            if remaining <= 0:
+                # Break complete!
+                self.wellness_points += 10
+                self.add_xp(self.xp_rewards["take_break"], "Break taken!")
+                self.update_motivation("💪 Break over! Back to focus!")
+                self.play_audio_cue("break_over", FocusEngine.HIGH)
+                
+                # Switch to focus
+                self.cycle_start_time = self.next_cycle_start(current_time)
+                self.current_cycle_type = "focus"
+                return
+        
+        # Update display
+        self.show_cycle_timer(remaining)
+    
+    def confirm_distraction(self):
+        """Away for the whole distraction buffer: break the streak and remind"""
+        if self.current_state != "Away":
+            # Break streak ONLY during focus time
+            if self.current_cycle_type == "focus":
+                self.update_motivation("❌ Distracted! Streak broken.",
+                                       priority=FocusEngine.HIGH)
+                self.play_audio_cue("streak_broken")
+                self.persistent_streak_count = 0  # Reset persistent streak
+                self.refresh_streak_display()
+                self.save_user_progress()
+            
+            # Show reminder
+            if self.current_cycle_type == "focus":
+                self.show_unfocus_reminder()
+        
+        self.current_state = "Away"
+        self.return_buffer_start = None
+    
+    def next_timer_deadline(self):
+        """Absolute time run_timers() next has work to do; None outside a session.
+        
+        That is the next second of the cycle countdown (the cycle boundary is
+        one of them) or the end of a pending distraction buffer, whichever
+        comes first. Drivers arm a timer for it instead of waiting for frames.
+        """
+        if not self.session_active or not self.cycle_start_time:
+            return None
+        elapsed = self.clock.time() - self.cycle_start_time
+        deadline = self.cycle_start_time + min(int(elapsed) + 1, self.cycle_duration())
+        if self.distraction_start_time is not None and self.current_state != "Away":
+            deadline = min(deadline, self.distraction_start_time + self.distraction_buffer)
+        return deadline
+    
+    def run_timers(self):
+        """Deadline work that must not wait for the next camera frame"""
+        if not self.session_active:
+            return
+        if (self.distraction_start_time is not None and self.current_state != "Away"
+                and self.clock.time() - self.distraction_start_time >= self.distraction_buffer):
+            self.confirm_distraction()
+        self.update_cycle_timer()
+    
+    def process_no_camera(self):
+        """Called instead of process_face_detection while the camera is gone.
+        
+        The time is recorded as NoCamera rather than Away: no reminders, no
+        broken streak and no focus score change. When frames return, the
+        normal buffers decide the state again.
+        """
+        current_time = self.clock.time()
+        if self.last_timeline_update is None or current_time - self.last_timeline_update >= self.timeline_interval:
+            self.focus_timeline.append(FocusEngine.TIMELINE_NO_CAMERA)
+            self.last_timeline_update = current_time
+        
+        if self.no_camera_since is None:
+            self.no_camera_since = current_time
+        if self.current_state != "NoCamera":
+            self.current_state = "NoCamera"
+            self.last_state = "NoCamera"
+            self.distraction_start_time = None
+            self.return_buffer_start = None
+            self.eyes_looking_straight = False
+            self.update_motivation("📷 Camera disconnected - reconnecting...", priority=FocusEngine.HIGH)
+        self.update_stats_display()
+    
+    def in_break(self):
+        """Break cycles only need a presence check, not face and eye tracking"""
+        return self.session_active and self.current_cycle_type == "break"
+    
+    def process_break_presence(self, frame, present):
+        """Called instead of process_face_detection during breaks.
+        
+        Breaks end on time whatever the user does, so a frame only records
+        whether someone is at the desk. Frame counts and the focus score are
+        left alone, and tracks start over when focus time resumes.
+        """
+        current_time = self.clock.time()
+        if self.no_camera_since is not None:
+            self.no_camera_time += current_time - self.no_camera_since
+            self.no_camera_since = None
+        
+        if self.last_timeline_update is None or current_time - self.last_timeline_update >= self.timeline_interval:
+            self.focus_timeline.append(FocusEngine.TIMELINE_FOCUSED if present else FocusEngine.TIMELINE_AWAY)
+            self.last_timeline_update = current_time
+        
+        self.face_tracker.reset()
+        self.eye_tracker.reset()
+        self.eye_filter.reset()
+        self.eye_history = []
+        self.primary_face, self.other_faces = None, []
+        self.eyes_looking_straight = False
+        self.distraction_start_time = None
+        self.return_buffer_start = None
+        self.current_state = "Focused" if present else "Away"
+        self.last_state = self.current_state
+        self.update_stats_display()
+    
+    def detect_faces(self, gray):
+        """Face boxes in a grayscale frame"""
+        return run_face_cascade(self.face_cascade, gray, self.detector, self.detect_buffers)
+    
+    def apply_detector(self, detector):
+        """Use calibrated cascade settings for faces and eyes"""
+        self.detector = dict(DEFAULT_DETECTOR, **detector)
+        self.eye_tracker.scale_factor = self.detector["eye_scale_factor"]
+        self.eye_tracker.min_neighbors = self.detector["eye_min_neighbors"]
+        self.eye_tracker.min_size = self.detector["eye_min_size"]
+        self.eye_tracker.reset()
+    
+    def smooth_face(self, box, now):
+        """Smoothed face box; a new identity track starts both filters over"""
+        if self.face_tracker.acquired != self.face_track_id:
+            self.face_track_id = self.face_tracker.acquired
+            self.face_filter.reset()
+            self.eye_filter.reset()
+        x, y, w, h = np.rint(self.face_filter.update(box, now)).astype(int)
+        return int(x), int(y), int(w), int(h)
+    
+    def track_faces(self, faces, now):
+        """(primary, others): the user's smoothed face box and everyone else"""
+        primary, others = self.face_tracker.update(faces)
+        if primary is not None and self.track_smoothing:
+            primary = self.smooth_face(primary, now)
+        return primary, others
+    
+    def eye_check_rect(self, frame, primary, others):
+        """The face box process_face_detection will look for eyes in, or None"""
+        if self.offscreen_mode.get() or primary is None:
+            return None
+        if others and self.other_faces_policy.get() == "Distraction":
+            return None
+        if primary[2] / frame.shape[1] > self.TOO_CLOSE_THRESHOLD:
+            return None
+        return primary
+    
+    def detect_eye_gaze(self, frame, gray, face_rect, eyes=NOT_LOCATED):
+        """Detect if eyes are looking at screen - enhanced to catch side-eyeing"""
+        # Eye centres relative to the face, always left eye first
+        if eyes is NOT_LOCATED:
+            eyes = self.eye_tracker.locate(gray, face_rect)
+        
+        if eyes is None:
+            self.eye_filter.reset()
+        else:
+            if self.track_smoothing:
+                eyes = self.eye_filter.update(eyes, self.clock.time()).reshape(2, 2)
+            eye_centers = [tuple(centre) for centre in eyes]
+            
+            # Add to history
+            self.eye_history.append(eye_centers)
+            if len(self.eye_history) > self.eye_history_length:
+                self.eye_history.pop(0)
+            
+            # Analyze eye movement to detect side-eyeing
+            if len(self.eye_history) >= 3:
+                recent_positions = self.eye_history[-3:]
+                deviations = []
+                
+                # Calculate deviation between consecutive frames
+                for i in range(len(recent_positions) - 1):
+                    for j in range(min(len(recent_positions[i]), len(recent_positions[i+1]))):
+                        if j < len(recent_positions[i]) and j < len(recent_positions[i+1]):
+                            dx = recent_positions[i+1][j][0] - recent_positions[i][j][0]
+                            dy = recent_positions[i+1][j][1] - recent_positions[i][j][1]
+                            deviation = np.sqrt(dx**2 + dy**2)
+                            deviations.append(deviation)
+                
+                if deviations:
+                    avg_deviation = np.mean(deviations)
+                    
+                    # Check for horizontal eye movement (side-eyeing)
+                    # If eyes are moving horizontally a lot, user is looking away
+                    horizontal_movements = []
+                    for i in range(len(recent_positions) - 1):
+                        for j in range(min(len(recent_positions[i]), len(recent_positions[i+1]))):
+                            if j < len(recent_positions[i]) and j < len(recent_positions[i+1]):
+                                dx = abs(recent_positions[i+1][j][0] - recent_positions[i][j][0])
+                                horizontal_movements.append(dx)
+                    
+                    if horizontal_movements:
+                        avg_horizontal = np.mean(horizontal_movements)
+                        # If strong horizontal movement, they're side-eyeing
+                        if avg_horizontal > 8:  # LOWERED threshold - stricter detection of side-eyeing
+                            return True, False  # Eyes detected but not looking straight
+                    
+                    # Overall deviation check
+                    looking_straight = avg_deviation < self.gaze_deviation_threshold
+                    return True, looking_straight
+            
+            # Not enough history yet, assume looking straight
+            return True, True
+        
+        # Eyes not detected
+        return False, False
+    
+    def process_face_detection(self, frame, faces, gray, tracked=None, eyes=NOT_LOCATED, present=None):
+        """Process face detection with enhanced buffer system and paper mode support
+        
+        tracked and eyes are passed by DetectionPipeline, which has already
+        run track_faces() and located the eyes on a worker thread. present
+        is Paper Mode presence from DeskPresence; without it a tracked face
+        counts as presence.
+        """
+        current_time = self.clock.time()
+        self.total_frames += 1
+        
+        # Frames are back after an outage
+        if self.no_camera_since is not None:
+            self.no_camera_time += current_time - self.no_camera_since
+            self.no_camera_since = None
+        
+        # Only the user's face counts as presence
+        primary, others = tracked if tracked is not None else self.track_faces(faces, current_time)
+        someone_else = bool(others) and self.other_faces_policy.get() == "Distraction"
+        if someone_else and not self.other_faces:
+            self.update_motivation("👥 Someone else is in view")
+        self.primary_face, self.other_faces = primary, others
+        at_desk = primary is not None if present is None else present
+        paper_present = self.offscreen_mode.get() and at_desk and not someone_else
+        
+        # Update timeline
+        is_focused_state = (self.current_state == "Focused") or paper_present
+        if self.last_timeline_update is None or current_time - self.last_timeline_update >= self.timeline_interval:
+            self.focus_timeline.append(1 if is_focused_state else 0)
+            self.last_timeline_update = current_time
+        
+        eyes_detected = False
+        looking_straight = False
+        detected_state = "Away"
+        
+        # Paper mode handling
+        if self.offscreen_mode.get():
+            # In paper mode, just check if the user's face is present anywhere in frame
+            if paper_present:
+                # Face detected = still working, treat as focused
+                eyes_detected = True
+                looking_straight = True
+                detected_state = "Focused"  # Treat as focused in paper mode
+            else:
+                # No face at all = actually away
+                detected_state = "Away"
+        else:
+            # Normal mode - check eye gaze and distance
+            if someone_else:
+                # Policy: other people in view count as a distraction
+                self.eyes_detected_count = 0
+                detected_state = "Away"
+            elif primary is not None:
+                x, y, w, h = primary
+                
+                # Check if too close first
+                face_ratio = w / frame.shape[1]
+                
+                if face_ratio > self.TOO_CLOSE_THRESHOLD:
+                    detected_state = "TooClose"
+                    eyes_detected = False
+                    looking_straight = False
+                else:
+                    # Not too close, check eye gaze
+                    start = self.metrics.now()
+                    eyes_detected, looking_straight = self.detect_eye_gaze(frame, gray, (x, y, w, h), eyes)
+                    self.metrics.lap("eye_gaze", start)
+                    
+                    if eyes_detected and looking_straight:
+                        self.eyes_detected_count += 1
+                        self.no_eyes_count = 0
+                        detected_state = "Focused"
+                    else:
+                        self.no_eyes_count += 1
+                        # More forgiving - short glances away are okay
+                        if self.no_eyes_count < self.eye_detection_threshold:
+                            eyes_detected = True
+                            looking_straight = True
+                            detected_state = "Focused"
+                        else:
+                            self.eyes_detected_count = 0
+                            detected_state = "Away"
+            else:
+                # No face detected at all
+                self.eyes_detected_count = 0
+                self.no_eyes_count += 1
+                detected_state = "Away"
+        
+        # Apply distraction buffer - don't break streak immediately
+        # SPECIAL HANDLING FOR PAPER MODE - if face present, never mark as Away
+        if paper_present:
+            # In paper mode with face present, always treat as focused
+            detected_state = "Focused"
+            self.distraction_start_time = None  # Reset distraction timer
+            
+            if self.current_state == "Away":
+                if self.return_buffer_start is None:
+                    self.return_buffer_start = current_time
+                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
+                    self.current_state = "Focused"
+            else:
+                self.current_state = "Focused"
+                self.return_buffer_start = None
+        elif detected_state == "Away":
+            if self.distraction_start_time is None:
+                self.distraction_start_time = current_time
+            elif current_time - self.distraction_start_time >= self.distraction_buffer:
+                self.confirm_distraction()
+        elif detected_state == "TooClose":
+            # Reset distraction buffer for too close
+            self.distraction_start_time = None
+            
+            if self.current_state == "Away":
+                if self.return_buffer_start is None:
+                    self.return_buffer_start = current_time
+                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
+                    self.current_state = "TooClose"
+            else:
+                self.current_state = "TooClose"
+                self.return_buffer_start = None
+        else:  # Focused
+            # Reset distraction buffer
+            self.distraction_start_time = None
+            
+            if self.current_state == "Away":
+                if self.return_buffer_start is None:
+                    self.return_buffer_start = current_time
+                elif current_time - self.return_buffer_start >= self.RETURN_BUFFER:
+                    self.current_state = "Focused"
+            else:
+                self.current_state = "Focused"
+                self.return_buffer_start = None
+        
+        # Update focus tracking - count TooClose AND PAPER MODE as focused for stats
+        if self.current_state in ["Focused", "TooClose"] or paper_present:
+            self.focused_frames += 1
+            
+            if self.streak_start_time is None:
+                self.streak_start_time = current_time
+            
+            self.streak_time_sec = int(current_time - self.streak_start_time)
+            
+            # Award XP for sustained focus - once per mark, even when frames are seconds apart
+            award_mark = (self.streak_start_time, self.streak_time_sec // 600)
+            if self.streak_time_sec >= 600 and award_mark != self.last_focus_award:  # Every 10 minutes
+                self.last_focus_award = award_mark
+                self.add_xp(self.xp_rewards["maintain_focus_10min"], "10 min focus!")
+        
+        elif self.current_state == "Away" and not paper_present:
+            if self.break_start_time is None:
+                self.break_start_time = current_time
+        
+        # Update progress
+        if self.last_state in ("Away", "NoCamera") and self.current_state in ["Focused", "TooClose"]:
+            self.streak_start_time = current_time
+            self.streak_time_sec = 0
+            self.break_start_time = None
+        
+        self.last_state = self.current_state
+        
+        # Calculate focus score
+        if self.total_frames > 0:
+            self.focus_score = int((self.focused_frames / self.total_frames) * 100)
+            self.deep_work_meter = self.focus_score
+        
+        # The overlay is drawn on the mirrored display copy by update_camera
+        self.eyes_looking_straight = eyes_detected and looking_straight
+        self.update_stats_display()
\ No newline at end of file
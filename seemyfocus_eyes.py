@@ -0,0 +1,265 @@
+"""Eye localisation for SeeMyFocus gaze checks
+
+The eye cascade used to scan the whole face every frame and the first two
+hits were taken as the eyes, in whatever order they came back. Nostrils and
+mouth corners were picked up as eyes, and the pair swapped places from one
+frame to the next, which read as large eye movement.
+
+EyeTracker searches only the upper band of the face, where eyes can be,
+keeps the candidate pair that looks most like two eyes side by side and
+always returns it left eye first. Between cascade runs it follows both eyes
+with template matching in a small window around their last position, and
+the cascade only runs again every few frames or when tracking is lost.
+    
+    python seemyfocus_eyes.py --video desk.mp4     # compare with the cascade on every frame
+    python seemyfocus_eyes.py --image portrait.jpg # the same on a photo drifting across the frame
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+EYE_BAND = (0.15, 0.55)    # top and bottom of the eye search, as fractions of the face height
+REDETECT_EVERY = 6         # frames tracked by template before the cascade runs again
+MATCH_THRESHOLD = 0.6      # normalised correlation a tracked eye must reach
+SEARCH_MARGIN = 0.5        # search window padding around an eye, in eye sizes
+RESCALE_LIMIT = 0.15       # face size change that makes the templates useless
+
+# Geometry of a plausible pair, as fractions of the face size
+PAIR_MIN_DX = 0.2
+PAIR_MAX_DX = 0.75
+PAIR_MAX_DY = 0.15
+PAIR_MAX_SIZE_RATIO = 1.6
+
+
+def pair_eyes(boxes, face_w, face_h):
+    """Best left/right pair from eye boxes in face coordinates, or None.
+    
+    Returns ((left_box, right_box), score); lower scores are better.
+    """
+    best = None
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            left, right = sorted((boxes[i], boxes[j]), key=lambda box: box[0] + box[2] / 2)
+            lx, ly = left[0] + left[2] / 2, left[1] + left[3] / 2
+            rx, ry = right[0] + right[2] / 2, right[1] + right[3] / 2
+            dx, dy = rx - lx, abs(ry - ly)
+            sizes = sorted((left[2], right[2]))
+            if not PAIR_MIN_DX * face_w <= dx <= PAIR_MAX_DX * face_w:
+                continue
+            if dy > PAIR_MAX_DY * face_h or sizes[1] > PAIR_MAX_SIZE_RATIO * sizes[0]:
+                continue
+            # Level, same size and centred on the face
+            score = dy / face_h + (sizes[1] - sizes[0]) / sizes[1] + abs((lx + rx) / 2 - face_w / 2) / face_w
+            if best is None or score < best[1]:
+                best = ((left, right), score)
+    return best
+
+
+class EyeTracker:
+    """Finds both eyes in a face box; cascade every few frames, templates in between"""
+    
+    def __init__(self, cascade, redetect_every=REDETECT_EVERY, scale_factor=1.1, min_neighbors=5, min_size=20):
+        self.cascade = cascade
+        self.redetect_every = redetect_every
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+        self.templates = None   # [(patch, (cx, cy))] for the left and right eye, centres in face coordinates
+        self.face_width = None  # face width the templates were cut at
+        self.since_detect = 0
+        
+        self.cascade_runs = 0
+        self.tracked = 0
+        self.misses = 0
+    
+    def reset(self):
+        self.templates = None
+        self.face_width = None
+        self.since_detect = 0
+    
+    def locate(self, gray, face_rect):
+        """(left, right) eye centres relative to the face box, or None"""
+        x, y, w, h = face_rect
+        if (self.templates is not None and self.since_detect < self.redetect_every
+                and abs(w - self.face_width) <= RESCALE_LIMIT * self.face_width):
+            centres = self.track(gray, face_rect)
+            if centres is not None:
+                self.tracked += 1
+                self.since_detect += 1
+                return centres
+        
+        centres = self.detect(gray, face_rect)
+        if centres is None:
+            self.misses += 1
+            self.reset()
+        return centres
+    
+    def detect(self, gray, face_rect):
+        x, y, w, h = face_rect
+        top, bottom = int(h * EYE_BAND[0]), int(h * EYE_BAND[1])
+        band = gray[y + top:y + bottom, x:x + w]
+        self.cascade_runs += 1
+        if band.size == 0:
+            return None
+        boxes = self.cascade.detectMultiScale(band, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors,
+                                              minSize=(self.min_size, self.min_size),
+                                              maxSize=(w // 2, w // 2))
+        best = pair_eyes([(bx, by + top, bw, bh) for bx, by, bw, bh in boxes], w, h)
+        if best is None:
+            return None
+        
+        templates = []
+        for bx, by, bw, bh in best[0]:
+            patch = gray[y + by:y + by + bh, x + bx:x + bx + bw].copy()
+            templates.append((patch, (bx + bw // 2, by + bh // 2)))
+        self.templates = templates
+        self.face_width = w
+        self.since_detect = 0
+        return tuple(centre for _, centre in templates)
+    
+    def track(self, gray, face_rect):
+        """Both eyes matched near their last face-relative position, or None"""
+        x, y, w, h = face_rect
+        height, width = gray.shape[:2]
+        found = []
+        for patch, (cx, cy) in self.templates:
+            ph, pw = patch.shape
+            pad_x, pad_y = int(pw * SEARCH_MARGIN), int(ph * SEARCH_MARGIN)
+            left = max(0, x + cx - pw // 2 - pad_x)
+            top = max(0, y + cy - ph // 2 - pad_y)
+            right = min(width, x + cx + pw - pw // 2 + pad_x)
+            bottom = min(height, y + cy + ph - ph // 2 + pad_y)
+            if right - left < pw or bottom - top < ph:
+                return None
+            scores = cv2.matchTemplate(gray[top:bottom, left:right], patch, cv2.TM_CCOEFF_NORMED)
+            _, best, _, (mx, my) = cv2.minMaxLoc(scores)
+            if best < MATCH_THRESHOLD:
+                return None
+            found.append((left + mx + pw // 2 - x, top + my + ph // 2 - y))
+        
+        (lx, ly), (rx, ry) = found
+        if not PAIR_MIN_DX * w <= rx - lx <= PAIR_MAX_DX * w or abs(ry - ly) > PAIR_MAX_DY * h:
+            return None
+        # Follow the eyes; the patches themselves are only refreshed by the cascade
+        self.templates = [(patch, centre) for (patch, _), centre in zip(self.templates, found)]
+        return tuple(found)
+    
+    def stats(self):
+        frames = self.cascade_runs + self.tracked
+        return {
+            "eye_cascade_runs": self.cascade_runs,
+            "eye_tracked_frames": self.tracked,
+            "eye_misses": self.misses,
+            "eye_cascade_skip_ratio": self.tracked / frames if frames else 0.0
+        }
+
+
+def cascade_every_frame(cascade, gray, face_rect):
+    """The previous behaviour: first two hits anywhere in the face, unordered"""
+    x, y, w, h = face_rect
+    eyes = cascade.detectMultiScale(gray[y:y + h, x:x + w], scaleFactor=1.1, minNeighbors=5, minSize=(20, 20))
+    if len(eyes) < 2:
+        return None
+    return tuple((ex + ew // 2, ey + eh // 2) for ex, ey, ew, eh in eyes[:2])
+
+
+def drifting_frames(path, count=300, size=(480, 640), scale=2.5):
+    """A photo moved slowly around a noisy frame, standing in for a webcam recording"""
+    image = cv2.imread(path)
+    if image is None:
+        raise SystemExit(f"Could not read {path}")
+    image = cv2.resize(image, None, fx=scale, fy=scale)
+    rng = np.random.default_rng(3)
+    height, width = size
+    ih, iw = image.shape[:2]
+    if ih > height or iw > width:
+        raise SystemExit(f"{path} is too large for a {width}x{height} frame at {scale}x")
+    room_x, room_y = (width - iw) // 2, (height - ih) // 2
+    frames = []
+    for number in range(count):
+        frame = np.full((height, width, 3), 90, np.uint8)
+        ox = room_x + int(min(60, room_x) * np.sin(number / 40))
+        oy = room_y + int(min(20, room_y) * np.sin(number / 25))
+        frame[oy:oy + ih, ox:ox + iw] = image
+        noise = rng.normal(0, 4, frame.shape)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def video_frames(path, count):
+    capture = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < count:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+def compare(frames):
+    """Eye cost and gaze stability of the old per-frame cascade and the tracker on the same frames"""
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+    samples = []
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100))
+        if len(faces):
+            samples.append((gray, tuple(faces[0])))
+    if not samples:
+        raise SystemExit("No face found in these frames")
+    
+    tracker = EyeTracker(eye_cascade)
+    methods = {
+        "cascade every frame": lambda gray, face: cascade_every_frame(eye_cascade, gray, face),
+        "band + tracking": tracker.locate
+    }
+    results = {}
+    for name, locate in methods.items():
+        times, found, moves, swaps = [], 0, [], 0
+        previous = None
+        for gray, face in samples:
+            start = time.perf_counter()
+            centres = locate(gray, face)
+            times.append(time.perf_counter() - start)
+            if centres is None:
+                previous = None
+                continue
+            found += 1
+            if previous is not None:
+                moves += [np.hypot(c[0] - p[0], c[1] - p[1]) for c, p in zip(centres, previous)]
+                if (centres[0][0] - centres[1][0]) * (previous[0][0] - previous[1][0]) < 0:
+                    swaps += 1
+            previous = centres
+        results[name] = {
+            "mean_ms": float(np.mean(times)) * 1000,
+            "found": found / len(samples),
+            "mean_move_px": float(np.mean(moves)) if moves else None,
+            "swaps": swaps
+        }
+    results["band + tracking"].update(tracker.stats())
+    return len(samples), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare eye localisation methods")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="recording with a face in it")
+    source.add_argument("--image", help="photo of a face, moved around the frame")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    
+    frames = video_frames(args.video, args.frames) if args.video else drifting_frames(args.image, args.frames)
+    faces, results = compare(frames)
+    print(f"{faces} frames with a face")
+    for name, stats in results.items():
+        move = "n/a" if stats["mean_move_px"] is None else f"{stats['mean_move_px']:.1f} px"
+        print(f"{name:20s} {stats['mean_ms']:6.2f} ms/frame  eyes found {stats['found'] * 100:5.1f}%  "
+              f"frame-to-frame eye movement {move}  left/right swaps {stats['swaps']}")
+    tracked = results["band + tracking"]
+    print(f"cascade ran on {tracked['eye_cascade_runs']} frames, skipped on {tracked['eye_tracked_frames']} "
+          f"({tracked['eye_cascade_skip_ratio'] * 100:.0f}%)")
\ No newline at end of file
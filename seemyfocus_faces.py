@@ -0,0 +1,153 @@
+"""Primary-face tracking for SeeMyFocus
+
+The face cascade returns faces in no particular order, and the focus check
+used to take whichever came first. In a shared room a passer-by could
+become the tracked face for a frame, and any face at all counted as
+presence.
+
+PrimaryFaceTracker keeps one identity track for the user. It starts on
+the largest face, the one nearest the camera, and then follows the
+detection that overlaps it best (IoU) at a similar size. A detection the
+cascade misses for a few frames does not hand the track to someone else.
+Every other face is reported separately, so the engine can ignore it or
+count it as a distraction (the "other people in view" setting).
+    
+    python seemyfocus_faces.py --demo    # identity switches: first face vs tracker, scripted room
+"""
+import argparse
+import random
+
+OTHER_FACES_POLICIES = ("Ignore", "Distraction")
+
+MIN_IOU = 0.3            # overlap that continues the track
+MAX_SIZE_CHANGE = 1.25   # larger/smaller width ratio from one frame to the next
+MAX_JUMP = 0.5           # without overlap: centre movement allowed, in face widths
+MAX_MISSED = 10          # frames the track survives without a matching detection
+
+
+def iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+class PrimaryFaceTracker:
+    """Follows the user's face across frames and separates everyone else"""
+    
+    def __init__(self, max_missed=MAX_MISSED):
+        self.max_missed = max_missed
+        self.track = None   # last box of the user's face
+        self.missed = 0     # frames since the track last matched a detection
+        
+        self.acquired = 0   # times a new track was started
+        self.lost = 0       # times the track expired
+    
+    def reset(self):
+        self.track = None
+        self.missed = 0
+    
+    def update(self, faces):
+        """(primary, others): the user's face box or None, and the remaining boxes"""
+        boxes = [tuple(int(v) for v in face) for face in faces]
+        if self.track is not None:
+            match = self.match(boxes)
+            if match is not None:
+                self.track = boxes.pop(match)
+                self.missed = 0
+                return self.track, boxes
+            self.missed += 1
+            if self.missed <= self.max_missed:
+                # Briefly lost; keep the identity and do not promote anyone else
+                return None, boxes
+            self.lost += 1
+            self.reset()
+        
+        if not boxes:
+            return None, boxes
+        largest = max(range(len(boxes)), key=lambda i: boxes[i][2] * boxes[i][3])
+        self.track = boxes.pop(largest)
+        self.missed = 0
+        self.acquired += 1
+        return self.track, boxes
+    
+    def match(self, boxes):
+        """Index of the detection that continues the track, or None"""
+        tx, ty, tw, th = self.track
+        best, best_score = None, 0.0
+        for index, box in enumerate(boxes):
+            x, y, w, h = box
+            if max(w, tw) > MAX_SIZE_CHANGE * min(w, tw):
+                continue
+            score = iou(self.track, box)
+            if score < MIN_IOU:
+                # A fast move can leave no overlap; accept a short jump at the same size
+                jump = ((x + w / 2 - tx - tw / 2) ** 2 + (y + h / 2 - ty - th / 2) ** 2) ** 0.5
+                if jump > MAX_JUMP * tw:
+                    continue
+                score = MIN_IOU * (1 - jump / (MAX_JUMP * tw + 1))
+            if score > best_score:
+                best, best_score = index, score
+        return best
+    
+    def stats(self):
+        return {"face_tracks_acquired": self.acquired, "face_tracks_lost": self.lost}
+
+
+def scripted_room(frames=3000, seed=5):
+    """Detections of a user at the desk plus people walking by behind, in shuffled order.
+    
+    Yields (detections, user_box); user_box is None on frames where the
+    cascade misses the user.
+    """
+    rng = random.Random(seed)
+    walkers = []
+    for number in range(frames):
+        user = (260 + rng.randint(-6, 6) + int(30 * ((number // 200) % 2)), 140 + rng.randint(-4, 4), 180, 180)
+        if number % 150 == 0:
+            start = rng.choice((-120, 640))
+            walkers.append([start, rng.randint(60, 200), rng.randint(70, 140), 6 if start < 0 else -6])
+        detections = [] if rng.random() < 0.05 else [user]
+        for walker in walkers:
+            walker[0] += walker[3]
+            detections.append((walker[0], walker[1], walker[2], walker[2]))
+        walkers = [w for w in walkers if -150 < w[0] < 700]
+        rng.shuffle(detections)
+        yield detections, (user if user in detections else None)
+
+
+def demo(frames=3000):
+    """How often each method follows someone other than the user"""
+    tracker = PrimaryFaceTracker()
+    wrong_first = wrong_tracked = frames_with_others = 0
+    for detections, user in scripted_room(frames):
+        if len(detections) > 1:
+            frames_with_others += 1
+        first = detections[0] if detections else None
+        if first is not None and first != user:
+            wrong_first += 1
+        primary, _ = tracker.update(detections)
+        if primary is not None and primary != user:
+            wrong_tracked += 1
+    return {"frames": frames, "frames_with_others": frames_with_others,
+            "wrong_face_first": wrong_first, "wrong_face_tracked": wrong_tracked, **tracker.stats()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeeMyFocus primary-face tracking")
+    parser.add_argument("--demo", action="store_true", help="compare first-face and tracked selection in a scripted room")
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args()
+    
+    if args.demo:
+        result = demo(args.frames)
+        print(f"{result['frames']} frames, {result['frames_with_others']} with other people in view")
+        print(f"faces[0]:  wrong person on {result['wrong_face_first']} frames")
+        print(f"tracker:   wrong person on {result['wrong_face_tracked']} frames "
+              f"({result['face_tracks_acquired']} tracks started, {result['face_tracks_lost']} lost)")
+    else:
+        parser.print_help()
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Track smoothing for SeeMyFocus
+
+Haar rectangles jitter by several pixels from one frame to the next even
+when nobody moves. The engine used to feed them straight into the eye
+deviation check and the too-close face width ratio. A face sitting near
+either threshold then flipped between side-eye, too close and focused,
+and every flip restarted a buffer and redrew the UI.
+
+ConstantVelocityFilter is a Kalman filter with position and velocity for
+each coordinate, such as the two eye centres. Every coordinate shares the
+motion model and is measured on the same frames, so they share one 2x2
+covariance and an update is a few NumPy vector operations. A measurement
+far outside the predicted spread, or a long gap between frames, restarts
+the filter instead of dragging it across. FaceBoxFilter runs one for the
+face centre and a slower one for its size: heads move quickly, but a face
+only grows when the user leans in.
+    
+    python seemyfocus_kalman.py --video desk.mp4     # state transitions per minute, raw vs smoothed
+    python seemyfocus_kalman.py --image portrait.jpg --scale 2.3
+
+Both fail (as does tests/test_kalman.py) unless smoothing gives fewer state
+changes per minute and less face width jitter than the raw tracks.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+# Pixels; a still face jitters by a few, a head turn accelerates by a few hundred per second squared
+FACE_NOISE = 4.0
+FACE_ACCELERATION = 400.0
+FACE_SIZE_ACCELERATION = 50.0  # leaning in still shows within about 0.6 s
+EYE_NOISE = 2.0
+EYE_ACCELERATION = 300.0
+
+GATE = 6.0       # standard deviations a measurement may be from the prediction
+MAX_GAP = 1.0    # seconds without a measurement before the filter starts over
+START_VELOCITY_VARIANCE = 100.0 ** 2
+
+
+class ConstantVelocityFilter:
+    """Kalman filter for several coordinates moving at a constant velocity"""
+    
+    def __init__(self, size, noise, acceleration, gate=GATE):
+        self.size = size
+        self.r = noise ** 2
+        self.q = acceleration ** 2
+        self.gate = gate
+        self.reset()
+    
+    def reset(self):
+        self.position = None
+        self.velocity = np.zeros(self.size)
+        self.covariance = None  # (p00, p01, p11), shared by every coordinate
+        self.last_time = None
+    
+    def update(self, measurement, now):
+        """Fold in one measurement taken at time now; returns the smoothed coordinates"""
+        z = np.asarray(measurement, dtype=np.float64).reshape(self.size)
+        dt = None if self.last_time is None else now - self.last_time
+        if self.position is None or dt is None or dt > MAX_GAP:
+            return self.start(z, now)
+        self.last_time = now
+        
+        # Predict
+        p00, p01, p11 = self.covariance
+        q = self.q
+        position = self.position + self.velocity * dt
+        p00 = p00 + 2 * dt * p01 + dt * dt * p11 + q * dt ** 4 / 4
+        p01 = p01 + dt * p11 + q * dt ** 3 / 2
+        p11 = p11 + q * dt * dt
+        
+        # Correct
+        residual = z - position
+        spread = p00 + self.r
+        if np.abs(residual).max() > self.gate * np.sqrt(spread):
+            return self.start(z, now)
+        k0, k1 = p00 / spread, p01 / spread
+        self.position = position + k0 * residual
+        self.velocity += k1 * residual
+        self.covariance = ((1 - k0) * p00, (1 - k0) * p01, p11 - k1 * p01)
+        return self.position
+    
+    def start(self, z, now):
+        self.position = z.copy()
+        self.velocity[:] = 0.0
+        self.covariance = (self.r, 0.0, START_VELOCITY_VARIANCE)
+        self.last_time = now
+        return self.position
+
+
+class FaceBoxFilter:
+    """Smooths (x, y, w, h) face boxes: centre and size filtered separately"""
+    
+    def __init__(self):
+        self.centre = ConstantVelocityFilter(2, FACE_NOISE, FACE_ACCELERATION)
+        self.size = ConstantVelocityFilter(2, FACE_NOISE, FACE_SIZE_ACCELERATION)
+    
+    def reset(self):
+        self.centre.reset()
+        self.size.reset()
+    
+    def update(self, box, now):
+        x, y, w, h = box
+        cx, cy = self.centre.update((x + w / 2, y + h / 2), now)
+        w, h = self.size.update((w, h), now)
+        return np.array((cx - w / 2, cy - h / 2, w, h))
+
+
+def face_filter():
+    return FaceBoxFilter()
+
+
+def eye_filter():
+    return ConstantVelocityFilter(4, EYE_NOISE, EYE_ACCELERATION)
+
+
+def count_transitions(frames, smoothing, fps=15.0):
+    """Run the real engine over frames; state changes and raw decision flips"""
+    from seemyfocus_engine import FocusEngine, SimulatedClock
+    
+    class CountingEngine(FocusEngine):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.side_eye = 0
+            self.eye_moves = []
+            self.last_eyes = None
+        
+        def detect_eye_gaze(self, frame, gray, face_rect, *located):
+            result = super().detect_eye_gaze(frame, gray, face_rect, *located)
+            if result == (True, False):
+                self.side_eye += 1
+            eyes = np.array(self.eye_history[-1]) if result[0] else None
+            if eyes is not None and self.last_eyes is not None:
+                self.eye_moves.append(float(np.hypot(*(eyes - self.last_eyes).T).mean()))
+            self.last_eyes = eyes
+            return result
+    
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_kalman_")
+    try:
+        clock = SimulatedClock(start=1_700_000_000.0)
+        engine = CountingEngine(os.path.join(work_dir, "progress.json"),
+                                os.path.join(work_dir, "history.json"), clock)
+        engine.track_smoothing = smoothing
+        engine.start_session()
+        states, too_close, widths = [], [], []
+        for frame in frames:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            engine.process_face_detection(frame, engine.detect_faces(gray), gray)
+            states.append(engine.current_state)
+            if engine.primary_face is not None:
+                ratio = engine.primary_face[2] / frame.shape[1]
+                widths.append(engine.primary_face[2])
+                too_close.append(ratio > engine.TOO_CLOSE_THRESHOLD)
+            clock.advance(1.0 / fps)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    minutes = len(frames) / fps / 60
+    return {
+        "state_changes_per_min": sum(a != b for a, b in zip(states, states[1:])) / minutes,
+        "too_close_flips_per_min": sum(a != b for a, b in zip(too_close, too_close[1:])) / minutes,
+        "side_eye_per_min": engine.side_eye / minutes,
+        "width_jitter_px": float(np.mean(np.abs(np.diff(widths)))) if len(widths) > 1 else None,
+        "eye_jitter_px": float(np.mean(engine.eye_moves)) if engine.eye_moves else None
+    }
+
+
+def smoothing_failures(raw, smoothed):
+    """Why smoothing did not help on a clip; empty when it did"""
+    failures = []
+    if raw["width_jitter_px"] is None or smoothed["width_jitter_px"] is None:
+        return ["no face found in the clip"]
+    if smoothed["state_changes_per_min"] >= raw["state_changes_per_min"]:
+        failures.append(f"{smoothed['state_changes_per_min']:.1f} state changes/min smoothed, "
+                        f"{raw['state_changes_per_min']:.1f} raw")
+    if smoothed["width_jitter_px"] >= raw["width_jitter_px"]:
+        failures.append(f"face width jitter {smoothed['width_jitter_px']:.1f} px smoothed, "
+                        f"{raw['width_jitter_px']:.1f} px raw")
+    return failures
+
+
+if __name__ == "__main__":
+    from seemyfocus_eyes import drifting_frames, video_frames
+    
+    parser = argparse.ArgumentParser(description="Spurious state transitions with and without track smoothing")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="recording with a face in it")
+    source.add_argument("--image", help="photo of a face, moved around the frame")
+    parser.add_argument("--scale", type=float, default=2.3, help="photo scale; 2.3 puts the face right at the too-close threshold")
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--fps", type=float, default=15.0)
+    args = parser.parse_args()
+    
+    frames = (video_frames(args.video, args.frames) if args.video
+              else drifting_frames(args.image, args.frames, scale=args.scale))
+    print(f"{len(frames)} frames, {len(frames) / args.fps / 60:.1f} min at {args.fps:g} fps")
+    results = []
+    for smoothing in (False, True):
+        result = count_transitions(frames, smoothing, args.fps)
+        results.append(result)
+        jitter = {key: "n/a" if result[key] is None else f"{result[key]:.1f} px"
+                  for key in ("width_jitter_px", "eye_jitter_px")}
+        print(f"{'smoothed' if smoothing else 'raw':9s} state changes {result['state_changes_per_min']:6.1f}/min  "
+              f"too-close flips {result['too_close_flips_per_min']:6.1f}/min  "
+              f"side-eye {result['side_eye_per_min']:6.1f}/min  "
+              f"jitter per frame: face width {jitter['width_jitter_px']}, eyes {jitter['eye_jitter_px']}")
+    failures = smoothing_failures(*results)
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
\ No newline at end of file
@@ -0,0 +1,335 @@
+"""Local live-state server for SeeMyFocus
+
+Desk lights, task managers and Do-Not-Disturb togglers can follow the focus
+state without screen-scraping. The server only listens on a UNIX socket
+(or 127.0.0.1 where UNIX sockets are unavailable), so nothing leaves the
+machine. Every subscriber receives one JSON object per line, pushed when
+the state changes:
+    
+    {"session_active": true, "state": "Focused", "cycle": "focus",
+     "remaining": 1032, "streak": 4, "score": 91, "seq": 17, "time": ...}
+
+The frame loop only calls publish(), which compares the new state with the
+last one and hands changes to the server thread. Serialising and writing
+happen on that thread; a slow subscriber skips intermediate states instead
+of holding up the others.
+    
+    python seemyfocus_live.py --client          # follow the running app
+    python seemyfocus_live.py --load-test 100   # publish cost with 100 subscribers
+
+The load test fails (and tests/test_live.py with it) when publish() costs
+the frame thread more than PUBLISH_BUDGET_US, or a subscriber misses the
+final state.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+SOCKET_PATH = "seemyfocus_live.sock"
+DEFAULT_HOST = "127.0.0.1"  # never bind to a public interface
+DEFAULT_PORT = 8765
+PUBLISH_BUDGET_US = 1000     # frame-thread CPU publish() may add per frame, on average
+
+
+def unix_sockets_available():
+    return hasattr(socket, "AF_UNIX") and hasattr(asyncio, "start_unix_server")
+
+
+class LiveStateServer:
+    """Pushes focus state changes to local subscribers from a background asyncio loop"""
+    
+    def __init__(self, path=SOCKET_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.path = path if path and unix_sockets_available() else None
+        self.host = host
+        self.port = port
+        
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        
+        self.last_state = None  # only touched by the publishing (frame) thread
+        self.latest = b""       # only touched by the server thread
+        self.seq = 0
+        self.subscribers = set()
+    
+    @property
+    def address(self):
+        return self.path or f"{self.host}:{self.port}"
+    
+    def start(self, timeout=2.0):
+        """Start listening; False if the socket could not be bound"""
+        if self.thread is not None:
+            return self.server is not None
+        self.thread = threading.Thread(target=self.run, name="live-state", daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout)
+        return self.server is not None
+    
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(self.create_server())
+        except OSError:
+            self.server = None
+        self.ready.set()
+        
+        if self.server is not None:
+            self.loop.run_forever()
+            self.server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+        self.loop.close()
+    
+    async def create_server(self):
+        if self.path:
+            if os.path.exists(self.path):
+                os.remove(self.path)  # stale socket left by a crash
+            return await asyncio.start_unix_server(self.handle_subscriber, path=self.path)
+        server = await asyncio.start_server(self.handle_subscriber, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+    
+    def publish(self, state):
+        """Called from the frame loop; returns True if the state changed"""
+        if state == self.last_state or self.server is None:
+            return False
+        self.last_state = state
+        self.loop.call_soon_threadsafe(self.broadcast, state)
+        return True
+    
+    def broadcast(self, state):
+        self.seq += 1
+        message = dict(state, seq=self.seq, time=time.time())
+        self.latest = (json.dumps(message) + "\n").encode("utf-8")
+        for wake in self.subscribers:
+            wake.set()
+    
+    async def handle_subscriber(self, reader, writer):
+        wake = asyncio.Event()
+        self.subscribers.add(wake)
+        if self.latest:
+            wake.set()  # new subscribers start with the current state
+        sent = None
+        try:
+            while True:
+                await wake.wait()
+                wake.clear()
+                message = self.latest
+                if message is sent:
+                    continue
+                writer.write(message)
+                # Only this subscriber waits here; newer states overwrite self.latest meanwhile
+                await writer.drain()
+                sent = message
+        except (ConnectionError, OSError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server shutting down; finish quietly instead of logging the cancel
+        finally:
+            self.subscribers.discard(wake)
+            writer.close()
+    
+    def subscriber_count(self):
+        return len(self.subscribers)
+    
+    def stop(self):
+        if self.loop is not None and self.server is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        self.thread = None
+        self.server = None
+        self.last_state = None
+
+
+async def open_subscription(path=SOCKET_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    if path and unix_sockets_available():
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def follow(path=SOCKET_PATH, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Test client: print every state pushed by the running app"""
+    try:
+        reader, writer = await open_subscription(path, host, port)
+    except OSError as error:
+        print(f"Cannot connect ({error}) - is the live state API enabled in Settings?")
+        return
+    async for line in reader:
+        state = json.loads(line)
+        remaining = state["remaining"]
+        print(f"#{state['seq']:<5d} {state['state']:9s} {state['cycle']:6s} "
+              f"{remaining // 60:02d}:{remaining % 60:02d}  streak {state['streak']}  "
+              f"score {state['score']}%{'' if state['session_active'] else '  (no session)'}",
+              flush=True)
+    writer.close()
+
+
+async def run_subscribers(count, path, host, port, stop):
+    """Open count subscriptions; returns (last seq seen, delivery latencies) for each"""
+    results = []
+    
+    async def subscriber():
+        reader, writer = await open_subscription(path, host, port)
+        latencies = []
+        last_seq = 0
+        try:
+            while not stop.is_set():
+                try:
+                    line = await asyncio.wait_for(reader.readline(), 0.2)
+                except asyncio.TimeoutError:
+                    continue
+                if not line:
+                    break
+                message = json.loads(line)
+                latencies.append(time.time() - message["time"])
+                last_seq = message["seq"]
+        finally:
+            writer.close()
+        results.append((last_seq, latencies))
+    
+    await asyncio.gather(*(subscriber() for _ in range(count)))
+    return results
+
+
+def subscriber_process(count, path, host, port, stop, result_queue):
+    # Subscribers live in their own process, like real integrations
+    result_queue.put(asyncio.run(run_subscribers(count, path, host, port, stop)))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def load_test(subscribers=100, seconds=5.0, fps=30):
+    """Drive publish() at the camera frame rate with many subscribers attached"""
+    from seemyfocus_engine import FocusEngine
+    
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_live_")
+    server = LiveStateServer(path=os.path.join(work_dir, "live.sock"), port=0)
+    if not server.start():
+        print("Could not start the server")
+        return None
+    
+    stop = multiprocessing.Event()
+    result_queue = multiprocessing.Queue()
+    clients = multiprocessing.Process(target=subscriber_process,
+                                      args=(subscribers, server.path, server.host, server.port,
+                                            stop, result_queue),
+                                      daemon=True)
+    clients.start()
+    deadline = time.time() + 10
+    while server.subscriber_count() < subscribers and time.time() < deadline:
+        time.sleep(0.05)
+    
+    # A real engine mid-session, with the state flipping like a fidgety user
+    engine = FocusEngine(os.path.join(work_dir, "progress.json"), os.path.join(work_dir, "history.json"))
+    engine.start_session()
+    connected = server.subscriber_count()
+    publish_times = []
+    publish_cpu = []
+    published = 0
+    frame_interval = 1.0 / fps
+    frames = int(seconds * fps)
+    next_frame_at = time.perf_counter()
+    for frame in range(frames):
+        engine.current_state = "Focused" if (frame // 10) % 3 else "Away"
+        engine.focus_score = 50 + (frame // 15) % 50
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+        if server.publish(engine.live_state()):
+            published += 1
+        publish_cpu.append(time.thread_time() - start_cpu)
+        publish_times.append(time.perf_counter() - start)
+        
+        next_frame_at += frame_interval
+        delay = next_frame_at - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    
+    time.sleep(0.5)  # let the last state reach everyone
+    stop.set()
+    try:
+        results = result_queue.get(timeout=10)
+    except queue.Empty:
+        results = []
+    clients.join(timeout=5)
+    final_seq = server.seq
+    server.stop()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    
+    latencies = [latency for _, subscriber_latencies in results for latency in subscriber_latencies]
+    up_to_date = sum(1 for last_seq, _ in results if last_seq == final_seq)
+    report = {
+        "subscribers": connected,
+        "frames": frames,
+        "states_published": published,
+        "publish_mean_us": sum(publish_times) / len(publish_times) * 1e6,
+        "publish_p99_us": percentile(publish_times, 0.99) * 1e6,
+        "publish_max_us": max(publish_times) * 1e6,
+        "publish_cpu_mean_us": sum(publish_cpu) / len(publish_cpu) * 1e6,
+        "delivery_p50_ms": percentile(latencies, 0.5) * 1000,
+        "delivery_p99_ms": percentile(latencies, 0.99) * 1000,
+        "subscribers_with_final_state": up_to_date
+    }
+    print(f"{report['subscribers']} subscribers, {frames} frames, {published} state changes pushed")
+    print(f"frame loop cost of publish(): mean {report['publish_mean_us']:.1f} us, "
+          f"p99 {report['publish_p99_us']:.1f} us, max {report['publish_max_us']:.1f} us "
+          f"(frame thread CPU {report['publish_cpu_mean_us']:.1f} us)")
+    print(f"delivery latency: p50 {report['delivery_p50_ms']:.2f} ms, p99 {report['delivery_p99_ms']:.2f} ms; "
+          f"{up_to_date}/{connected} subscribers received the final state")
+    return report
+
+
+def load_test_failures(report, subscribers):
+    """Why a load test report misses its targets; empty when it passes"""
+    if report is None:
+        return ["the server did not start"]
+    failures = []
+    if report["subscribers"] < subscribers:
+        failures.append(f"only {report['subscribers']}/{subscribers} subscribers connected")
+    if report["publish_cpu_mean_us"] > PUBLISH_BUDGET_US:
+        failures.append(f"publish() used {report['publish_cpu_mean_us']:.0f} us of frame-thread CPU, "
+                        f"over {PUBLISH_BUDGET_US} us")
+    if report["subscribers_with_final_state"] < report["subscribers"]:
+        failures.append(f"{report['subscribers'] - report['subscribers_with_final_state']} subscribers "
+                        f"missed the final state")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeeMyFocus local live-state API")
+    parser.add_argument("--client", action="store_true", help="follow the running app's state")
+    parser.add_argument("--load-test", type=int, metavar="SUBSCRIBERS",
+                        help="measure publish cost and delivery latency with this many subscribers")
+    parser.add_argument("--seconds", type=float, default=5.0, help="load test duration")
+    parser.add_argument("--path", default=SOCKET_PATH, help="UNIX socket path")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port where UNIX sockets are unavailable")
+    args = parser.parse_args()
+    
+    if args.load_test:
+        failures = load_test_failures(load_test(args.load_test, args.seconds), args.load_test)
+        if failures:
+            raise SystemExit("FAIL: " + "; ".join(failures))
+    elif args.client:
+        try:
+            asyncio.run(follow(args.path, DEFAULT_HOST, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        parser.print_help()
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""Bounded memory for long SeeMyFocus runs
+
+A machine left coaching all day (kiosk mode, marathon sessions) must not
+creep upwards in memory. Two pieces live here:
+
+SpillingTimeline holds the in-session focus timeline as one byte per
+sample (away, focused or no camera) and appends every full hour of samples to a file under
+seemyfocus_spill/, so the part kept in memory never grows past one chunk.
+The whole timeline is read back once, when the session is saved.
+
+MemoryMonitor is the self-check: it samples resident memory, the number of
+live Python objects (and which types grew since the first sample) plus any
+probes the app registers - Tk widgets, pending after() callbacks, open
+windows - and estimates growth per hour from the samples.
+    
+    python seemyfocus_memory.py --show      # summarise the app's self-check log
+    python seemyfocus_sim.py --hours 24 --session-hours 2 --memory-check
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter, deque
+
+SPILL_DIR = "seemyfocus_spill"
+SPILL_CHUNK = 720  # samples kept in memory: one hour at one sample every 5 seconds
+
+MEMORY_LOG = "seemyfocus_memory.jsonl"
+MEMORY_LOG_MAX_BYTES = 1024 * 1024  # rotated to .1 beyond this
+MEMORY_CHECK_INTERVAL = 300  # seconds between self-check samples in the app
+
+
+class SpillingTimeline:
+    """Append-only timeline of small ints (0-255) with at most one chunk in memory"""
+    
+    def __init__(self, directory=SPILL_DIR, chunk=SPILL_CHUNK):
+        self.directory = directory
+        self.chunk = chunk
+        self.limit = chunk
+        self.buffer = bytearray()
+        self.path = None
+        self.spilled = 0
+    
+    def append(self, value):
+        self.buffer.append(value)
+        if len(self.buffer) >= self.limit:
+            self.spill()
+    
+    def spill(self):
+        try:
+            if self.path is None:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, self.path = tempfile.mkstemp(prefix="timeline_", suffix=".bin", dir=self.directory)
+                os.close(fd)
+            with open(self.path, "ab") as f:
+                f.write(self.buffer)
+        except OSError:
+            # Disk full or read-only: keep the samples in memory and retry a chunk later
+            self.limit = len(self.buffer) + self.chunk
+            return
+        self.spilled += len(self.buffer)
+        self.buffer = bytearray()
+        self.limit = self.chunk
+    
+    def __len__(self):
+        return self.spilled + len(self.buffer)
+    
+    def to_list(self):
+        """The full timeline as a list of ints, as stored in the history file"""
+        data = b""
+        if self.path is not None:
+            with open(self.path, "rb") as f:
+                data = f.read(self.spilled)
+        return list(data) + list(self.buffer)
+    
+    def discard(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.path = None
+        self.spilled = 0
+        self.buffer = bytearray()
+        self.limit = self.chunk
+
+
+def resident_kb():
+    """Resident set size in KB; None where it cannot be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss // 1024
+    except ImportError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak  # peak, not current
+    except ImportError:
+        return None
+
+
+class MemoryMonitor:
+    """Samples resident memory and object counts; keeps the last day in memory"""
+    
+    def __init__(self, path=MEMORY_LOG, keep=288, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.samples = deque(maxlen=keep)
+        self.probes = {}  # name -> callable returning a count
+        self.baseline_types = None
+    
+    def add_probe(self, name, probe):
+        self.probes[name] = probe
+    
+    def sample(self):
+        """Take one sample; costs a gc.get_objects() walk, so call it minutes apart"""
+        gc.collect()
+        types = Counter(type(obj).__name__ for obj in gc.get_objects())
+        if self.baseline_types is None:
+            self.baseline_types = types
+        growth = Counter({name: count - self.baseline_types.get(name, 0) for name, count in types.items()})
+        
+        entry = {
+            "time": round(self.clock(), 1),
+            "rss_kb": resident_kb(),
+            "objects": sum(types.values()),
+            "growing_types": {name: delta for name, delta in growth.most_common(5) if delta > 0}
+        }
+        for name, probe in self.probes.items():
+            try:
+                entry[name] = probe()
+            except Exception:
+                entry[name] = None
+        self.samples.append(entry)
+        if self.path:
+            self.write(entry)
+        return entry
+    
+    def write(self, entry):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > MEMORY_LOG_MAX_BYTES:
+                os.replace(self.path, self.path + ".1")
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError:
+            pass
+    
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+    
+    def growth_per_hour(self, key="rss_kb"):
+        """Least-squares slope of key over the kept samples, per hour"""
+        return growth_per_hour(list(self.samples), key)
+
+
+def growth_per_hour(samples, key="rss_kb"):
+    points = [(s["time"], s[key]) for s in samples if s.get(key) is not None]
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    spread = sum((t - mean_t) ** 2 for t, _ in points)
+    if not spread:
+        return None
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in points) / spread
+    return slope * 3600
+
+
+def show_log(path=MEMORY_LOG):
+    if not os.path.exists(path):
+        print("No self-check log yet - enable the memory self-check in Settings")
+        return
+    with open(path) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    if not samples:
+        print("Self-check log is empty")
+        return
+    probes = [key for key in samples[-1] if key not in ("time", "rss_kb", "objects", "growing_types")]
+    for entry in samples[-24:]:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["time"]))
+        extra = "  ".join(f"{name} {entry.get(name)}" for name in probes)
+        print(f"{when}  rss {entry['rss_kb']} KB  objects {entry['objects']}  {extra}")
+    hours = (samples[-1]["time"] - samples[0]["time"]) / 3600
+    rss_growth = growth_per_hour(samples, "rss_kb")
+    object_growth = growth_per_hour(samples, "objects")
+    print(f"{len(samples)} samples over {hours:.1f} h: "
+          f"rss {rss_growth if rss_growth is None else round(rss_growth, 1)} KB/hour, "
+          f"objects {object_growth if object_growth is None else round(object_growth, 1)}/hour")
+    if samples[-1]["growing_types"]:
+        print("Grown since the first sample: " +
+              ", ".join(f"{name} +{delta}" for name, delta in samples[-1]["growing_types"].items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeeMyFocus memory self-check")
+    parser.add_argument("--show", metavar="LOG", nargs="?", const=MEMORY_LOG,
+                        help="summarise the self-check log written by the app")
+    args = parser.parse_args()
+    
+    if args.show:
+        show_log(args.show)
+    else:
+        parser.print_help()
\ No newline at end of file
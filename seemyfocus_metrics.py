@@ -0,0 +1,307 @@
+"""Frame-loop metrics for SeeMyFocus
+
+Every stage of the camera loop reports its duration into a fixed-bucket
+histogram. Recording is a perf_counter() call, a bisect and two additions,
+so the instrumentation stays on all the time. Exporting (Prometheus text
+and a JSON snapshot) happens on a background thread, never in the loop.
+    
+    frame_start = t = metrics.now()
+    ... capture ...
+    t = metrics.lap("capture", t)   # records the stage, returns the new start
+    ... detect ...
+    t = metrics.lap("face_detect", t)
+    t = metrics.add("convert", t)   # stages split across the frame are summed
+    metrics.frame_done(frame_start)  # ...and recorded once per frame here
+
+Run ``python seemyfocus_metrics.py --overhead`` to measure the cost of a lap.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_DIR = "seemyfocus_metrics"
+METRICS_PORT = 9464
+
+# Upper bounds in seconds; 0.5 ms up to 1 s covers a fast laptop to a stalled webcam
+BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Stages of one update_camera pass, in order
+FRAME_STAGES = ("capture", "convert", "face_detect", "eye_gaze", "process", "overlay", "display")
+
+FPS_WINDOW = 2.0  # seconds per effective-FPS measurement
+
+
+class Histogram:
+    """Cumulative-on-export histogram with fixed buckets"""
+    
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = 0.0  # moving average of the last few dozen observations
+    
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.recent = value if self.count == 1 else self.recent * 0.9 + value * 0.1
+        if value > self.max:
+            self.max = value
+    
+    def quantile(self, q):
+        """Upper bucket bound containing the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+    
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p95_ms": self.quantile(0.95) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class FrameMetrics:
+    """Stage histograms, counters and gauges for one frame loop"""
+    
+    def __init__(self, stages=FRAME_STAGES):
+        self.histograms = {stage: Histogram() for stage in stages}
+        self.counters = {"frames": 0}
+        self.gauges = {"effective_fps": 0.0}
+        self.collectors = []  # callables returning extra gauges at export time
+        self.started = time.time()
+        
+        self.window_start = None
+        self.window_frames = 0
+        self.pending = {}  # stage -> seconds summed over the current frame
+    
+    now = staticmethod(time.perf_counter)
+    
+    def lap(self, stage, start):
+        """Record the time since start under stage and return the current time"""
+        now = time.perf_counter()
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.observe(now - start)
+        return now
+    
+    def add(self, stage, start):
+        """Like lap(), but summed over the frame and recorded by frame_done()"""
+        now = time.perf_counter()
+        self.pending[stage] = self.pending.get(stage, 0.0) + (now - start)
+        return now
+    
+    def observe(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = Histogram()
+        histogram.observe(seconds)
+    
+    def recent_ms(self, stage):
+        histogram = self.histograms.get(stage)
+        return histogram.recent * 1000 if histogram else 0.0
+    
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def frame_done(self, now):
+        """Count a finished frame and refresh the effective FPS every FPS_WINDOW seconds"""
+        if self.pending:
+            for stage, seconds in self.pending.items():
+                self.observe(stage, seconds)
+            self.pending.clear()
+        self.counters["frames"] += 1
+        if self.window_start is None:
+            self.window_start = now
+            self.window_frames = 0
+            return
+        self.window_frames += 1
+        elapsed = now - self.window_start
+        if elapsed >= FPS_WINDOW:
+            self.gauges["effective_fps"] = self.window_frames / elapsed
+            self.window_start = now
+            self.window_frames = 0
+    
+    def loop_idle(self):
+        """The loop stopped; the next frame starts a fresh FPS window"""
+        self.window_start = None
+        self.gauges["effective_fps"] = 0.0
+    
+    def add_collector(self, collector):
+        self.collectors.append(collector)
+    
+    def collected_gauges(self):
+        gauges = dict(self.gauges)
+        for collector in self.collectors:
+            try:
+                gauges.update(collector())
+            except Exception:
+                pass
+        return gauges
+    
+    def snapshot(self):
+        """JSON-friendly view of everything recorded so far"""
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            # list(): the Tk thread adds stages (persist_*, timer_late, ...) while exporters read
+            "stages": {stage: histogram.snapshot() for stage, histogram in list(self.histograms.items())},
+            "counters": dict(self.counters),
+            "gauges": self.collected_gauges()
+        }
+    
+    def prometheus(self, prefix="seemyfocus"):
+        """Prometheus text exposition format"""
+        lines = [f"# HELP {prefix}_stage_seconds Duration of each frame loop or persistence stage",
+                 f"# TYPE {prefix}_stage_seconds histogram"]
+        for stage, histogram in list(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {histogram.total:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        for name, value in list(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, value in self.collected_gauges().items():
+            if value is None:
+                continue
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {float(value):.6g}")
+        return "\n".join(lines) + "\n"
+
+
+def write_atomic(path, text):
+    # Scrapers must never see a half-written file
+    partial = path + ".part"
+    with open(partial, "w") as f:
+        f.write(text)
+    os.replace(partial, path)
+
+
+class MetricsExporter:
+    """Writes metrics files periodically and optionally serves them on localhost"""
+    
+    def __init__(self, metrics, directory=METRICS_DIR, interval=10.0, port=None):
+        self.metrics = metrics
+        self.directory = directory
+        self.interval = interval
+        self.port = port
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.http = None
+    
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if self.port is not None:
+            try:
+                self.http = ThreadingHTTPServer(("127.0.0.1", self.port), self.handler_class())
+                threading.Thread(target=self.http.serve_forever, name="metrics-http", daemon=True).start()
+            except OSError:
+                self.http = None
+        self.thread = threading.Thread(target=self.run, name="metrics-export", daemon=True)
+        self.thread.start()
+    
+    def handler_class(self):
+        metrics = self.metrics
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, kind = metrics.prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, kind = json.dumps(metrics.snapshot(), indent=2), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, *args):
+                pass
+        
+        return Handler
+    
+    def export(self):
+        try:
+            write_atomic(os.path.join(self.directory, "seemyfocus.prom"), self.metrics.prometheus())
+            write_atomic(os.path.join(self.directory, "seemyfocus_metrics.json"),
+                         json.dumps(self.metrics.snapshot(), indent=2))
+        except OSError:
+            pass
+    
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.export()
+            except Exception:
+                # Report and keep exporting; a dead thread would silently freeze the files
+                traceback.print_exc()
+    
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+        if self.http is not None:
+            self.http.shutdown()
+            self.http.server_close()
+            self.http = None
+        self.export()  # final numbers survive the app closing
+
+
+def measure_overhead(iterations=200000):
+    """Cost of one lap() in nanoseconds"""
+    metrics = FrameMetrics()
+    start = time.perf_counter()
+    t = metrics.now()
+    for _ in range(iterations):
+        t = metrics.lap("capture", t)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SeeMyFocus frame-loop metrics")
+    parser.add_argument("--overhead", action="store_true", help="measure the cost of recording one stage")
+    parser.add_argument("--show", metavar="DIR", nargs="?", const=METRICS_DIR,
+                        help="print the latest JSON snapshot written by the app")
+    args = parser.parse_args()
+    
+    if args.overhead:
+        print(f"lap(): {measure_overhead():.0f} ns per stage, "
+              f"{measure_overhead() * len(FRAME_STAGES) / 1000:.2f} us per frame for {len(FRAME_STAGES)} stages")
+    elif args.show:
+        path = os.path.join(args.show, "seemyfocus_metrics.json")
+        if not os.path.exists(path):
+            print("No snapshot yet - enable metrics export in Settings")
+        else:
+            with open(path) as f:
+                snapshot = json.load(f)
+            for stage, stats in snapshot["stages"].items():
+                print(f"{stage:18s} n={stats['count']:<7d} mean {stats['mean_ms']:7.2f} ms  "
+                      f"p50 <= {stats['p50_ms']:6.1f}  p95 <= {stats['p95_ms']:6.1f}  max {stats['max_ms']:7.1f}")
+            for name, value in {**snapshot["counters"], **snapshot["gauges"]}.items():
+                print(f"{name:18s} {value}")
+    else:
+        parser.print_help()
\ No newline at end of file
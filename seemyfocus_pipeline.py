@@ -0,0 +1,287 @@
+"""Pipelined face and eye detection for SeeMyFocus
+
+The camera loop ran face detection and then eye detection for every frame,
+one after the other on the Tk thread. OpenCV's own thread pool was left at
+its default size and competed with Tk and matplotlib for the cores.
+
+DetectionPipeline overlaps the two stages across frames. Faces are detected
+on a pool of workers as soon as a frame is submitted. Eyes are located on
+an eye lane of their own, a single thread, since the eye tracker follows
+the eyes from one frame to the next. So frame N's eyes are located while
+frame N+1's faces are being detected, even with one face worker. OpenCV
+releases the GIL inside detectMultiScale and matchTemplate, so the two
+really run at the same time.
+
+Face tracking and the focus state machine stay on the calling thread, in
+frame order. Neither submit() nor the stages wait on each other: every
+call moves the oldest frames along as far as their finished jobs allow
+and returns those done. Frames are tracked and updated exactly as the
+sequential loop does, so the state is the same; it arrives a frame or two
+later. Only when more than workers + 1 frames are in flight does submit()
+wait for the oldest, so a slow machine falls behind by a bounded amount.
+
+The worker count and cv2.setNumThreads are set together. The cores left
+after the UI thread are split between the face workers and the eye lane,
+so OpenCV never starts more threads than there are cores.
+    
+    python seemyfocus_pipeline.py --image portrait.jpg     # sequential vs 1, 2 and 4 workers
+    python seemyfocus_pipeline.py --video desk.mp4 --workers 2 4
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from seemyfocus_calibration import face_cascade, run_face_cascade
+
+WORKER_CHOICES = ("Off", "2", "4")  # the app setting; Off runs detection on the Tk thread
+
+
+def opencv_threads(workers, cpus=None):
+    """OpenCV threads per detection call: the cores left after the UI thread, split between workers"""
+    cpus = cpus or os.cpu_count() or 1
+    spare = max(1, cpus - 1)
+    return max(1, spare // max(1, workers))
+
+
+class PendingFrame:
+    """A frame between submit() and its state update"""
+    
+    def __init__(self, frame, gray, faces_future):
+        self.frame = frame
+        self.gray = gray
+        self.submitted = time.perf_counter()
+        self.faces_future = faces_future
+        self.faces = None
+        self.face_seconds = 0.0
+        self.tracked = None      # (primary, others) once tracked
+        self.eyes_future = None  # set when the tracked face is checked for eyes
+
+
+class DetectionPipeline:
+    """Runs face detection ahead of eye location on a small thread pool"""
+    
+    def __init__(self, engine, workers=2, metrics=None):
+        self.engine = engine
+        self.workers = workers
+        self.depth = workers + 1            # frames in flight before submit() waits for the oldest
+        self.metrics = metrics
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detect")
+        self.eye_lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detect-eyes")
+        self.local = threading.local()      # CascadeClassifier is not safe to share between threads
+        self.in_flight = deque()            # PendingFrame, oldest first
+        self.previous_threads = cv2.getNumThreads()
+        cv2.setNumThreads(opencv_threads(workers + 1))
+        
+        self.frames = 0
+        self.latency_total = 0.0
+    
+    def find_faces(self, gray):
+        start = time.perf_counter()
+        local = self.local
+        if not hasattr(local, "cascade"):
+            local.cascade = face_cascade()
+            local.buffers = {}
+        faces = run_face_cascade(local.cascade, gray, self.engine.detector, local.buffers)
+        return faces, time.perf_counter() - start
+    
+    def find_eyes(self, gray, face_rect):
+        start = time.perf_counter()
+        eyes = self.engine.eye_tracker.locate(gray, face_rect)
+        return eyes, time.perf_counter() - start
+    
+    def submit(self, frame, gray):
+        """Queue a frame; returns [(frame, faces)] for frames fully processed meanwhile
+        
+        The gray image is copied, since the caller's frame buffers are
+        reused; frame itself is only used for its size.
+        """
+        gray = gray.copy()
+        self.in_flight.append(PendingFrame(frame, gray, self.executor.submit(self.find_faces, gray)))
+        finished = self.collect()
+        # Detection is falling behind the camera; wait rather than let the queue grow
+        while len(self.in_flight) > self.depth:
+            finished.extend(self.collect(wait=True))
+        return finished
+    
+    def flush(self):
+        """Process every frame still in flight"""
+        finished = []
+        while self.in_flight:
+            finished.extend(self.collect(wait=True))
+        return finished
+    
+    def collect(self, wait=False):
+        """Move the oldest frames along as far as their finished jobs allow; returns [(frame, faces)] done
+        
+        With wait, blocks until at least the oldest frame is done.
+        """
+        finished = []
+        while self.in_flight:
+            pending = self.in_flight[0]
+            if pending.tracked is None:
+                if not (wait or pending.faces_future.done()):
+                    break
+                self.track(pending)
+            if pending.eyes_future is not None and not (wait or pending.eyes_future.done()):
+                break
+            self.in_flight.popleft()
+            finished.append(self.finish(pending))
+            wait = False
+        return finished
+    
+    def track(self, pending):
+        """Track the oldest frame's faces and queue its eye job on the eye lane"""
+        engine = self.engine
+        pending.faces, pending.face_seconds = pending.faces_future.result()
+        # Tracking is cheap and order-dependent, and may reset the eye filter the
+        # previous frame's update used, so it runs here once that update is done
+        pending.tracked = engine.track_faces(pending.faces, engine.clock.time())
+        face_rect = engine.eye_check_rect(pending.frame, *pending.tracked)
+        if face_rect is not None:
+            pending.eyes_future = self.eye_lane.submit(self.find_eyes, pending.gray, face_rect)
+    
+    def finish(self, pending):
+        eyes, eye_seconds = None, 0.0
+        if pending.eyes_future is not None:
+            eyes, eye_seconds = pending.eyes_future.result()
+        self.engine.process_face_detection(pending.frame, pending.faces, pending.gray,
+                                           tracked=pending.tracked, eyes=eyes)
+        
+        latency = time.perf_counter() - pending.submitted
+        self.frames += 1
+        self.latency_total += latency
+        if self.metrics is not None:
+            self.metrics.observe("pipeline_faces", pending.face_seconds)
+            if pending.eyes_future is not None:
+                self.metrics.observe("pipeline_eyes", eye_seconds)
+            self.metrics.observe("pipeline_latency", latency)
+        return pending.frame, pending.faces
+    
+    def stats(self):
+        return {
+            "pipeline_workers": self.workers,
+            "pipeline_frames_in_flight": len(self.in_flight),
+            "pipeline_mean_latency_ms": self.latency_total / self.frames * 1000 if self.frames else 0.0
+        }
+    
+    def close(self):
+        """Drop frames in flight and stop the workers"""
+        self.in_flight.clear()
+        self.executor.shutdown(wait=True)
+        self.eye_lane.shutdown(wait=True)
+        cv2.setNumThreads(self.previous_threads)
+
+
+def paced(frames, grays, interval):
+    """Frames as fast as possible, or arriving every interval seconds like a camera"""
+    due = time.perf_counter()
+    for frame, gray in zip(frames, grays):
+        if interval:
+            due += interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        yield frame, gray
+
+
+def run_sequential(engine, grays, frames, interval=None):
+    latencies = []
+    start = time.perf_counter()
+    for frame, gray in paced(frames, grays, interval):
+        begin = time.perf_counter()
+        engine.process_face_detection(frame, engine.detect_faces(gray), gray)
+        latencies.append(time.perf_counter() - begin)
+    return time.perf_counter() - start, latencies
+
+
+def run_pipelined(engine, grays, frames, workers, interval=None):
+    pipeline = DetectionPipeline(engine, workers)
+    submitted, latencies = {}, []
+    start = time.perf_counter()
+    try:
+        for frame, gray in paced(frames, grays, interval):
+            submitted[id(frame)] = time.perf_counter()
+            for done, _ in pipeline.submit(frame, gray):
+                latencies.append(time.perf_counter() - submitted.pop(id(done)))
+        for done, _ in pipeline.flush():
+            latencies.append(time.perf_counter() - submitted.pop(id(done)))
+        return time.perf_counter() - start, latencies
+    finally:
+        pipeline.close()
+
+
+def compare(frames, worker_counts=(1, 2, 4), fps=15.0):
+    """Throughput and per-frame latency of sequential and pipelined detection on the same frames
+    
+    Throughput is measured with frames fed as fast as possible. Latency,
+    from a frame arriving to its state update, is measured with frames
+    arriving at fps, as from a camera; fed flat out it would mostly be
+    queueing.
+    """
+    from seemyfocus_engine import FocusEngine, SimulatedClock
+    
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_pipeline_")
+    
+    def run(workers, interval):
+        engine = FocusEngine(os.path.join(work_dir, "progress.json"),
+                             os.path.join(work_dir, "history.json"), SimulatedClock(start=1_700_000_000.0))
+        engine.start_session()
+        if workers:
+            return run_pipelined(engine, grays, frames, workers, interval)
+        previous = cv2.getNumThreads()
+        cv2.setNumThreads(opencv_threads(1))
+        try:
+            return run_sequential(engine, grays, frames, interval)
+        finally:
+            cv2.setNumThreads(previous)
+    
+    results = []
+    try:
+        for workers in (0,) + tuple(worker_counts):
+            elapsed, _ = run(workers, None)
+            _, latencies = run(workers, 1.0 / fps)
+            latencies.sort()
+            results.append({
+                "workers": workers,
+                "opencv_threads": opencv_threads(workers + 1 if workers else 1),
+                "fps": len(frames) / elapsed,
+                "latency_ms": statistics.fmean(latencies) * 1000,
+                "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000
+            })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    from seemyfocus_eyes import drifting_frames, video_frames
+    
+    parser = argparse.ArgumentParser(description="Sequential vs pipelined face and eye detection")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="recording with a face in it")
+    source.add_argument("--image", help="photo of a face, moved around the frame")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--fps", type=float, default=15.0, help="camera frame rate for the latency runs")
+    args = parser.parse_args()
+    
+    frames = (video_frames(args.video, args.frames) if args.video
+              else drifting_frames(args.image, args.frames, scale=2.0))
+    print(f"{len(frames)} frames on {os.cpu_count()} CPU(s), OpenCV {cv2.__version__}; "
+          f"latency with frames arriving at {args.fps:g} fps")
+    results = compare(frames, args.workers, args.fps)
+    baseline = results[0]
+    for result in results:
+        name = "sequential" if not result["workers"] else f"{result['workers']} workers"
+        print(f"{name:11s} OpenCV threads {result['opencv_threads']}  {result['fps']:6.1f} frames/s "
+              f"({result['fps'] / baseline['fps']:.2f}x)  latency {result['latency_ms']:6.1f} ms "
+              f"(p95 {result['latency_p95_ms']:6.1f}, +{result['latency_ms'] - baseline['latency_ms']:.1f} ms)")
\ No newline at end of file
@@ -0,0 +1,375 @@
+"""Low-cost presence checks for SeeMyFocus
+
+Two parts of a session only need to know whether someone is at the desk,
+not where they are looking.
+
+Break cycles end on time whatever the user does, yet the camera loop kept
+running face and eye detection on every frame through them. The "blur
+video during breaks" privacy setting was stored but never applied.
+
+During a break the app now:
+- decodes about two camera frames a second instead of thirty (the reader
+  still drains the driver queue, so the first focus frame is fresh);
+- runs BreakPresence, one small face cascade pass on a quarter-size frame,
+  instead of the full face and eye pipeline;
+- shows the video blurred with privacy_blur when the shield is on: a
+  shrink to 1/16 and a bilinear stretch back, far cheaper than a Gaussian
+  blur of the same strength.
+
+Paper Mode ran the full face cascade on every frame just to see a face, and
+the cascade misses faces tilted down at paper, which is the posture Paper
+Mode exists for. DeskPresence instead watches a desk region found at the
+start of the session: the area around and below the user's face. It runs
+background subtraction (MOG2) on a quarter-size copy of that region. A
+person writing or reading keeps producing a little foreground; an empty
+chair is absorbed into the background within a few seconds. Someone counts
+as present while the foreground covered enough of the region within the
+last few seconds, or while a small face check every couple of seconds
+still finds a face.
+    
+    python seemyfocus_presence.py --break-cost --image portrait.jpg
+    python seemyfocus_presence.py --break-cost --video desk.mp4
+    python seemyfocus_presence.py --paper --image portrait.jpg   # cascade vs desk presence, scripted desk
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from seemyfocus_calibration import DEFAULT_DETECTOR, face_cascade, run_face_cascade
+
+BREAK_FPS = 2.0
+BREAK_FRAME_INTERVAL = 1.0 / BREAK_FPS
+BREAK_DETECTOR = dict(DEFAULT_DETECTOR, scale=0.25, face_scale_factor=1.2, face_min_size=100, face_min_neighbors=3)
+PRESENCE_HOLD = 3.0   # seconds a face counts as present after the last check that found one
+
+BLUR_FACTOR = 16      # privacy blur: shrink by this much and stretch back
+
+# Paper Mode
+DESK_SCALE = 0.25            # the desk region is watched at quarter size
+DESK_CALIBRATION_FRAMES = 15  # frames at session start to find the user's face
+BACKGROUND_SECONDS = 4.0     # a still scene is absorbed into the background in about this long
+MIN_OCCUPANCY = 0.004        # foreground share of the region that counts as someone there
+DESK_HOLD = 6.0              # seconds someone counts as present after the last sign of them
+FACE_CHECK_INTERVAL = 2.0    # seconds between small face checks
+SMALL_FACE_DETECTOR = dict(BREAK_DETECTOR, scale=1.0, face_min_size=25)  # applied to the quarter-size frame
+
+
+def privacy_blur(frame, out=None, factor=BLUR_FACTOR):
+    """Heavily blurred copy of frame, written into out if given"""
+    height, width = frame.shape[:2]
+    small = cv2.resize(frame, (max(1, width // factor), max(1, height // factor)), interpolation=cv2.INTER_AREA)
+    return cv2.resize(small, (width, height), dst=out, interpolation=cv2.INTER_LINEAR)
+
+
+class BreakPresence:
+    """Whether someone is at the desk, from an occasional small face cascade pass"""
+    
+    def __init__(self, cascade=None, hold=PRESENCE_HOLD):
+        self.cascade = cascade if cascade is not None else face_cascade()
+        self.hold = hold
+        self.buffers = {}
+        self.last_seen = None
+        
+        self.checks = 0
+        self.seconds = 0.0
+    
+    def reset(self):
+        self.last_seen = None
+    
+    def check(self, gray, now):
+        """True if a face was seen within the last hold seconds"""
+        start = time.perf_counter()
+        faces = run_face_cascade(self.cascade, gray, BREAK_DETECTOR, self.buffers)
+        self.seconds += time.perf_counter() - start
+        self.checks += 1
+        if len(faces):
+            self.last_seen = now
+        return self.last_seen is not None and now - self.last_seen <= self.hold
+    
+    def stats(self):
+        return {
+            "break_presence_checks": self.checks,
+            "break_presence_ms": self.seconds / self.checks * 1000 if self.checks else 0.0
+        }
+
+
+def desk_region(face, width, height):
+    """The user's head, shoulders and desk below them, from the face box found at session start"""
+    if face is None:
+        # Nobody found: the middle of the frame, top fifth excluded
+        return width // 5, height // 5, width * 3 // 5, height - height // 5
+    x, y, w, h = face
+    left = max(0, int(x - 0.75 * w))
+    top = max(0, int(y - 0.25 * h))
+    right = min(width, int(x + 1.75 * w))
+    return left, top, right - left, height - top
+
+
+class DeskPresence:
+    """Paper Mode presence from background subtraction on the user's desk region"""
+    
+    CALIBRATING = "calibrating"
+    WATCHING = "watching"
+    
+    def __init__(self, cascade=None, clock=time.monotonic):
+        self.cascade = cascade if cascade is not None else face_cascade()
+        self.clock = clock
+        self.small = None
+        self.start()
+        
+        self.frames = 0
+        self.seconds = 0.0
+    
+    def start(self):
+        """Find the desk region again over the next few frames"""
+        self.state = self.CALIBRATING
+        self.calibration_faces = []
+        self.calibration_seen = 0
+        self.region = None        # (x, y, w, h) in full-frame pixels
+        self.subtractor = None
+        self.last_frame_time = None
+        self.last_activity = None
+        self.last_face_check = None
+        self.occupancy = 0.0
+    
+    def check(self, gray, now, face_finder=None):
+        """True while someone is at the desk; face_finder runs the full face cascade during calibration"""
+        start = time.perf_counter()
+        if self.state == self.CALIBRATING:
+            present = self.calibrate(gray, now, face_finder)
+        else:
+            present = self.watch(gray, now)
+        self.seconds += time.perf_counter() - start
+        self.frames += 1
+        return present
+    
+    def shrink(self, gray):
+        height, width = gray.shape[:2]
+        size = (max(1, int(width * DESK_SCALE)), max(1, int(height * DESK_SCALE)))
+        if self.small is None or self.small.shape[::-1] != size:
+            self.small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        else:
+            cv2.resize(gray, size, dst=self.small, interpolation=cv2.INTER_AREA)
+        return self.small
+    
+    def calibrate(self, gray, now, face_finder):
+        faces = face_finder(gray) if face_finder is not None else run_face_cascade(self.cascade, gray, DEFAULT_DETECTOR)
+        self.calibration_seen += 1
+        if len(faces):
+            self.calibration_faces.append(max(faces, key=lambda face: face[2] * face[3]))
+        if len(self.calibration_faces) < 3 and self.calibration_seen < DESK_CALIBRATION_FRAMES:
+            # Everyone is at the desk when they start a session
+            return True
+        face = None
+        if self.calibration_faces:
+            face = tuple(int(v) for v in np.median(np.array(self.calibration_faces), axis=0))
+        height, width = gray.shape[:2]
+        self.region = desk_region(face, width, height)
+        self.subtractor = cv2.createBackgroundSubtractorMOG2(history=100, varThreshold=16, detectShadows=False)
+        self.state = self.WATCHING
+        self.last_activity = now
+        self.last_face_check = now
+        self.watch(gray, now, learning_rate=1.0)
+        return True
+    
+    def watch(self, gray, now, learning_rate=None):
+        small = self.shrink(gray)
+        x, y, w, h = (int(v * DESK_SCALE) for v in self.region)
+        roi = small[y:y + h, x:x + w]
+        if learning_rate is None:
+            # Time-based, so the background adapts equally fast at any frame rate
+            dt = now - self.last_frame_time if self.last_frame_time is not None else 0.0
+            learning_rate = min(1.0, max(0.0, dt) / BACKGROUND_SECONDS)
+        self.last_frame_time = now
+        foreground = self.subtractor.apply(roi, learningRate=learning_rate)
+        self.occupancy = cv2.countNonZero(foreground) / foreground.size if foreground.size else 0.0
+        if self.occupancy >= MIN_OCCUPANCY:
+            self.last_activity = now
+        
+        # A face still looking up is certain presence, whatever the background model says
+        if now - self.last_face_check >= FACE_CHECK_INTERVAL:
+            self.last_face_check = now
+            if len(run_face_cascade(self.cascade, small, SMALL_FACE_DETECTOR)):
+                self.last_activity = now
+        return now - self.last_activity <= DESK_HOLD
+    
+    def stats(self):
+        return {
+            "desk_presence_ms": self.seconds / self.frames * 1000 if self.frames else 0.0,
+            "desk_occupancy": self.occupancy
+        }
+
+
+def break_cost(frames, fps=30.0):
+    """CPU per second of camera time: focus-time detection vs the break-time path"""
+    from seemyfocus_engine import FocusEngine, SimulatedClock
+    
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_presence_")
+    try:
+        clock = SimulatedClock(start=1_700_000_000.0)
+        engine = FocusEngine(os.path.join(work_dir, "progress.json"),
+                             os.path.join(work_dir, "history.json"), clock)
+        engine.start_session()
+        
+        # Focus time: every frame gets face and eye detection and a display copy
+        start = time.perf_counter()
+        for frame, gray in zip(frames, grays):
+            engine.process_face_detection(frame, engine.detect_faces(gray), gray)
+            cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGBA)
+            clock.advance(1.0 / fps)
+        focus = (time.perf_counter() - start) / len(frames) * fps
+        
+        # Break time: a presence check and a blurred display copy, BREAK_FPS times a second
+        presence = BreakPresence()
+        step = max(1, int(round(fps / BREAK_FPS)))
+        checked = 0
+        present = 0
+        start = time.perf_counter()
+        for frame, gray in zip(frames[::step], grays[::step]):
+            seen = presence.check(gray, clock.time())
+            engine.process_break_presence(frame, seen)
+            cv2.cvtColor(privacy_blur(cv2.flip(frame, 1)), cv2.COLOR_BGR2RGBA)
+            clock.advance(step / fps)
+            checked += 1
+            present += seen
+        rest = (time.perf_counter() - start) / checked * BREAK_FPS
+        
+        blur_start = time.perf_counter()
+        for frame in frames[:50]:
+            privacy_blur(frame)
+        blur_ms = (time.perf_counter() - blur_start) / min(50, len(frames)) * 1000
+        gaussian_start = time.perf_counter()
+        for frame in frames[:10]:
+            cv2.GaussianBlur(frame, (0, 0), BLUR_FACTOR / 2)
+        gaussian_ms = (time.perf_counter() - gaussian_start) / min(10, len(frames)) * 1000
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "focus_cpu_ms_per_s": focus * 1000,
+        "break_cpu_ms_per_s": rest * 1000,
+        "present_ratio": present / checked,
+        "blur_ms": blur_ms,
+        "gaussian_ms": gaussian_ms
+    }
+
+
+# (phase, seconds, someone at the desk)
+DESK_SCRIPT = (("upright", 10, True), ("head down", 30, True), ("away", 30, False),
+               ("head down", 20, True), ("still reading", 15, True), ("away", 20, False))
+
+
+def scripted_desk(path, fps=10.0, size=(480, 640), script=DESK_SCRIPT, seed=7):
+    """Frames of a user at a desk looking up, writing head down, sitting still and leaving.
+    
+    Yields (frame, phase, present). Head down is the top half of the face
+    photo (hair, forehead, brows) squashed and lowered: tilted towards the
+    paper, the eyes, nose and mouth turn away from the camera. The room is textured so background subtraction has something
+    to model.
+    """
+    image = cv2.imread(path)
+    if image is None:
+        raise SystemExit(f"Could not read {path}")
+    face = cv2.resize(image, None, fx=2.0, fy=2.0)
+    down = cv2.resize(face[:face.shape[0] // 2], (face.shape[1], int(face.shape[0] * 0.4)))
+    rng = np.random.default_rng(seed)
+    height, width = size
+    room = cv2.GaussianBlur(rng.normal(110, 60, (height, width, 3)), (0, 0), 9)
+    room = np.clip((room - room.mean()) * 4 + 110, 0, 255).astype(np.uint8)
+    room[height * 3 // 4:] = (60, 80, 110)  # the desk
+    fh, fw = face.shape[:2]
+    home_x, home_y = (width - fw) // 2, 40
+    offset = np.zeros(2)
+    for phase, seconds, present in script:
+        for number in range(int(seconds * fps)):
+            frame = room.copy()
+            if present:
+                # Small drifts of the head and body, now and then a larger shift
+                still = phase == "still reading"
+                offset += rng.normal(0, 0.3 if still else 1.5, 2)
+                offset = np.clip(offset, -25, 25)
+                ox, oy = int(home_x + offset[0]), int(home_y + offset[1])
+                body_top = oy + fh - 20
+                cv2.rectangle(frame, (ox - 40, body_top), (ox + fw + 40, height), (70, 50, 140), -1)
+                if phase == "upright":
+                    frame[oy:oy + fh, ox:ox + fw] = face
+                else:
+                    dy = oy + fh - down.shape[0]
+                    frame[dy:dy + down.shape[0], ox:ox + fw] = down
+                    if not still:
+                        # A writing hand on the desk
+                        hx = int(width / 2 + 60 * np.sin(number / 7))
+                        cv2.circle(frame, (hx, height - 50), 18, (150, 170, 210), -1)
+            noise = rng.normal(0, 4, frame.shape)
+            yield np.clip(frame + noise, 0, 255).astype(np.uint8), phase, present
+
+
+def paper_comparison(path, fps=10.0):
+    """Presence from the face cascade on every frame vs DeskPresence on the scripted desk"""
+    from seemyfocus_engine import FocusEngine
+    
+    engine = FocusEngine(os.devnull, os.devnull)
+    desk = DeskPresence()
+    phases = []
+    cascade_seconds = 0.0
+    now = 0.0
+    for frame, phase, present in scripted_desk(path, fps):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        start = time.perf_counter()
+        by_cascade = len(engine.detect_faces(gray)) > 0
+        cascade_seconds += time.perf_counter() - start
+        by_desk = desk.check(gray, now, engine.detect_faces)
+        if not phases or phases[-1]["phase"] != phase or phases[-1]["present"] != present:
+            phases.append({"phase": phase, "present": present, "frames": 0, "cascade": 0, "desk": 0,
+                           "desk_settled": None})
+        row = phases[-1]
+        row["frames"] += 1
+        row["cascade"] += by_cascade == present
+        row["desk"] += by_desk == present
+        if by_desk == present and row["desk_settled"] is None:
+            row["desk_settled"] = row["frames"] / fps
+        elif by_desk != present:
+            row["desk_settled"] = None
+        now += 1.0 / fps
+    return phases, cascade_seconds / sum(row["frames"] for row in phases), desk.stats()["desk_presence_ms"] / 1000
+
+
+if __name__ == "__main__":
+    from seemyfocus_eyes import drifting_frames, video_frames
+    
+    parser = argparse.ArgumentParser(description="SeeMyFocus low-cost presence checks")
+    parser.add_argument("--break-cost", action="store_true", help="compare focus-time and break-time CPU")
+    parser.add_argument("--paper", action="store_true", help="compare Paper Mode presence methods on a scripted desk")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", help="recording with a face in it")
+    source.add_argument("--image", help="photo of a face, moved around the frame")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--fps", type=float, default=30.0, help="camera frame rate during focus time")
+    args = parser.parse_args()
+    
+    if args.paper and args.image:
+        phases, cascade_s, desk_s = paper_comparison(args.image)
+        for row in phases:
+            settled = "never" if row["desk_settled"] is None else f"{row['desk_settled']:.1f} s"
+            print(f"{row['phase']:14s} {'present' if row['present'] else 'empty':8s} {row['frames'] / 10:5.0f} s  "
+                  f"cascade right {row['cascade'] / row['frames'] * 100:5.1f}%  "
+                  f"desk presence right {row['desk'] / row['frames'] * 100:5.1f}% (settled after {settled})")
+        print(f"cost per frame: cascade {cascade_s * 1000:.1f} ms, desk presence {desk_s * 1000:.2f} ms "
+              f"({desk_s / cascade_s * 100:.1f}%)")
+    elif args.break_cost and (args.video or args.image):
+        frames = (video_frames(args.video, args.frames) if args.video
+                  else drifting_frames(args.image, args.frames, scale=2.0))
+        result = break_cost(frames, args.fps)
+        print(f"focus time: {result['focus_cpu_ms_per_s']:7.1f} ms CPU per second at {args.fps:g} fps")
+        print(f"break time: {result['break_cpu_ms_per_s']:7.1f} ms CPU per second at {BREAK_FPS:g} fps "
+              f"({result['break_cpu_ms_per_s'] / result['focus_cpu_ms_per_s'] * 100:.1f}% of focus time), "
+              f"present on {result['present_ratio'] * 100:.0f}% of checks")
+        print(f"privacy blur {result['blur_ms']:.2f} ms per frame "
+              f"(Gaussian blur of similar strength {result['gaussian_ms']:.1f} ms)")
+    else:
+        parser.print_help()
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""Frame-loop profiler for SeeMyFocus
+
+Launched with ``python SeeMyFocus_app.py --profile`` the app wraps its
+camera loop in a profiler for the duration of each session and writes a
+report to seemyfocus_profiles/ when the session ends. Nothing outside the
+frame loop (Tk idle time, other screens) ends up in the numbers.
+
+Two modes:
+    --profile            statistical sampler: a thread looks at the Tk
+                         thread's stack every few ms, but only while a frame
+                         is being processed. Cheap enough for slow machines.
+    --profile=cprofile   deterministic cProfile of every call in the loop;
+                         exact call counts at a noticeably higher cost.
+
+Sampled reports also include a .folded file of collapsed stacks that
+flamegraph.pl or speedscope can open directly.
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+PROFILES_DIR = "seemyfocus_profiles"
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MAX_STACK_DEPTH = 40
+
+
+def parse_profile_arg(argv):
+    """'sample', 'cprofile' or None from the command line"""
+    for arg in argv:
+        if arg == "--profile":
+            return "sample"
+        if arg.startswith("--profile="):
+            mode = arg.split("=", 1)[1]
+            return mode if mode in ("sample", "cprofile") else "sample"
+    return None
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class FrameLoopProfiler:
+    """Profiles the calls of a wrapped frame-loop function while active() is true"""
+    
+    def __init__(self, mode="sample", directory=PROFILES_DIR, active=None):
+        self.mode = mode
+        self.directory = directory
+        self.active = active or (lambda: True)
+        
+        self.frames = 0
+        self.frame_time = 0.0
+        self.profile = cProfile.Profile() if mode == "cprofile" else None
+        
+        # Sampler state
+        self.in_frame = False
+        self.target_thread = None
+        self.stacks = Counter()
+        self.samples = 0
+        self.sampler = None
+        self.running = False
+    
+    def wrap(self, func):
+        """Return func profiled; the wrapper is what the loop reschedules"""
+        @wraps(func)
+        def profiled(*args, **kwargs):
+            if not self.active():
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            if self.profile is not None:
+                self.profile.enable()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.profile.disable()
+                    self.frames += 1
+                    self.frame_time += time.perf_counter() - start
+            self.ensure_sampler()
+            self.in_frame = True
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.in_frame = False
+                self.frames += 1
+                self.frame_time += time.perf_counter() - start
+        return profiled
+    
+    def ensure_sampler(self):
+        if self.sampler is None:
+            self.target_thread = threading.get_ident()
+            self.running = True
+            self.sampler = threading.Thread(target=self.sample_loop, name="frame-sampler", daemon=True)
+            self.sampler.start()
+    
+    def sample_loop(self):
+        while self.running:
+            time.sleep(SAMPLE_INTERVAL)
+            if not self.in_frame:
+                continue
+            frame = sys._current_frames().get(self.target_thread)
+            stack = []
+            # Walk up to the wrapper; whatever called the loop is not part of it
+            while frame is not None and frame.f_code.co_filename != __file__ and len(stack) < MAX_STACK_DEPTH:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            if stack and self.in_frame:
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+    
+    def write_report(self, name, metrics_snapshot=None):
+        """Write the report for everything profiled so far, then start over. Returns the path"""
+        if not self.frames:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() else "-" for c in str(name))
+        path = os.path.join(self.directory, f"profile_{safe_name}.txt")
+        
+        lines = [f"SeeMyFocus frame-loop profile ({self.mode})",
+                 f"{self.frames} frames, {self.frame_time * 1000 / self.frames:.2f} ms per frame on average", ""]
+        if metrics_snapshot:
+            lines.append("Stage timings:")
+            for stage, stats in metrics_snapshot["stages"].items():
+                if stats["count"]:
+                    lines.append(f"  {stage:18s} mean {stats['mean_ms']:7.2f} ms  p95 <= {stats['p95_ms']:6.1f} ms  "
+                                 f"max {stats['max_ms']:7.1f} ms  (n={stats['count']})")
+            lines.append("")
+        
+        if self.profile is not None:
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(40)
+            lines.append(out.getvalue())
+        else:
+            lines.extend(self.sample_summary())
+            folded = os.path.splitext(path)[0] + ".folded"
+            with open(folded, "w") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(";".join(stack) + f" {count}\n")
+            lines.append(f"Collapsed stacks: {folded}")
+        
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        self.reset()
+        return path
+    
+    def sample_summary(self, top=25):
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        samples = max(self.samples, 1)
+        lines = [f"{self.samples} samples every {SAMPLE_INTERVAL * 1000:.0f} ms while a frame was running", "",
+                 "Self time (where the loop actually spends CPU):"]
+        for label, count in own.most_common(top):
+            lines.append(f"  {count * 100 / samples:5.1f}%  {label}")
+        lines += ["", "Inclusive time:"]
+        for label, count in total.most_common(top):
+            lines.append(f"  {count * 100 / samples:5.1f}%  {label}")
+        lines.append("")
+        return lines
+    
+    def reset(self):
+        self.frames = 0
+        self.frame_time = 0.0
+        self.stacks.clear()
+        self.samples = 0
+        if self.profile is not None:
+            self.profile = cProfile.Profile()
+    
+    def stop(self):
+        self.running = False
+        if self.sampler is not None:
+            self.sampler.join(timeout=1.0)
+            self.sampler = None
\ No newline at end of file
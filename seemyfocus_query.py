@@ -0,0 +1,306 @@
+"""Indexed queries over the SeeMyFocus session history
+
+Questions like "how much focused time on coding in March" used to mean a
+loop over every session dict, parsing its timestamp string on the way.
+HistoryIndex parses each timestamp once, in either stored format
+("2025-10-25 15:49:42" or ISO "2025-10-25T20:58:03.441198"), and keeps:
+
+- the sessions sorted by start time, with a parallel list of start times
+  for bisect;
+- running totals over that order, so sessions, focused time, session time
+  and score over any time range cost two bisects and a subtraction;
+- an inverted index from normalised task and mood (case and whitespace
+  insensitive, as in the rollups) to the sorted positions of their
+  sessions, with their own running totals, so the same holds for one
+  task or mood.
+
+Filtering on a task and a mood together intersects the two range slices.
+Task search matches a substring against the distinct task names, which
+are few, and merges their lists. New sessions normally start after every
+session already indexed and are appended in O(1). An older one, imported
+from another machine for example, changes every running total after it,
+so the index is rebuilt.
+    
+    python seemyfocus_query.py --task coding --from 2025-03-01 --to 2025-04-01
+    python seemyfocus_query.py --bench 10000     # indexed queries vs a loop over the sessions
+"""
+import argparse
+import heapq
+import json
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime, time as day_time
+
+from seemyfocus_rollups import normalize_label, parse_start, session_totals
+
+SUMMED = ("focus_seconds", "session_time", "focus_score")  # running totals kept per list
+
+
+def to_timestamp(value):
+    """Seconds since the epoch from a datetime, a date (its midnight), a number or a string in either format"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, day_time())
+    return value.timestamp()
+
+
+class Postings:
+    """Positions in start-time order, with their start times and running totals"""
+    
+    def __init__(self):
+        self.positions = []
+        self.starts = []
+        self.totals = {key: [0.0] for key in SUMMED}  # totals[key][i] is the sum over the first i entries
+    
+    def append(self, position, start, values):
+        self.positions.append(position)
+        self.starts.append(start)
+        for key in SUMMED:
+            column = self.totals[key]
+            column.append(column[-1] + values[key])
+    
+    def span(self, start, end):
+        """Index range [lo, hi) of the entries starting in [start, end)"""
+        lo = 0 if start is None else bisect_left(self.starts, start)
+        hi = len(self.starts) if end is None else bisect_left(self.starts, end)
+        return lo, max(lo, hi)
+    
+    def aggregate(self, lo, hi):
+        sessions = hi - lo
+        sums = {key: self.totals[key][hi] - self.totals[key][lo] for key in SUMMED}
+        return {
+            "sessions": sessions,
+            "focus_seconds": sums["focus_seconds"],
+            "session_seconds": sums["session_time"],
+            "mean_score": sums["focus_score"] / sessions if sessions else 0.0
+        }
+
+
+class HistoryIndex:
+    """Time, task and mood indexes over a session history list; positions refer to that list"""
+    
+    def __init__(self, history=()):
+        self.history = history
+        self.rebuild()
+    
+    def rebuild(self):
+        entries = []
+        for position, session in enumerate(self.history):
+            start = parse_start(session)
+            if start is not None:
+                entries.append((start.timestamp(), position))
+        entries.sort()
+        self.unindexed = len(self.history) - len(entries)
+        self.all = Postings()
+        self.tasks = {}
+        self.moods = {}
+        self.values = {}  # position -> the summed values of that session
+        for start, position in entries:
+            self.append(position, start)
+    
+    def values_of(self, position):
+        session = self.history[position]
+        values = self.values.get(position)
+        if values is None:
+            values = self.values[position] = {
+                "focus_seconds": session_totals(session)["focus_seconds"],
+                "session_time": float(session.get("session_time") or 0),
+                "focus_score": float(session.get("focus_score") or 0)
+            }
+        return values
+    
+    def append(self, position, start):
+        session = self.history[position]
+        values = self.values_of(position)
+        self.all.append(position, start, values)
+        for index, field in ((self.tasks, "task"), (self.moods, "mood")):
+            postings = index.get(normalize_label(session.get(field)))
+            if postings is None:
+                postings = index[normalize_label(session.get(field))] = Postings()
+            postings.append(position, start, values)
+    
+    def add(self, position):
+        """Index history[position], just appended to the history list"""
+        start = parse_start(self.history[position])
+        if start is None:
+            self.unindexed += 1
+            return
+        start = start.timestamp()
+        if not self.all.starts or start >= self.all.starts[-1]:
+            self.append(position, start)
+        else:
+            # Out of order: every running total after it changes
+            self.rebuild()
+    
+    # Queries; start is inclusive, end exclusive, either may be None
+    
+    def lists(self, task=None, mood=None, search=None):
+        """Postings to combine for the filters; None for no filter"""
+        chosen = []
+        if task is not None:
+            chosen.append([self.tasks.get(normalize_label(task))])
+        if mood is not None:
+            chosen.append([self.moods.get(normalize_label(mood))])
+        if search:
+            needle = normalize_label(search)
+            chosen.append([postings for name, postings in self.tasks.items() if needle in name])
+        return chosen
+    
+    def select(self, start=None, end=None, task=None, mood=None, search=None):
+        """History positions matching every filter, oldest first"""
+        start, end = to_timestamp(start), to_timestamp(end)
+        groups = self.lists(task, mood, search)
+        if not groups:
+            lo, hi = self.all.span(start, end)
+            return self.all.positions[lo:hi]
+        matches = None
+        for group in groups:
+            slices = []
+            for postings in group:
+                if postings is not None:
+                    lo, hi = postings.span(start, end)
+                    slices.append(zip(postings.starts[lo:hi], postings.positions[lo:hi]))
+            # Several task names matched by a search: merge their lists back into time order
+            found = [position for _, position in heapq.merge(*slices)]
+            if matches is None:
+                matches = found
+            else:
+                keep = set(found)
+                matches = [position for position in matches if position in keep]
+        return matches
+    
+    def aggregate(self, start=None, end=None, task=None, mood=None, search=None):
+        """Sessions, focused and session seconds and mean score over the matching sessions"""
+        start, end = to_timestamp(start), to_timestamp(end)
+        groups = self.lists(task, mood, search)
+        if not groups:
+            return self.all.aggregate(*self.all.span(start, end))
+        if len(groups) == 1:
+            # One task, one mood or the tasks matching a search: straight from their running totals
+            parts = [postings.aggregate(*postings.span(start, end)) for postings in groups[0] if postings is not None]
+            sessions = sum(part["sessions"] for part in parts)
+            return {
+                "sessions": sessions,
+                "focus_seconds": sum(part["focus_seconds"] for part in parts),
+                "session_seconds": sum(part["session_seconds"] for part in parts),
+                "mean_score": sum(part["mean_score"] * part["sessions"] for part in parts) / sessions if sessions else 0.0
+            }
+        positions = self.select(start, end, task, mood, search)
+        total = {"sessions": len(positions), "focus_seconds": 0.0, "session_seconds": 0.0, "mean_score": 0.0}
+        for position in positions:
+            values = self.values[position]
+            total["focus_seconds"] += values["focus_seconds"]
+            total["session_seconds"] += values["session_time"]
+            total["mean_score"] += values["focus_score"]
+        if positions:
+            total["mean_score"] /= len(positions)
+        return total
+    
+    def task_names(self):
+        """(name, sessions) for every normalised task, most sessions first"""
+        return sorted(((name, len(postings.positions)) for name, postings in self.tasks.items()),
+                      key=lambda item: -item[1])
+    
+    def mood_names(self):
+        return sorted(((name, len(postings.positions)) for name, postings in self.moods.items()),
+                      key=lambda item: -item[1])
+
+
+def scan_aggregate(history, start=None, end=None, task=None):
+    """The loop the index replaces: parse and test every session"""
+    start, end = to_timestamp(start), to_timestamp(end)
+    wanted = normalize_label(task) if task is not None else None
+    total = {"sessions": 0, "focus_seconds": 0.0}
+    for session in history:
+        when = parse_start(session)
+        if when is None:
+            continue
+        when = when.timestamp()
+        if (start is not None and when < start) or (end is not None and when >= end):
+            continue
+        if wanted is not None and normalize_label(session.get("task")) != wanted:
+            continue
+        total["sessions"] += 1
+        total["focus_seconds"] += session_totals(session)["focus_seconds"]
+    return total
+
+
+def benchmark(sessions, repeats=2000):
+    """Milliseconds to build the index and per query, against the loop over every session"""
+    import random
+    from seemyfocus_bench import TASKS, synthetic_history
+    
+    history = synthetic_history(sessions)
+    start = time.perf_counter()
+    index = HistoryIndex(history)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    first, last = index.all.starts[0], index.all.starts[-1]
+    rng = random.Random(5)
+    ranges = []
+    for _ in range(repeats):
+        a, b = sorted(rng.uniform(first, last) for _ in range(2))
+        ranges.append((a, b, rng.choice(TASKS)))
+    
+    timings = {"build_ms": build_ms}
+    for name, query in (("range", lambda a, b, task: index.aggregate(a, b)),
+                        ("range_task", lambda a, b, task: index.aggregate(a, b, task=task)),
+                        ("range_task_mood", lambda a, b, task: index.aggregate(a, b, task=task, mood="calm")),
+                        ("range_select", lambda a, b, task: index.select(a, b, task=task))):
+        start = time.perf_counter()
+        for a, b, task in ranges:
+            query(a, b, task)
+        timings[f"{name}_ms"] = (time.perf_counter() - start) * 1000 / repeats
+    
+    a, b, task = ranges[0]
+    start = time.perf_counter()
+    scanned = scan_aggregate(history, a, b, task)
+    timings["scan_ms"] = (time.perf_counter() - start) * 1000
+    indexed = index.aggregate(a, b, task=task)
+    assert scanned["sessions"] == indexed["sessions"] and abs(scanned["focus_seconds"] - indexed["focus_seconds"]) < 1e-6
+    return timings
+
+
+if __name__ == "__main__":
+    from seemyfocus_engine import HISTORY_FILE
+    
+    parser = argparse.ArgumentParser(description="Query the SeeMyFocus session history")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--from", dest="start", help="first day or timestamp, inclusive")
+    parser.add_argument("--to", dest="end", help="last day or timestamp, exclusive")
+    parser.add_argument("--task")
+    parser.add_argument("--mood")
+    parser.add_argument("--search", help="substring of the task")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS")
+    args = parser.parse_args()
+    
+    if args.bench:
+        for count in (args.bench // 10, args.bench):
+            timings = benchmark(count)
+            print(f"{count:6d} sessions: index built in {timings['build_ms']:.0f} ms; per query "
+                  f"range {timings['range_ms'] * 1000:.1f} us, range + task {timings['range_task_ms'] * 1000:.1f} us, "
+                  f"range + task + mood {timings['range_task_mood_ms'] * 1000:.0f} us, "
+                  f"list range + task {timings['range_select_ms'] * 1000:.0f} us; "
+                  f"loop over every session {timings['scan_ms']:.1f} ms")
+        raise SystemExit
+    
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    index = HistoryIndex(history)
+    start = time.perf_counter()
+    total = index.aggregate(args.start, args.end, args.task, args.mood, args.search)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{total['sessions']} sessions, {total['focus_seconds'] / 3600:.2f} h focused of "
+          f"{total['session_seconds'] / 3600:.2f} h, mean score {total['mean_score']:.0f}% ({elapsed:.3f} ms)")
+    for position in index.select(args.start, args.end, args.task, args.mood, args.search)[-10:]:
+        session = history[position]
+        print(f"  {session.get('timestamp', session.get('session_id'))}  {session.get('task', '')!s:20.20}  "
+              f"{session.get('session_time', 0) // 60:4d} min  {session.get('focus_score', 0):3d}%")
\ No newline at end of file
@@ -0,0 +1,342 @@
+"""Daily and weekly rollups of the session history for SeeMyFocus
+
+Every cross-session number used to mean a pass over the whole history:
+the dashboard re-read all sessions each time it was drawn. Rollups keeps
+one row per calendar day and one per week (weeks start on Monday), and
+finish_session adds the new session to its day and week. That touches two
+rows whatever the length of the history. The rows are saved next to the
+history file in seemyfocus_rollups.json.
+
+Both tables count sessions, focused, away and no-camera seconds, cycles,
+cycles that ran to their end, wellness points and XP. Day rows also keep
+what the dashboard charts need: a focus score histogram, focused seconds
+per hour of the day, and per task and mood totals. Readers (the
+dashboard, the day streak and weekly reports) only look at the rows in
+their date range, so their cost grows with the number of days and not
+with the number of sessions.
+
+A session counts on the day it started. Focused time is the tracked time
+(session time minus time without a camera) times the focus score; away
+time is the rest of the tracked time. If the history file and the rollups
+disagree about how many sessions there are, for example after the history
+was edited by hand, the rollups are rebuilt from the history on load.
+    
+    python seemyfocus_rollups.py --rebuild        # regenerate from seemyfocus_history.json
+    python seemyfocus_rollups.py --week           # report for the current week
+    python seemyfocus_rollups.py --bench 10000    # add / rebuild / report cost on synthetic sessions
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+
+ROLLUPS_FILE = "seemyfocus_rollups.json"
+ROLLUPS_VERSION = 1
+
+FOCUS_CYCLE_SECONDS = 20 * 60  # the engine's cycle lengths
+BREAK_CYCLE_SECONDS = 5 * 60
+SCORE_BUCKETS = 10             # focus score histogram in 10-point buckets; 100 falls in the last
+
+TOTALS = ("sessions", "focus_seconds", "away_seconds", "no_camera_seconds",
+          "cycles", "cycles_ended", "wellness", "xp")
+
+
+def normalize_label(text):
+    """Task and mood key: trimmed, single-spaced, case-folded"""
+    return " ".join(str(text or "").split()).casefold()
+
+
+def session_start(session):
+    """Start timestamp string of a session record, in either stored format"""
+    stamp = session.get("timestamp")
+    if stamp:
+        return stamp
+    # The oldest records only carry a session_id like 20251025_154847
+    session_id = str(session.get("session_id", ""))
+    if len(session_id) == 15 and session_id[8] == "_":
+        return (f"{session_id[:4]}-{session_id[4:6]}-{session_id[6:8]}T"
+                f"{session_id[9:11]}:{session_id[11:13]}:{session_id[13:]}")
+    return None
+
+
+def parse_start(session):
+    """Start of a session as a datetime, or None; both "2025-10-25 15:49:42" and ISO are accepted"""
+    stamp = session_start(session)
+    if not stamp:
+        return None
+    try:
+        return datetime.fromisoformat(stamp)
+    except ValueError:
+        return None
+
+
+def week_of(day):
+    """Monday of the week a date falls in"""
+    return day - timedelta(days=day.weekday())
+
+
+def cycles_ended(session_time):
+    """Focus cycles that ran to their end in a session this long"""
+    if session_time < FOCUS_CYCLE_SECONDS:
+        return 0
+    return int((session_time - FOCUS_CYCLE_SECONDS) // (FOCUS_CYCLE_SECONDS + BREAK_CYCLE_SECONDS)) + 1
+
+
+def session_totals(session):
+    """What one session adds to its day and week rows"""
+    session_time = max(0.0, float(session.get("session_time") or 0))
+    no_camera = min(session_time, float(session.get("no_camera_time") or 0))
+    score = min(100.0, max(0.0, float(session.get("focus_score") or 0)))
+    focused = (session_time - no_camera) * score / 100
+    ended = cycles_ended(session_time)
+    return {
+        "sessions": 1,
+        "focus_seconds": focused,
+        "away_seconds": session_time - no_camera - focused,
+        "no_camera_seconds": no_camera,
+        "cycles": min(int(session.get("streak_count") or 0), ended),
+        "cycles_ended": ended,
+        "wellness": int(session.get("wellness_points") or 0),
+        "xp": int(session.get("xp_earned") or 0)
+    }
+
+
+def new_week():
+    return dict.fromkeys(TOTALS, 0)
+
+
+def new_day():
+    row = new_week()
+    row["score_counts"] = [0] * SCORE_BUCKETS
+    row["hour_focus"] = [0.0] * 24
+    row["tasks"] = {}  # normalised name -> [sessions, focused seconds, score sum]
+    row["moods"] = {}
+    return row
+
+
+class Rollups:
+    """Day and week rows keyed by ISO date ("2025-10-27"); weeks by their Monday"""
+    
+    def __init__(self):
+        self.days = {}
+        self.weeks = {}
+        self.sessions = 0   # history records counted, to notice a history edited behind our back
+        self.skipped = 0    # records without a readable start time
+        self.changed_days = []  # day keys in the order add() changed them, for readers that keep copies
+    
+    # Writing
+    
+    def add(self, session):
+        """Count one finished session; touches one week row and the day rows its hours fall on"""
+        self.sessions += 1
+        start = parse_start(session)
+        if start is None:
+            self.skipped += 1
+            return
+        totals = session_totals(session)
+        day = self.day(start.date().isoformat())
+        week_key = week_of(start.date()).isoformat()
+        week = self.weeks.get(week_key)
+        if week is None:
+            week = self.weeks[week_key] = new_week()
+        for key, value in totals.items():
+            day[key] += value
+            week[key] += value
+        
+        score = float(session.get("focus_score") or 0)
+        day["score_counts"][min(SCORE_BUCKETS - 1, max(0, int(score // 10)))] += 1
+        for key, field in (("tasks", "task"), ("moods", "mood")):
+            entry = day[key].setdefault(normalize_label(session.get(field)), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += totals["focus_seconds"]
+            entry[2] += score
+        self.spread_focus(start, float(session.get("session_time") or 0), totals["focus_seconds"])
+    
+    def spread_focus(self, start, session_time, focused):
+        """Share a session's focused seconds over the clock hours it covered"""
+        if session_time <= 0 or focused <= 0:
+            return
+        rate = focused / session_time
+        moment, remaining = start, session_time
+        while remaining > 0:
+            hour_end = moment.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+            seconds = min(remaining, (hour_end - moment).total_seconds())
+            # A session running past midnight puts its later hours on the next day
+            day = self.day(moment.date().isoformat())
+            day["hour_focus"][moment.hour] += seconds * rate
+            moment, remaining = hour_end, remaining - seconds
+    
+    def day(self, key):
+        """The day row for key, created when missing, noted in changed_days"""
+        row = self.days.get(key)
+        if row is None:
+            row = self.days[key] = new_day()
+        if not self.changed_days or self.changed_days[-1] != key:
+            self.changed_days.append(key)
+        return row
+    
+    @classmethod
+    def rebuild(cls, history):
+        """Rollups regenerated from the raw history"""
+        rollups = cls()
+        for session in history:
+            rollups.add(session)
+        rollups.changed_days = []  # nobody has read these rows yet
+        return rollups
+    
+    # Persistence
+    
+    def to_dict(self):
+        return {"version": ROLLUPS_VERSION, "sessions": self.sessions, "skipped": self.skipped,
+                "days": self.days, "weeks": self.weeks}
+    
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != ROLLUPS_VERSION:
+            raise ValueError(f"rollups version {data.get('version')}")
+        rollups = cls()
+        rollups.sessions = data["sessions"]
+        rollups.skipped = data.get("skipped", 0)
+        rollups.days = data["days"]
+        rollups.weeks = data["weeks"]
+        return rollups
+    
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+    
+    @classmethod
+    def load(cls, path):
+        """Rollups from path, or None when missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    # Reading; everything below only visits the rows in the requested range
+    
+    def day_rows(self, first, last):
+        """[(date, row or None)] for every day from first to last inclusive"""
+        rows = []
+        day = first
+        while day <= last:
+            rows.append((day, self.days.get(day.isoformat())))
+            day += timedelta(days=1)
+        return rows
+    
+    def first_day(self):
+        return date.fromisoformat(min(self.days)) if self.days else None
+    
+    def totals(self, first=None, last=None):
+        """Summed totals over a date range, from week rows where whole weeks are covered"""
+        combined = new_week()
+        if not self.days:
+            return combined
+        first = first or self.first_day()
+        last = last or date.fromisoformat(max(self.days))
+        day = first
+        while day <= last:
+            if day.weekday() == 0 and day + timedelta(days=6) <= last:
+                row, step = self.weeks.get(day.isoformat()), 7
+            else:
+                row, step = self.days.get(day.isoformat()), 1
+            if row:
+                for key in TOTALS:
+                    combined[key] += row[key]
+            day += timedelta(days=step)
+        return combined
+    
+    def day_streak(self, today):
+        """Consecutive days with a session, ending today (or yesterday, if today has none yet)"""
+        day = today if today.isoformat() in self.days else today - timedelta(days=1)
+        streak = 0
+        while self.days.get(day.isoformat(), {}).get("sessions"):
+            streak += 1
+            day -= timedelta(days=1)
+        return streak
+    
+    def weekly_report(self, monday):
+        """Totals of the week starting on monday, with the previous week's for comparison"""
+        this = self.weeks.get(monday.isoformat()) or new_week()
+        previous = self.weeks.get((monday - timedelta(days=7)).isoformat()) or new_week()
+        days = [(day, row) for day, row in self.day_rows(monday, monday + timedelta(days=6)) if row and row["sessions"]]
+        return {
+            "week": monday.isoformat(),
+            "this": this,
+            "previous": previous,
+            "active_days": len(days),
+            "best_day": max(days, key=lambda item: item[1]["focus_seconds"])[0].isoformat() if days else None,
+            "cycle_rate": this["cycles"] / this["cycles_ended"] if this["cycles_ended"] else 0.0
+        }
+
+
+def describe_week(report):
+    this, previous = report["this"], report["previous"]
+    change = ""
+    if previous["focus_seconds"]:
+        change = f" ({(this['focus_seconds'] / previous['focus_seconds'] - 1) * 100:+.0f}% on the week before)"
+    return (f"Week of {report['week']}: {this['sessions']} sessions on {report['active_days']} days, "
+            f"{this['focus_seconds'] / 3600:.1f} h focused{change}, {this['away_seconds'] / 3600:.1f} h away, "
+            f"{this['cycles']} cycles ({report['cycle_rate'] * 100:.0f}% completed), "
+            f"{this['wellness']} wellness, {this['xp']} XP" + (f"; best day {report['best_day']}" if report["best_day"] else ""))
+
+
+def benchmark(sessions):
+    """Milliseconds for one incremental add, a full rebuild and range reads, on synthetic sessions"""
+    from seemyfocus_bench import synthetic_history
+    
+    history = synthetic_history(sessions)
+    start = time.perf_counter()
+    rollups = Rollups.rebuild(history)
+    rebuild_ms = (time.perf_counter() - start) * 1000
+    
+    extra = synthetic_history(200, seed=5)
+    start = time.perf_counter()
+    for session in extra:
+        rollups.add(session)
+    add_ms = (time.perf_counter() - start) * 1000 / len(extra)
+    
+    last = date.fromisoformat(max(rollups.days))
+    start = time.perf_counter()
+    rollups.totals(last - timedelta(days=29), last)
+    rollups.day_streak(last)
+    rollups.weekly_report(week_of(last))
+    report_ms = (time.perf_counter() - start) * 1000
+    return {"days": len(rollups.days), "rebuild_ms": rebuild_ms, "add_ms": add_ms, "report_ms": report_ms}
+
+
+if __name__ == "__main__":
+    from seemyfocus_engine import HISTORY_FILE
+    
+    parser = argparse.ArgumentParser(description="SeeMyFocus daily and weekly rollups")
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--rebuild", action="store_true", help="regenerate the rollups from the history")
+    parser.add_argument("--week", nargs="?", const="today", metavar="DATE", help="report for the week containing DATE")
+    parser.add_argument("--bench", type=int, metavar="SESSIONS")
+    args = parser.parse_args()
+    
+    if args.bench:
+        for count in (args.bench // 10, args.bench):
+            result = benchmark(count)
+            print(f"{count:6d} sessions over {result['days']} days: rebuild {result['rebuild_ms']:.0f} ms, "
+                  f"add one session {result['add_ms'] * 1000:.0f} us, "
+                  f"30-day totals + streak + weekly report {result['report_ms']:.2f} ms")
+        raise SystemExit
+    
+    path = os.path.join(os.path.dirname(os.path.abspath(args.history)), ROLLUPS_FILE)
+    rollups = None if args.rebuild else Rollups.load(path)
+    if rollups is None:
+        history = []
+        if os.path.exists(args.history):
+            with open(args.history) as f:
+                history = json.load(f)
+        rollups = Rollups.rebuild(history)
+        rollups.save(path)
+        print(f"Rebuilt {path} from {len(history)} sessions ({rollups.skipped} without a start time)")
+    week = date.today() if args.week in (None, "today") else date.fromisoformat(args.week)
+    print(describe_week(rollups.weekly_report(week_of(week))))
+    print(f"Day streak: {rollups.day_streak(date.today())}")
\ No newline at end of file
@@ -0,0 +1,368 @@
+"""Accelerated session simulator for SeeMyFocus
+
+Drives the real FocusEngine with a SimulatedClock and scripted presence
+instead of a webcam, so an 8-hour session with 20-minute cycles, breaks,
+distractions and reminders runs in seconds. Face detection is replaced by
+the script; everything after it - buffers, cycles, streaks, XP, reminders,
+persistence - is the production code.
+    
+    python seemyfocus_sim.py --hours 8 --pattern steady
+    python seemyfocus_sim.py --hours 2 --script focused:1500,away:40,glance:5
+    python seemyfocus_sim.py --hours 1 --script focused:900,nocamera:60
+    python seemyfocus_sim.py --hours 1 --script focused:900,visitor:60 --other-faces Distraction
+
+The report covers memory growth, per-frame latency drift across the run
+and an audit of cycles and XP. Kiosk-style days of back-to-back sessions
+run with --session-hours; --memory-check adds resident memory and object
+counts per simulated hour from the app's memory self-check.
+    
+    python seemyfocus_sim.py --hours 24 --session-hours 2 --memory-check
+
+Cycle boundaries, the countdown and distraction reminders run on timers
+between frames, as they do in the app; --stall adds camera stalls and
+--frame-timers checks them once per frame instead, for comparison.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from seemyfocus_engine import FocusEngine, SimulatedClock
+from seemyfocus_faces import OTHER_FACES_POLICIES
+from seemyfocus_memory import MemoryMonitor
+
+FRAME_SHAPE = (480, 640, 3)
+FACE = np.array([(220, 120, 200, 200)])      # normal distance
+CLOSE_FACE = np.array([(100, 40, 300, 300)])  # wider than TOO_CLOSE_THRESHOLD
+VISITOR = np.array([(500, 60, 90, 90), (220, 120, 200, 200)])  # someone behind the user, listed first
+NO_FACE = ()
+
+# What the camera would see: (faces, eyes_detected, looking_straight); None is an unplugged camera
+PRESENCE = {
+    "focused": (FACE, True, True),
+    "glance": (FACE, False, False),
+    "close": (CLOSE_FACE, False, False),
+    "away": (NO_FACE, False, False),
+    "visitor": (VISITOR, True, True),
+    "nocamera": (None, False, False)
+}
+
+STALL_EVERY = 600     # seconds between simulated camera stalls
+TIMER_SLACK = 0.001   # the app's Tk timer fires about a millisecond after its deadline
+
+# Repeating scripts of (presence, seconds)
+PATTERNS = {
+    "steady": [("focused", 1400), ("glance", 3), ("focused", 400), ("away", 240)],
+    "deep": [("focused", 3000), ("away", 300)],
+    "distracted": [("focused", 300), ("away", 20), ("focused", 200), ("glance", 8), ("away", 90)],
+    "leaning": [("focused", 600), ("close", 120), ("focused", 600), ("away", 30)]
+}
+
+
+def parse_script(text):
+    """'focused:1500,away:30' -> [('focused', 1500.0), ('away', 30.0)]"""
+    script = []
+    for part in text.split(","):
+        kind, _, seconds = part.strip().partition(":")
+        if kind not in PRESENCE:
+            raise ValueError(f"unknown presence '{kind}' (use {', '.join(PRESENCE)})")
+        script.append((kind, float(seconds)))
+    return script
+
+
+def random_script(seed, segments=200):
+    rng = random.Random(seed)
+    return [(rng.choice(["focused", "focused", "focused", "glance", "away", "close"]), rng.uniform(2, 900))
+            for _ in range(segments)]
+
+
+class SimulatedEngine(FocusEngine):
+    """FocusEngine whose eyes come from the script and whose rewards are audited"""
+    
+    def __init__(self, progress_file, history_file, clock):
+        super().__init__(progress_file, history_file, clock=clock)
+        self.scripted_eyes = (False, False)
+        self.ledger = []  # ("xp", amount, reason) or ("penalty", amount, reason) in order
+        self.level_ups = 0
+        self.boundary_lateness = []  # seconds each cycle boundary was handled after its deadline
+        self.cycle_drift = []        # per session: last cycle start minus the ideal one
+        self.ideal_cycle_start = None
+    
+    def start_session(self):
+        super().start_session()
+        self.ideal_cycle_start = self.cycle_start_time
+    
+    def finish_session(self):
+        self.cycle_drift.append(self.cycle_start_time - self.ideal_cycle_start)
+        return super().finish_session()
+    
+    def update_cycle_timer(self):
+        cycle = self.current_cycle_type
+        duration = self.cycle_duration()
+        deadline = self.cycle_start_time + duration if self.cycle_start_time else None
+        super().update_cycle_timer()
+        if self.current_cycle_type != cycle:
+            self.boundary_lateness.append(self.clock.time() - deadline)
+            self.ideal_cycle_start += duration
+    
+    def detect_eye_gaze(self, frame, gray, face_rect, *located):
+        return self.scripted_eyes
+    
+    def add_xp(self, amount, reason=""):
+        self.ledger.append(("xp", amount, reason))
+        super().add_xp(amount, reason)
+    
+    def present_reminder(self, message, xp_lost):
+        self.ledger.append(("penalty", xp_lost, "reminder"))
+    
+    def show_level_up_notification(self):
+        self.level_ups += 1
+
+
+def replay_ledger(ledger, level, xp, xp_to_next_level):
+    """Apply the ledger with the engine's level rules; returns (level, xp, xp_to_next_level)"""
+    for kind, amount, _ in ledger:
+        if kind == "penalty":
+            xp = max(0, xp - amount)
+            continue
+        xp += amount
+        while xp >= xp_to_next_level:
+            xp -= xp_to_next_level
+            level += 1
+            xp_to_next_level = int(xp_to_next_level * 1.5)
+    return level, xp, xp_to_next_level
+
+
+def simulate(hours=8.0, script=None, fps=10.0, session_hours=None, memory_check=False,
+             stall=0.0, frame_timers=False, other_faces="Ignore"):
+    """Run hours of back-to-back sessions (one by default); returns the report dict"""
+    script = script or PATTERNS["steady"]
+    work_dir = tempfile.mkdtemp(prefix="seemyfocus_sim_")
+    clock = SimulatedClock(start=1_700_000_000.0)
+    engine = SimulatedEngine(os.path.join(work_dir, "progress.json"),
+                             os.path.join(work_dir, "history.json"), clock)
+    engine.other_faces_policy.set(other_faces)
+    start_state = (engine.level, engine.xp, engine.xp_to_next_level)
+    frame = np.zeros(FRAME_SHAPE, np.uint8)
+    step = 1.0 / fps
+    total_frames = int(hours * 3600 * fps)
+    frames_per_hour = int(3600 * fps)
+    frames_per_session = int((session_hours or hours) * 3600 * fps)
+    monitor = MemoryMonitor(path=None, clock=clock.time) if memory_check else None
+    # Allocated before tracing starts so the measurement does not show up as growth
+    latencies = np.empty(frames_per_hour)
+    filled = 0
+    np.percentile(latencies[:10], 99)  # numpy sets up internal caches on first use
+    
+    tracemalloc.start()
+    engine.start_session()
+    memory_start = tracemalloc.get_traced_memory()[0]
+    hourly = []  # per simulated hour: latency stats and traced memory
+    presence_seconds = {kind: 0.0 for kind in PRESENCE}
+    sessions = []  # (session_data, xp) of every finished session
+    stalled_frames = 0
+    if monitor:
+        monitor.sample()
+    
+    wall_start = time.perf_counter()
+    clock_start = clock.time()
+    segment_index = 0
+    segment_left = script[0][1]
+    for number in range(total_frames):
+        if number and number % frames_per_session == 0:
+            sessions.append(engine.finish_session())
+            engine.start_session()
+        
+        kind = script[segment_index][0]
+        faces, eyes_detected, looking_straight = PRESENCE[kind]
+        engine.scripted_eyes = (eyes_detected, looking_straight)
+        
+        start = time.perf_counter()
+        if stall and (clock.time() - clock_start) % STALL_EVERY < stall:
+            stalled_frames += 1  # the camera delivers nothing
+        elif faces is None:
+            engine.process_no_camera()
+        else:
+            engine.process_face_detection(frame, faces, None)
+            if frame_timers:
+                engine.update_cycle_timer()
+        latencies[filled] = time.perf_counter() - start
+        filled += 1
+        
+        presence_seconds[kind] += step
+        next_frame = clock.time() + step
+        if not frame_timers:
+            # Deadlines that fall before the next frame fire on time, frames or not
+            due = engine.next_timer_deadline()
+            while due is not None and due + TIMER_SLACK <= next_frame:
+                clock.advance_to(due + TIMER_SLACK)
+                engine.run_timers()
+                due = engine.next_timer_deadline()
+        clock.advance_to(next_frame)
+        segment_left -= step
+        if segment_left <= 0:
+            segment_index = (segment_index + 1) % len(script)
+            segment_left = script[segment_index][1]
+        
+        if filled == frames_per_hour or number == total_frames - 1:
+            gc.collect()  # uncollected cycles (json's encoder closures) are not growth
+            traced = tracemalloc.get_traced_memory()[0]
+            hour = latencies[:filled]
+            hourly.append({
+                "hour": len(hourly) + 1,
+                "mean_us": float(hour.mean()) * 1e6,
+                "p99_us": float(np.percentile(hour, 99)) * 1e6,
+                "traced_kb": traced / 1024
+            })
+            if monitor:
+                sample = monitor.sample()
+                hourly[-1]["rss_kb"] = sample["rss_kb"]
+                hourly[-1]["objects"] = sample["objects"]
+            filled = 0
+    
+    gc.collect()
+    memory_end, memory_peak = tracemalloc.get_traced_memory()
+    focus_timeline_entries = len(engine.focus_timeline)
+    focus_timeline_in_memory = len(engine.focus_timeline.buffer)
+    sessions.append(engine.finish_session())
+    session_data = sessions[-1][0]
+    wall_seconds = time.perf_counter() - wall_start
+    tracemalloc.stop()
+    
+    replayed = replay_ledger(engine.ledger, *start_state)
+    final_state = (engine.level, engine.xp, engine.xp_to_next_level)
+    xp_by_reason = {}
+    for kind, amount, reason in engine.ledger:
+        entry = xp_by_reason.setdefault(reason, {"count": 0, "xp": 0})
+        entry["count"] += 1
+        entry["xp"] += amount if kind == "xp" else -amount
+    
+    cycle_length = engine.focus_cycle_duration + engine.break_cycle_duration
+    report = {
+        "simulated_hours": hours,
+        "frames": total_frames,
+        "fps": fps,
+        "wall_seconds": round(wall_seconds, 2),
+        "speedup": round(hours * 3600 / wall_seconds, 1),
+        "presence_minutes": {kind: round(seconds / 60, 1) for kind, seconds in presence_seconds.items()},
+        "memory": {
+            "start_kb": round(memory_start / 1024, 1),
+            "end_kb": round(memory_end / 1024, 1),
+            "peak_kb": round(memory_peak / 1024, 1),
+            "growth_kb_per_hour": round((memory_end - memory_start) / 1024 / hours, 1),
+            "focus_timeline_entries": focus_timeline_entries,
+            "focus_timeline_in_memory": focus_timeline_in_memory,
+            "eye_history_entries": len(engine.eye_history)
+        },
+        "latency": {
+            "hourly": [{key: round(value, 2) if isinstance(value, float) else value
+                        for key, value in hour.items()} for hour in hourly],
+            "drift": round(hourly[-1]["mean_us"] / hourly[0]["mean_us"], 2) if hourly and hourly[0]["mean_us"] else None
+        },
+        "sessions": len(sessions),
+        "timers": {
+            "driven_by": "frames" if frame_timers else "scheduler",
+            "stalled_frames": stalled_frames,
+            "boundaries": len(engine.boundary_lateness),
+            "late_mean_ms": round(float(np.mean(engine.boundary_lateness)) * 1000, 1) if engine.boundary_lateness else None,
+            "late_max_ms": round(max(engine.boundary_lateness) * 1000, 1) if engine.boundary_lateness else None,
+            "max_cycle_drift_s": round(max(abs(drift) for drift in engine.cycle_drift), 3)
+        },
+        "cycles": {
+            "completed": sum(data["streak_count"] for data, _ in sessions),
+            "max_possible": int(hours * 3600 // cycle_length),
+            "persistent_streak": engine.persistent_streak_count,
+            "reminders": engine.reminder_count,
+            "focus_score": session_data["focus_score"],
+            "no_camera_minutes": round(sum(data["no_camera_time"] for data, _ in sessions) / 60, 1)
+        },
+        "xp": {
+            "by_reason": xp_by_reason,
+            "session_completion_xp": sum(xp for _, xp in sessions),
+            "level_ups": engine.level_ups,
+            "final": {"level": final_state[0], "xp": final_state[1], "xp_to_next_level": final_state[2]},
+            "ledger_consistent": replayed == final_state
+        }
+    }
+    if monitor:
+        report["memory"]["rss_growth_kb_per_hour"] = round(monitor.growth_per_hour("rss_kb"), 1)
+        report["memory"]["object_growth_per_hour"] = round(monitor.growth_per_hour("objects"), 1)
+        report["memory"]["growing_types"] = monitor.latest()["growing_types"]
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+def print_report(report):
+    print(f"Simulated {report['simulated_hours']} h in {report['sessions']} session(s) "
+          f"({report['frames']} frames at {report['fps']:g} fps) "
+          f"in {report['wall_seconds']} s - {report['speedup']}x real time")
+    print("Presence (min): " + ", ".join(f"{kind} {minutes}" for kind, minutes in report["presence_minutes"].items()))
+    memory = report["memory"]
+    print(f"Memory: {memory['start_kb']} KB -> {memory['end_kb']} KB (peak {memory['peak_kb']} KB), "
+          f"{memory['growth_kb_per_hour']} KB/hour; focus_timeline {memory['focus_timeline_entries']} entries, "
+          f"{memory['focus_timeline_in_memory']} in memory")
+    if "rss_growth_kb_per_hour" in memory:
+        print(f"Self-check: rss {memory['rss_growth_kb_per_hour']} KB/hour, "
+              f"objects {memory['object_growth_per_hour']}/hour; grown: {memory['growing_types'] or 'nothing'}")
+    latency = report["latency"]
+    for hour in latency["hourly"]:
+        extra = f", rss {hour['rss_kb']} KB, {hour['objects']} objects" if "rss_kb" in hour else ""
+        print(f"  hour {hour['hour']:2d}: {hour['mean_us']:7.2f} us/frame mean, p99 {hour['p99_us']:7.2f} us, "
+              f"traced {hour['traced_kb']:9.1f} KB{extra}")
+    print(f"Latency drift (last hour / first hour): {latency['drift']}x")
+    timers = report["timers"]
+    print(f"Timers driven by {timers['driven_by']}: {timers['boundaries']} cycle boundaries handled "
+          f"{timers['late_mean_ms']} ms late on average, {timers['late_max_ms']} ms at most; "
+          f"cycle drift {timers['max_cycle_drift_s']} s; {timers['stalled_frames']} frames lost to stalls")
+    cycles = report["cycles"]
+    print(f"Cycles: {cycles['completed']} of {cycles['max_possible']} possible, streak {cycles['persistent_streak']}, "
+          f"{cycles['reminders']} reminders, focus score {cycles['focus_score']}%, "
+          f"no camera {cycles['no_camera_minutes']} min")
+    xp = report["xp"]
+    for reason, entry in xp["by_reason"].items():
+        print(f"  {reason or 'unspecified':22s} x{entry['count']:<5d} {entry['xp']:+7d} XP")
+    final = xp["final"]
+    print(f"Level {final['level']} with {final['xp']}/{final['xp_to_next_level']} XP after {xp['level_ups']} level-ups; "
+          f"ledger {'consistent' if xp['ledger_consistent'] else 'INCONSISTENT'} with engine state")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a long SeeMyFocus session on a simulated clock")
+    parser.add_argument("--hours", type=float, default=8.0, help="simulated session length")
+    parser.add_argument("--fps", type=float, default=10.0, help="simulated camera frame rate")
+    parser.add_argument("--pattern", choices=sorted(PATTERNS) + ["random"], default="steady",
+                        help="built-in presence pattern")
+    parser.add_argument("--script", help="custom pattern, e.g. focused:1500,away:30,glance:4")
+    parser.add_argument("--seed", type=int, default=1, help="seed for --pattern random")
+    parser.add_argument("--session-hours", type=float, help="split the run into back-to-back sessions this long")
+    parser.add_argument("--memory-check", action="store_true",
+                        help="sample resident memory and object counts every simulated hour")
+    parser.add_argument("--stall", type=float, default=0.0, metavar="SECONDS",
+                        help=f"camera delivers no frames for this long every {STALL_EVERY // 60} minutes")
+    parser.add_argument("--frame-timers", action="store_true",
+                        help="check cycles once per frame, as before the timer scheduler")
+    parser.add_argument("--other-faces", choices=OTHER_FACES_POLICIES, default="Ignore",
+                        help="what the 'visitor' presence's second face counts as")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+    
+    if args.script:
+        script = parse_script(args.script)
+    elif args.pattern == "random":
+        script = random_script(args.seed)
+    else:
+        script = PATTERNS[args.pattern]
+    
+    report = simulate(args.hours, script, args.fps, args.session_hours, args.memory_check,
+                      args.stall, args.frame_timers, args.other_faces)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
\ No newline at end of file
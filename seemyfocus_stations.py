@@ -0,0 +1,263 @@
+"""Multi-station mode for SeeMyFocus
+
+Runs one headless FocusEngine per camera or video file, each in its own
+worker process, so a single machine can coach several desks. Every station
+gets the full pipeline - face/eye detection, distraction buffers, cycles,
+streaks and XP - and keeps its own progress and history files under
+stations/<name>/.
+    
+    python seemyfocus_stations.py 0 1 recordings/desk3.mp4
+    python seemyfocus_stations.py --benchmark recordings/desk3.mp4 --fps 10
+
+The benchmark adds identical stations until one of them can no longer keep
+up with the target frame rate and reports how many stations fit per CPU.
+"""
+import argparse
+import os
+import queue
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+
+import cv2
+
+from seemyfocus_engine import FocusEngine, PROGRESS_FILE, HISTORY_FILE
+
+STATIONS_DIR = "stations"
+STATUS_INTERVAL = 0.5  # seconds between status reports (and stop checks) per station
+DASHBOARD_INTERVAL = 1.0
+SUSTAINED_RATIO = 0.95  # a station keeps up if it delivers 95% of the target fps
+
+
+def parse_source(source):
+    """Camera indexes are given as plain numbers, anything else is a file"""
+    return int(source) if str(source).isdigit() else source
+
+
+def station_name(source, number):
+    if isinstance(source, int):
+        return f"{number + 1}-cam{source}"
+    return f"{number + 1}-{os.path.splitext(os.path.basename(source))[0]}"
+
+
+def ignore_sigint():
+    # Ctrl+C is handled once, by the parent, which then stops every station
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def station_status(engine, name, fps, frame_ms):
+    return {
+        "name": name,
+        "state": engine.current_state,
+        "cycle": engine.current_cycle_type,
+        "remaining": engine.cycle_remaining(),
+        "streak": engine.persistent_streak_count,
+        "score": engine.focus_score,
+        "fps": fps,
+        "frame_ms": frame_ms
+    }
+
+
+def run_station(name, source, data_dir, target_fps, status_queue, stop_event, loop_video=True):
+    """Worker body: drive one FocusEngine from one source until stopped"""
+    # The pool supplies the parallelism; OpenCV's own threads would oversubscribe
+    cv2.setNumThreads(1)
+    
+    os.makedirs(data_dir, exist_ok=True)
+    engine = FocusEngine(os.path.join(data_dir, PROGRESS_FILE),
+                         os.path.join(data_dir, HISTORY_FILE))
+    engine.load_user_progress()
+    engine.load_session_history()
+    engine.session_task = name
+    
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        status_queue.put({"name": name, "error": "cannot open source"})
+        return {"name": name, "error": "cannot open source", "frames": 0, "fps": 0.0}
+    
+    engine.start_session()
+    frame_interval = 1.0 / target_fps if target_fps else 0.0
+    frame = None
+    gray = None
+    frames = 0
+    busy = 0.0
+    
+    started = time.perf_counter()
+    next_frame_at = started
+    window_start = started
+    window_frames = 0
+    
+    while True:
+        ok, frame = capture.read(frame)
+        if not ok:
+            # Recorded desks loop so they behave like a live camera
+            if loop_video and not isinstance(source, int) and frames:
+                capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                frame = None
+                continue
+            break
+        
+        work_start = time.perf_counter()
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        faces = engine.detect_faces(gray)
+        engine.process_face_detection(frame, faces, gray)
+        engine.update_cycle_timer()
+        now = time.perf_counter()
+        busy += now - work_start
+        frames += 1
+        window_frames += 1
+        
+        if now - window_start >= STATUS_INTERVAL:
+            status_queue.put(station_status(engine, name, window_frames / (now - window_start),
+                                            busy / frames * 1000))
+            window_start = now
+            window_frames = 0
+            if stop_event.is_set():
+                break
+        
+        if frame_interval:
+            next_frame_at += frame_interval
+            delay = next_frame_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Behind schedule - carry on from now rather than bursting to catch up
+                next_frame_at = time.perf_counter()
+    
+    elapsed = time.perf_counter() - started
+    capture.release()
+    session_data, xp_earned = engine.finish_session()
+    
+    return {
+        "name": name,
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed else 0.0,
+        "frame_ms": busy / frames * 1000 if frames else 0.0,
+        "focus_score": session_data["focus_score"],
+        "cycles": session_data["streak_count"],
+        "streak": engine.persistent_streak_count,
+        "xp_earned": xp_earned
+    }
+
+
+def render_dashboard(statuses, elapsed):
+    """Compact one-line-per-station table"""
+    lines = [f"SeeMyFocus stations: {len(statuses)} running for {int(elapsed)}s  (Ctrl+C to stop)",
+             f"{'station':18s} {'state':9s} {'cycle':6s} {'left':>5s} {'streak':>6s} "
+             f"{'score':>5s} {'fps':>5s} {'ms/f':>6s}"]
+    for name in sorted(statuses):
+        status = statuses[name]
+        if "error" in status:
+            lines.append(f"{name:18s} {status['error']}")
+            continue
+        remaining = status["remaining"]
+        lines.append(f"{name:18s} {status['state']:9s} {status['cycle']:6s} "
+                     f"{remaining // 60:02d}:{remaining % 60:02d} {status['streak']:6d} "
+                     f"{status['score']:4d}% {status['fps']:5.1f} {status['frame_ms']:6.1f}")
+    return "\n".join(lines)
+
+
+def run_stations(sources, target_fps=10, data_root=STATIONS_DIR, duration=None,
+                 dashboard=True, loop_video=True):
+    """Run one worker process per source; returns each station's summary"""
+    stations = [(station_name(source, number), source) for number, source in enumerate(sources)]
+    interactive = dashboard and sys.stdout.isatty()
+    
+    manager = SyncManager()
+    manager.start(ignore_sigint)
+    try:
+        status_queue = manager.Queue()
+        stop_event = manager.Event()
+        statuses = {}
+        
+        # Stations run until stopped, so every one of them needs its own worker
+        with ProcessPoolExecutor(max_workers=len(stations), initializer=ignore_sigint) as pool:
+            futures = [pool.submit(run_station, name, source, os.path.join(data_root, name),
+                                   target_fps, status_queue, stop_event, loop_video)
+                       for name, source in stations]
+            started = time.time()
+            last_draw = 0.0
+            try:
+                while not all(future.done() for future in futures):
+                    now = time.time()
+                    if duration and now - started >= duration:
+                        stop_event.set()
+                    try:
+                        status = status_queue.get(timeout=0.2)
+                        statuses[status["name"]] = status
+                    except queue.Empty:
+                        pass
+                    if dashboard and statuses and now - last_draw >= DASHBOARD_INTERVAL:
+                        last_draw = now
+                        table = render_dashboard(statuses, now - started)
+                        print("\033[H\033[J" + table if interactive else table + "\n", flush=True)
+            except KeyboardInterrupt:
+                stop_event.set()
+            return [future.result() for future in futures]
+    finally:
+        manager.shutdown()
+
+
+def benchmark(source, target_fps=10, max_stations=None, seconds=10.0):
+    """Add stations on one source until the slowest falls below the target fps"""
+    cpus = os.cpu_count() or 1
+    max_stations = max_stations or cpus * 4
+    data_root = tempfile.mkdtemp(prefix="seemyfocus_bench_")
+    results = []
+    try:
+        for count in range(1, max_stations + 1):
+            summaries = run_stations([source] * count, target_fps, data_root=data_root,
+                                     duration=seconds, dashboard=False)
+            if any("error" in summary for summary in summaries):
+                print("Could not open", source)
+                break
+            slowest = min(summary["fps"] for summary in summaries)
+            frame_ms = sum(summary["frame_ms"] for summary in summaries) / count
+            sustained = slowest >= target_fps * SUSTAINED_RATIO
+            results.append({"stations": count, "slowest_fps": slowest,
+                            "frame_ms": frame_ms, "sustained": sustained})
+            print(f"{count:3d} stations  slowest {slowest:5.1f} fps  {frame_ms:6.1f} ms/frame  "
+                  f"{'ok' if sustained else 'cannot keep up'}", flush=True)
+            if not sustained:
+                break
+    finally:
+        shutil.rmtree(data_root, ignore_errors=True)
+    
+    if results:
+        best = max((result["stations"] for result in results if result["sustained"]), default=0)
+        # Single-station cost gives the CPU-bound ceiling independent of scheduling
+        ceiling = 1000.0 / (results[0]["frame_ms"] * target_fps)
+        print(f"{best} stations sustained at {target_fps} fps on {cpus} CPU(s) = "
+              f"{best / cpus:.1f} stations/CPU (compute ceiling {ceiling:.1f} stations/CPU)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run SeeMyFocus on several cameras or video files")
+    parser.add_argument("sources", nargs="*", help="camera indexes and/or video files")
+    parser.add_argument("--fps", type=float, default=10, help="target frames per second per station")
+    parser.add_argument("--data", default=STATIONS_DIR, help="directory for per-station progress/history")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--benchmark", metavar="SOURCE",
+                        help="measure how many stations this machine sustains on a camera index or video file")
+    parser.add_argument("--max-stations", type=int, help="upper bound for --benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0, help="run time per --benchmark step")
+    args = parser.parse_args()
+    
+    if args.benchmark is not None:
+        benchmark(parse_source(args.benchmark), args.fps, args.max_stations, args.seconds)
+    elif args.sources:
+        for summary in run_stations([parse_source(source) for source in args.sources],
+                                    args.fps, data_root=args.data, duration=args.duration):
+            if "error" in summary:
+                print(f"{summary['name']}: {summary['error']}")
+            else:
+                print(f"{summary['name']}: {summary['frames']} frames at {summary['fps']:.1f} fps, "
+                      f"focus {summary['focus_score']}%, {summary['cycles']} cycles, +{summary['xp_earned']} XP")
+    else:
+        parser.print_help()
\ No newline at end of file
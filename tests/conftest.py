@@ -0,0 +1,22 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# The modules live at the repository root, next to SeeMyFocus_app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """A short 640x480 MJPG clip of a bright disc drifting over a gray background"""
+    path = str(tmp_path / "desk.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (640, 480))
+    for number in range(120):
+        frame = np.full((480, 640, 3), 90, np.uint8)
+        cv2.circle(frame, (200 + number * 2, 240), 60, (200, 180, 160), -1)
+        writer.write(frame)
+    writer.release()
+    return path
\ No newline at end of file
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from seemyfocus_analytics import HistoryArrays, check, dashboard
+from seemyfocus_bench import synthetic_history
+from seemyfocus_rollups import Rollups, normalize_label, session_totals
+
+
+@pytest.fixture(scope="module")
+def history():
+    return synthetic_history(400)
+
+
+def test_dashboard_matches_a_plain_scan_of_the_history(history):
+    rollups = Rollups.rebuild(history)
+    today = date.fromisoformat(max(rollups.days))
+    summary = dashboard(rollups, today)
+    
+    totals = [session_totals(session) for session in history]
+    scores = [session["focus_score"] for session in history]
+    assert summary["sessions"] == len(history)
+    assert summary["focus_hours"] == pytest.approx(sum(row["focus_seconds"] for row in totals) / 3600)
+    assert summary["heatmap"].sum() == pytest.approx(summary["focus_hours"] * 60)
+    
+    expected_counts = [0] * 10
+    for score in scores:
+        expected_counts[min(9, score // 10)] += 1
+    assert summary["scores"]["counts"].tolist() == expected_counts
+    assert summary["scores"]["mean"] == pytest.approx(np.mean(scores))
+    
+    tasks = {}
+    for session, row in zip(history, totals):
+        entry = tasks.setdefault(normalize_label(session["task"]), [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += row["focus_seconds"] / 60
+        entry[2] += session["focus_score"]
+    assert {row["name"]: [row["sessions"], pytest.approx(row["focus_minutes"]), pytest.approx(row["mean_score"])]
+            for row in summary["tasks"]} == {name: [n, minutes, score / n] for name, (n, minutes, score) in tasks.items()}
+    minutes = [row["focus_minutes"] for row in summary["tasks"]]
+    assert minutes == sorted(minutes, reverse=True)
+    
+    completed = sum(row["cycles"] for row in totals)
+    ended = sum(row["cycles_ended"] for row in totals)
+    assert summary["cycles"] == {"completed": completed, "ended": ended, "rate": pytest.approx(completed / ended)}
+    
+    first = today - timedelta(days=29)
+    recent = sum(row["focus_seconds"] for session, row in zip(history, totals)
+                 if first <= datetime.fromisoformat(session["timestamp"]).date() <= today)
+    assert len(summary["days"]) == 30 and summary["day_minutes"].sum() == pytest.approx(recent / 60)
+    assert summary["week_minutes"].sum() == pytest.approx(summary["focus_hours"] * 60)
+
+
+def test_heatmap_spreads_a_session_over_the_hours_it_covers():
+    # Sunday 23:30 for an hour, fully focused: half in Sunday 23:00, half in Monday 00:00
+    rollups = Rollups.rebuild([{"timestamp": "2024-01-07 23:30:00", "session_time": 3600, "focus_score": 100}])
+    heat = dashboard(rollups, date(2024, 1, 8))["heatmap"]
+    assert heat[6, 23] == pytest.approx(30) and heat[0, 0] == pytest.approx(30)
+    assert heat.sum() == pytest.approx(60)
+
+
+def test_history_arrays_read_both_timestamp_formats_and_old_session_ids():
+    arrays = HistoryArrays([
+        {"timestamp": "2025-10-25 15:49:42", "session_time": 600, "focus_score": 50},
+        {"timestamp": "2025-10-26T09:00:00.250000", "session_time": 60, "focus_score": 100},
+        {"session_id": "20251024_154847", "session_time": 60},
+        {"timestamp": "not a date", "session_time": 60}
+    ])
+    assert len(arrays) == 3
+    assert arrays.day.astype(str).tolist() == ["2025-10-25", "2025-10-26", "2025-10-24"]
+    assert arrays.focus_seconds.tolist() == [300.0, 60.0, 0.0]
+
+
+def test_check_finds_rollups_out_of_step_with_the_history(history):
+    rollups = Rollups.rebuild(history)
+    assert check(rollups, history) == {}
+    rollups.add(history[0])
+    differences = check(rollups, history)
+    assert set(differences) == {"focus_seconds", "away_seconds", "cycles", "cycles_ended", "sessions_per_day"}
\ No newline at end of file
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+import pytest
+
+import seemyfocus_audio
+from seemyfocus_audio import AudioCueEngine
+
+
+class FakeTTS:
+    """pyttsx3 stand-in whose runAndWait() blocks until the test opens the gate"""
+    
+    def __init__(self):
+        self.gate = threading.Event()
+        self.spoken = []
+        self.saving = None
+    
+    def say(self, text):
+        self.spoken.append(text)
+    
+    def save_to_file(self, text, path):
+        self.saving = path
+    
+    def runAndWait(self):
+        self.gate.wait(5)
+        if self.saving:
+            with open(self.saving, "wb") as f:
+                f.write(b"RIFF")
+            self.saving = None
+
+
+class Cues(AudioCueEngine):
+    def __init__(self, tts, **kwargs):
+        self.tts = tts
+        self.played = []
+        super().__init__(**kwargs)
+    
+    def create_engine(self):
+        return self.tts
+    
+    def play_file(self, path):
+        self.played.append(path)
+
+
+def eventually(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def no_player(monkeypatch):
+    monkeypatch.setattr(seemyfocus_audio, "find_player", lambda: None)
+
+
+def test_cues_queue_by_priority_while_the_worker_speaks(no_player, tmp_path):
+    tts = FakeTTS()
+    cues = Cues(tts, max_pending=2, cache_dir=str(tmp_path))
+    try:
+        assert cues.say("session_start")
+        eventually(lambda: tts.spoken)  # the worker is now stuck in runAndWait()
+        
+        start = time.perf_counter()
+        assert cues.say("a tip", AudioCueEngine.LOW)
+        assert cues.say("a reminder", AudioCueEngine.NORMAL)
+        assert cues.say("level up", AudioCueEngine.HIGH)       # full: evicts the tip
+        assert not cues.say("another tip", AudioCueEngine.LOW)  # full of more important cues
+        assert not cues.say("a reminder", AudioCueEngine.HIGH)  # already queued
+        assert time.perf_counter() - start < 0.05
+        
+        tts.gate.set()
+        eventually(lambda: len(tts.spoken) == 3)
+        assert tts.spoken == ["Session started. Let's focus.", "level up", "a reminder"]
+    finally:
+        cues.shutdown()
+
+
+def test_fixed_cues_are_rendered_while_idle_then_played_from_the_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(seemyfocus_audio, "find_player", lambda: ["true"])
+    monkeypatch.setattr(seemyfocus_audio, "FIXED_CUES", {"reminder": "Back to it.", "break_over": "Break over."})
+    tts = FakeTTS()
+    tts.gate.set()
+    cues = Cues(tts, cache_dir=str(tmp_path))
+    try:
+        paths = [cues.cache_path(text) for text in ("Back to it.", "Break over.")]
+        eventually(lambda: all(os.path.exists(path) for path in paths))
+        
+        cues.say("reminder")
+        cues.say("not a fixed phrase")
+        eventually(lambda: cues.played and tts.spoken)
+        assert cues.played == [paths[0]]
+        assert tts.spoken == ["not a fixed phrase"]
+    finally:
+        cues.shutdown()
+
+
+def test_cues_are_dropped_when_speech_is_unavailable(no_player, tmp_path):
+    class Mute(Cues):
+        def create_engine(self):
+            return None
+    
+    cues = Mute(FakeTTS(), cache_dir=str(tmp_path))
+    cues.thread.join(5)
+    assert not cues.available
+    assert not cues.say("reminder")
+    cues.shutdown()
\ No newline at end of file
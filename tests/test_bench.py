@@ -0,0 +1,35 @@
+import json
+
+from seemyfocus_bench import compare, flatten, synthetic_frames, synthetic_history
+
+
+def test_generated_inputs_are_deterministic():
+    assert synthetic_history(50) == synthetic_history(50)
+    assert all((a == b).all() for a, b in zip(synthetic_frames(3), synthetic_frames(3)))
+    
+    history = synthetic_history(6)
+    # Both stored timestamp formats show up, as in real history files
+    assert " " in history[0]["timestamp"] and "T" in history[1]["timestamp"]
+    assert all(session["session_time"] // 5 == len(session["focus_timeline"]) for session in history)
+
+
+def test_flatten_keeps_numbers_only():
+    results = {"commit": "abc123", "detection": {"detect_faces": {"mean_ms": 12.5, "runs": 40}},
+               "ui": {"history_screen": {"skipped": "no display", "first_build_ms": 300.0}}, "ok": True}
+    assert flatten(results) == {"detection.detect_faces.mean_ms": 12.5, "detection.detect_faces.runs": 40,
+                                "ui.history_screen.first_build_ms": 300.0}
+
+
+def test_compare_flags_changes_over_ten_percent(tmp_path, capsys):
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    old.write_text(json.dumps({"detection": {"detect_faces": {"mean_ms": 10.0, "runs": 50},
+                                             "eye_gaze": {"mean_ms": 4.0}, "process": {"mean_ms": 1.0}}}))
+    new.write_text(json.dumps({"detection": {"detect_faces": {"mean_ms": 12.0, "runs": 10},
+                                             "eye_gaze": {"mean_ms": 3.0}, "process": {"mean_ms": 1.05}}}))
+    compare(str(old), str(new))
+    lines = {line.split()[0]: line for line in capsys.readouterr().out.splitlines()}
+    assert set(lines) == {"detection.detect_faces.mean_ms", "detection.eye_gaze.mean_ms",
+                          "detection.process.mean_ms"}
+    assert lines["detection.detect_faces.mean_ms"].endswith("REGRESSION")
+    assert lines["detection.eye_gaze.mean_ms"].endswith("faster")
+    assert lines["detection.process.mean_ms"].endswith("%")
\ No newline at end of file
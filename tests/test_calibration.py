@@ -0,0 +1,64 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import seemyfocus_calibration
+from seemyfocus_calibration import (DEFAULT_DETECTOR, EYE_MIN_SIZES, EYE_SCALE_FACTORS, SAMPLE_EVERY,
+                                    DetectorCalibrator, choose, sweep)
+from seemyfocus_eyes import drifting_frames
+
+PORTRAIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "face.png")
+
+
+@pytest.fixture(scope="module")
+def swept():
+    frames = drifting_frames(PORTRAIT, 6 * SAMPLE_EVERY, scale=2.0)[::SAMPLE_EVERY]
+    return sweep([cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames], 0)
+
+
+def test_sweep_covers_every_eye_setting(swept):
+    _, rows = swept
+    eye_settings = {(row["detector"]["eye_scale_factor"], row["detector"]["eye_min_size"]) for row in rows}
+    assert eye_settings == {(factor, size) for factor in EYE_SCALE_FACTORS for size in EYE_MIN_SIZES}
+    assert any(row["detector"] == DEFAULT_DETECTOR for row in rows)
+    assert max(row["accuracy"] for row in rows) == 1.0
+
+
+def test_choice_is_the_most_accurate_within_budget(swept):
+    cheapest, rows = swept
+    assert cheapest is min(rows, key=lambda row: row["frame_ms"])
+    
+    budget = float(np.median([row["frame_ms"] for row in rows]))
+    chosen = choose(rows, budget)
+    fitting = [row for row in rows if row["frame_ms"] <= budget]
+    assert chosen["frame_ms"] <= budget
+    assert round(chosen["accuracy"], 3) == max(round(row["accuracy"], 3) for row in fitting)
+    assert choose(rows, float("inf"))["accuracy"] == 1.0
+
+
+def test_calibrator_samples_sweeps_once_then_watches_for_drift(monkeypatch):
+    now = [1000.0]
+    row = {"detector": dict(DEFAULT_DETECTOR, scale=0.5), "frame_ms": 8.0, "accuracy": 1.0}
+    monkeypatch.setattr(seemyfocus_calibration, "sweep", lambda grays, budget_ms: (row, [row]))
+    calibrator = DetectorCalibrator(20.0, frames=4, clock=lambda: now[0])
+    gray = np.zeros((48, 64), np.uint8)
+    
+    calibrator.start()
+    for _ in range(4 * SAMPLE_EVERY):
+        assert calibrator.observe(gray, 30.0) is None
+    calibrator.thread.join(5)
+    assert calibrator.observe(gray, 30.0) is row
+    assert calibrator.observe(gray, 30.0) is None
+    assert calibrator.state == DetectorCalibrator.WATCHING and calibrator.frame_ms == 8.0
+    
+    # Slower than 1.5x the budget for 30 s, but within 10 minutes of the last run: keep watching
+    calibrator.observe(gray, 31.0)
+    now[0] += 40
+    calibrator.observe(gray, 31.0)
+    assert calibrator.state == DetectorCalibrator.WATCHING
+    
+    now[0] += 600
+    calibrator.observe(gray, 31.0)
+    assert calibrator.state == DetectorCalibrator.SAMPLING
\ No newline at end of file
@@ -0,0 +1,124 @@
+import time
+
+import cv2
+
+import seemyfocus_camera
+from seemyfocus_camera import ALLOCATION_LIMIT, CameraManager, FramePool, measure_allocations
+
+
+def test_camera_opens_in_the_background_and_hands_over_frames_in_order(recording):
+    camera = CameraManager(recording)
+    start = time.perf_counter()
+    camera.open_async()
+    camera.open_async()  # already opening: no second device
+    assert time.perf_counter() - start < 0.1
+    assert camera.wait_ready(timeout=10)
+    assert camera.open_latency is not None
+    
+    buffer = None
+    centres = []
+    for _ in range(10):
+        ret, frame = camera.read(out=buffer, timeout=1.0)
+        assert ret
+        if buffer is None:
+            buffer = frame
+        assert frame is buffer
+        row = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)[240]
+        centres.append(float((row > 140).nonzero()[0].mean()))
+    camera.release()
+    
+    # The disc moves 2 px per frame; a recording is read in order, skipping none
+    assert all(0 < later - earlier < 6 for earlier, later in zip(centres, centres[1:]))
+    assert camera.state == CameraManager.CLOSED
+    assert camera.read() == (False, None)
+
+
+def test_a_missing_camera_is_retried_without_blocking(tmp_path):
+    camera = CameraManager(str(tmp_path / "unplugged.avi"), warmup_frames=1)
+    camera.open_async()
+    assert not camera.wait_ready(timeout=10)
+    assert camera.state == CameraManager.RECONNECTING
+    assert camera.read() == (False, None)
+    camera.release()
+    assert camera.state == CameraManager.CLOSED
+
+
+def test_frame_loop_allocates_almost_nothing_per_frame(recording):
+    result = measure_allocations(recording, frames=120)
+    assert result is not None and result["frames"] > 100
+    assert result["bytes_per_frame"] <= ALLOCATION_LIMIT
+
+
+def test_allocation_check_catches_a_per_frame_conversion(recording, monkeypatch):
+    # The old loop: a fresh gray image from cvtColor on every frame
+    monkeypatch.setattr(FramePool, "to_gray", lambda self, frame: cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    result = seemyfocus_camera.measure_allocations(recording, frames=60)
+    assert result["bytes_per_frame"] > ALLOCATION_LIMIT
+
+
+class QueuedCapture:
+    """A driver with frames already waiting: grab() is instant while any are queued"""
+    
+    def __init__(self, queued):
+        self.queued = queued
+        self.grabbed = 0
+        self.settings = []
+    
+    def grab(self):
+        if self.queued:
+            self.queued -= 1
+        else:
+            time.sleep(0.01)  # waits for the sensor
+        self.grabbed += 1
+        return True
+    
+    def retrieve(self, out=None):
+        return True, self.grabbed
+    
+    def set(self, prop, value):
+        self.settings.append(prop)
+        return True
+    
+    def get(self, prop):
+        return {cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"MJPG"), cv2.CAP_PROP_FRAME_WIDTH: 640,
+                cv2.CAP_PROP_FRAME_HEIGHT: 480, cv2.CAP_PROP_FPS: 30, cv2.CAP_PROP_BUFFERSIZE: 1}[prop]
+
+
+def test_stale_queued_frames_are_skipped_for_the_newest():
+    camera = CameraManager(0)
+    capture = QueuedCapture(queued=3)
+    # Three frames were waiting; the fourth grab waits for a fresh one, which is decoded
+    assert camera.read_latest(capture) == (True, 4)
+    assert camera.frames_dropped == 3
+    
+    camera.max_stale_drop = 2
+    capture.queued = 5
+    assert camera.read_latest(capture) == (True, 7)
+    assert camera.frames_dropped == 5
+
+
+def test_capture_profile_sets_the_format_before_the_size():
+    camera = CameraManager(0, profile="low_latency")
+    capture = QueuedCapture(queued=0)
+    camera.apply_profile(capture)
+    assert capture.settings == [cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT,
+                                cv2.CAP_PROP_FPS, cv2.CAP_PROP_BUFFERSIZE]
+    assert camera.applied == {"fourcc": "MJPG", "width": 640, "height": 480, "fps": 30, "buffer_size": 1}
+    
+    assert CameraManager(0, profile="no such profile").profile == "low_latency"
+    camera.set_profile("driver_default")
+    capture.settings = []
+    camera.apply_profile(capture)
+    assert capture.settings == []
+
+
+def test_an_unplugged_or_hung_camera_reconnects_without_blocking_reads(recording, monkeypatch):
+    monkeypatch.setattr(CameraManager, "READ_TIMEOUT", 0.5)
+    result = seemyfocus_camera.measure_reconnect(recording, outages=(0.5,), hang=1.0)
+    assert result is not None
+    assert [trial["fault"] for trial in result["trials"]] == ["unplugged", "hung"]
+    for trial in result["trials"]:
+        assert trial["detected_s"] is not None and trial["first_frame_after_fix_s"] is not None
+        assert trial["slowest_read_ms"] < 100  # the UI thread never waits on the device
+    assert result["trials"][1]["detected_s"] >= 0.5  # a hang counts once it outlasts READ_TIMEOUT
+    assert result["disconnects"] == 2 and result["read_timeouts"] >= 1
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+
+import cv2
+import pytest
+
+from seemyfocus_eyes import EyeTracker, compare, drifting_frames, pair_eyes
+
+PORTRAIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "face.png")
+
+
+def test_pairs_come_back_left_eye_first():
+    right, left = (120, 40, 30, 30), (40, 42, 30, 30)
+    (first, second), _ = pair_eyes([right, left], 200, 200)
+    assert (first, second) == (left, right)
+
+
+def test_the_most_eye_like_pair_wins():
+    left, right = (40, 40, 30, 30), (120, 42, 30, 30)
+    nostril = (85, 110, 14, 14)   # too low and too small to pair with either eye
+    brow = (118, 10, 32, 20)      # level with nothing
+    (pair, score) = pair_eyes([nostril, right, brow, left], 200, 200)
+    assert pair == (left, right) and score < 0.1
+    assert pair_eyes([left], 200, 200) is None
+    assert pair_eyes([left, (50, 45, 30, 30)], 200, 200) is None  # overlapping, not side by side
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return drifting_frames(PORTRAIT, 60, scale=2.0)
+
+
+def test_tracker_keeps_the_eyes_ordered_and_skips_most_cascade_runs(frames):
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    tracker = EyeTracker(cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml'))
+    found = 0
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(100, 100))
+        if not len(faces):
+            continue
+        x, y, w, h = faces[0]
+        centres = tracker.locate(gray, (x, y, w, h))
+        if centres is None:
+            continue
+        found += 1
+        (lx, ly), (rx, ry) = centres
+        assert lx < rx
+        assert 0.15 * h <= ly <= 0.55 * h and 0.15 * h <= ry <= 0.55 * h  # in the upper face band
+    stats = tracker.stats()
+    assert found >= 0.85 * len(frames)
+    assert stats["eye_cascade_runs"] <= len(frames) // 3 and stats["eye_cascade_skip_ratio"] >= 0.6
+
+
+def test_tracker_is_steadier_than_the_cascade_on_every_frame(frames):
+    _, results = compare(frames)
+    old, new = results["cascade every frame"], results["band + tracking"]
+    assert new["swaps"] == 0 and old["swaps"] > 0
+    assert new["found"] >= old["found"]
+    assert new["mean_move_px"] < 5 < old["mean_move_px"]
\ No newline at end of file
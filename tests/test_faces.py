@@ -0,0 +1,65 @@
+import pytest
+
+from seemyfocus_faces import PrimaryFaceTracker, demo, iou, scripted_room
+from seemyfocus_sim import parse_script, simulate
+
+USER = (260, 140, 180, 180)
+
+
+def test_iou():
+    assert iou(USER, USER) == 1.0
+    assert iou((0, 0, 10, 10), (5, 0, 10, 10)) == pytest.approx(1 / 3)
+    assert iou((0, 0, 10, 10), (20, 0, 10, 10)) == 0.0
+
+
+def test_the_nearest_face_starts_the_track_and_keeps_it():
+    tracker = PrimaryFaceTracker()
+    visitor = (520, 60, 90, 90)
+    assert tracker.update([visitor, USER]) == (USER, [visitor])
+    
+    # A bigger face elsewhere does not take over while the user is still matched
+    closer = (0, 0, 300, 300)
+    moved = (268, 136, 184, 184)
+    assert tracker.update([closer, moved]) == (moved, [closer])
+
+
+def test_a_missed_detection_keeps_the_identity():
+    tracker = PrimaryFaceTracker(max_missed=3)
+    visitor = (520, 60, 90, 90)
+    tracker.update([USER])
+    for _ in range(3):
+        assert tracker.update([visitor]) == (None, [visitor])  # nobody is promoted
+    assert tracker.update([visitor, USER]) == (USER, [visitor])
+    assert tracker.stats() == {"face_tracks_acquired": 1, "face_tracks_lost": 0}
+    
+    for _ in range(4):
+        primary, _ = tracker.update([visitor])
+    assert primary == visitor  # expired after max_missed frames: the visitor is all that is left
+    assert tracker.stats() == {"face_tracks_acquired": 2, "face_tracks_lost": 1}
+
+
+def test_size_jumps_do_not_continue_the_track():
+    tracker = PrimaryFaceTracker()
+    tracker.update([USER])
+    assert tracker.update([(260, 140, 240, 240)]) == (None, [(260, 140, 240, 240)])
+
+
+def test_scripted_room_never_follows_a_passer_by():
+    frames = list(scripted_room(600))
+    assert any(user is not None and detections[0] != user for detections, user in frames)
+    tracker = PrimaryFaceTracker()
+    for detections, user in frames:
+        primary, others = tracker.update(detections)
+        assert primary == user
+        assert sorted(others + ([primary] if primary else [])) == sorted(detections)
+    
+    result = demo(3000)
+    assert result["wrong_face_tracked"] == 0 < result["wrong_face_first"]
+    assert result["face_tracks_acquired"] == 1 and result["face_tracks_lost"] == 0
+
+
+@pytest.mark.parametrize("policy, streak, reminders", [("Ignore", 2, 0), ("Distraction", 1, 2)])
+def test_other_faces_policy(policy, streak, reminders):
+    report = simulate(1.0, parse_script("focused:900,visitor:60"), fps=2, other_faces=policy)
+    assert report["cycles"]["persistent_streak"] == streak
+    assert report["cycles"]["reminders"] == reminders
\ No newline at end of file
@@ -0,0 +1,15 @@
+import os
+
+from seemyfocus_eyes import drifting_frames
+from seemyfocus_kalman import count_transitions, smoothing_failures
+
+# A small grayscale portrait (Tk's demo photo of John Ousterhout)
+PORTRAIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "face.png")
+
+
+def test_smoothing_reduces_state_flips_at_the_too_close_threshold():
+    # Scale 2.3 puts the face right at TOO_CLOSE_THRESHOLD, where raw jitter flips the state
+    frames = drifting_frames(PORTRAIT, 300, scale=2.3)
+    raw = count_transitions(frames, smoothing=False)
+    smoothed = count_transitions(frames, smoothing=True)
+    assert smoothing_failures(raw, smoothed) == []
\ No newline at end of file
@@ -0,0 +1,6 @@
+from seemyfocus_live import load_test, load_test_failures
+
+
+def test_hundred_subscribers_cost_the_frame_loop_under_a_millisecond():
+    report = load_test(subscribers=100, seconds=2.0)
+    assert load_test_failures(report, 100) == []
\ No newline at end of file
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from seemyfocus_memory import MemoryMonitor, SpillingTimeline, growth_per_hour
+
+
+def test_timeline_keeps_one_chunk_in_memory(tmp_path):
+    timeline = SpillingTimeline(directory=str(tmp_path), chunk=4)
+    samples = [n % 3 for n in range(11)]
+    for value in samples:
+        timeline.append(value)
+        assert len(timeline.buffer) < 4
+    assert len(timeline) == 11 and timeline.spilled == 8
+    assert os.path.getsize(timeline.path) == 8
+    assert timeline.to_list() == samples
+    
+    path = timeline.path
+    timeline.discard()
+    assert not os.path.exists(path) and len(timeline) == 0 and timeline.to_list() == []
+
+
+def test_timeline_keeps_samples_when_the_disk_fails(tmp_path):
+    blocked = tmp_path / "not_a_directory"
+    blocked.write_text("")
+    timeline = SpillingTimeline(directory=str(blocked), chunk=3)
+    for value in range(7):
+        timeline.append(value)
+    assert timeline.path is None and timeline.spilled == 0
+    assert timeline.limit == 9  # retries one chunk later
+    assert timeline.to_list() == list(range(7))
+
+
+def test_growth_is_a_least_squares_slope_per_hour():
+    samples = [{"time": 600.0 * n, "rss_kb": 1000 + 50 * n} for n in range(12)]
+    assert growth_per_hour(samples) == pytest.approx(300.0)
+    noisy = [dict(sample, rss_kb=sample["rss_kb"] + (40 if n % 3 == 1 else -20)) for n, sample in enumerate(samples)]
+    assert growth_per_hour(noisy) == pytest.approx(300.0, abs=15)
+    assert growth_per_hour(samples[:1]) is None
+    assert growth_per_hour([{"time": 5.0, "rss_kb": 1}, {"time": 5.0, "rss_kb": 2}]) is None
+    assert growth_per_hour([{"time": 0.0, "rss_kb": None}, {"time": 60.0, "rss_kb": 2}]) is None
+
+
+def test_monitor_reports_probes_and_growing_types(tmp_path):
+    now = [1000.0]
+    log = tmp_path / "memory.jsonl"
+    monitor = MemoryMonitor(path=str(log), keep=3, clock=lambda: now[0])
+    widgets = []
+    monitor.add_probe("widgets", lambda: len(widgets))
+    monitor.add_probe("broken", lambda: 1 / 0)
+    
+    class LeakedCard:
+        pass
+    
+    first = monitor.sample()
+    assert first["widgets"] == 0 and first["broken"] is None and first["growing_types"] == {}
+    leaked = [LeakedCard() for _ in range(5000)]
+    widgets.extend(range(3))
+    for _ in range(3):
+        now[0] += 300
+        entry = monitor.sample()
+    assert entry["widgets"] == 3
+    assert entry["growing_types"]["LeakedCard"] == len(leaked)
+    assert len(monitor.samples) == 3 and monitor.latest() is entry
+    assert len(log.read_text().splitlines()) == 4  # the log keeps every sample
\ No newline at end of file
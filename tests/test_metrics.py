@@ -0,0 +1,96 @@
+import json
+import threading
+import urllib.request
+
+import pytest
+
+from seemyfocus_metrics import FrameMetrics, Histogram, MetricsExporter
+
+
+def test_histogram_quantiles_are_bucket_bounds():
+    histogram = Histogram()
+    for value in [0.003] * 90 + [0.04] * 9 + [2.0]:
+        histogram.observe(value)
+    assert histogram.quantile(0.5) == 0.005
+    assert histogram.quantile(0.95) == 0.05
+    assert histogram.quantile(1.0) == 2.0  # past the last bucket: the largest seen
+    assert histogram.snapshot()["count"] == 100
+
+
+def test_split_stages_are_summed_once_per_frame():
+    metrics = FrameMetrics()
+    metrics.add("convert", metrics.now() - 0.002)
+    metrics.add("convert", metrics.now() - 0.002)
+    metrics.frame_done(metrics.now())
+    stage = metrics.snapshot()["stages"]["convert"]
+    assert stage["count"] == 1 and stage["mean_ms"] == pytest.approx(4.0, abs=0.5)
+    assert metrics.counters["frames"] == 1
+
+
+def test_prometheus_histograms_are_cumulative():
+    metrics = FrameMetrics(stages=("capture",))
+    for seconds in (0.0004, 0.003, 0.003, 0.7):
+        metrics.observe("capture", seconds)
+    metrics.count("frames", 4)
+    metrics.add_collector(lambda: {"camera_fps": 29.5, "unknown": None})
+    metrics.add_collector(lambda: 1 / 0)  # a broken collector is skipped
+    
+    lines = metrics.prometheus().splitlines()
+    assert 'seemyfocus_stage_seconds_bucket{stage="capture",le="0.0005"} 1' in lines
+    assert 'seemyfocus_stage_seconds_bucket{stage="capture",le="0.005"} 3' in lines
+    assert 'seemyfocus_stage_seconds_bucket{stage="capture",le="1.0"} 4' in lines
+    assert 'seemyfocus_stage_seconds_count{stage="capture"} 4' in lines
+    assert "seemyfocus_frames_total 4" in lines
+    assert "seemyfocus_camera_fps 29.5" in lines
+    assert not any(line.startswith("seemyfocus_unknown") for line in lines)
+
+
+def test_snapshots_while_the_frame_loop_adds_stages():
+    metrics = FrameMetrics()
+    errors = []
+    done = threading.Event()
+    
+    def export():
+        while not done.is_set():
+            try:
+                metrics.snapshot()
+                metrics.prometheus()
+            except RuntimeError as error:
+                errors.append(error)
+    
+    reader = threading.Thread(target=export)
+    reader.start()
+    for number in range(20000):
+        metrics.observe(f"persist_{number}", 0.001)
+    done.set()
+    reader.join()
+    assert errors == []
+
+
+def test_exporter_writes_files_serves_them_and_survives_errors(tmp_path, capsys):
+    metrics = FrameMetrics()
+    metrics.observe("capture", 0.004)
+    exporter = MetricsExporter(metrics, directory=str(tmp_path), interval=0.05, port=0)
+    calls = []
+    export = exporter.export
+    
+    def flaky_export():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("first export fails")
+        export()
+    
+    exporter.export = flaky_export
+    exporter.start()
+    try:
+        port = exporter.http.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+            assert json.load(response)["stages"]["capture"]["count"] == 1
+        threading.Event().wait(0.3)
+        assert len(calls) > 1  # still exporting after the first one raised
+    finally:
+        exporter.stop()
+    assert "first export fails" in capsys.readouterr().err
+    with open(tmp_path / "seemyfocus_metrics.json") as f:
+        assert json.load(f)["counters"]["frames"] == 0
+    assert (tmp_path / "seemyfocus.prom").read_text().startswith("# HELP seemyfocus_stage_seconds")
\ No newline at end of file
@@ -0,0 +1,102 @@
+import pytest
+
+import SeeMyFocus_app
+from SeeMyFocus_app import NotificationQueue
+
+
+class FakeRoot:
+    """Just enough of Tk for the queue: after() timers that the test fires by hand"""
+    
+    def __init__(self):
+        self.timers = {}
+        self.next_id = 0
+    
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.timers[self.next_id] = (delay_ms, callback)
+        return self.next_id
+    
+    def after_cancel(self, after_id):
+        del self.timers[after_id]
+    
+    def fire(self):
+        (after_id, (_, callback)), = self.timers.items()
+        del self.timers[after_id]
+        callback()
+
+
+class FakeLabel:
+    def __init__(self):
+        self.text = ""
+    
+    def winfo_exists(self):
+        return True
+    
+    def config(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(SeeMyFocus_app.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(clock):
+    queue = NotificationQueue(FakeRoot(), max_pending=3)
+    queue.label = FakeLabel()
+    return queue
+
+
+def test_messages_queue_by_priority_behind_one_timer(queue, clock):
+    assert queue.notify("first", duration=3.0)
+    queue.notify("later", NotificationQueue.LOW)
+    queue.notify("sooner", NotificationQueue.NORMAL)
+    queue.notify("later", NotificationQueue.LOW)  # merged, not queued twice
+    assert queue.label.text == "first"
+    assert [entry[2] for entry in queue.pending] == ["sooner", "later"]
+    assert len(queue.root.timers) == 1
+    
+    clock[0] += 3.0
+    queue.root.fire()
+    assert queue.label.text == "sooner"
+    clock[0] += 3.0
+    queue.root.fire()
+    assert queue.label.text == "later"
+    clock[0] += 3.0
+    queue.root.fire()
+    assert queue.label.text == "" and not queue.root.timers
+
+
+def test_higher_priority_replaces_the_current_message(queue):
+    queue.notify("tip", NotificationQueue.LOW)
+    queue.notify("Eyes off screen", NotificationQueue.HIGH)
+    assert queue.label.text == "Eyes off screen"
+
+
+def test_repeats_extend_the_message_and_the_queue_is_bounded(queue, clock):
+    queue.notify("same", duration=3.0)
+    clock[0] += 2.0
+    queue.notify("same", duration=3.0)
+    assert queue.label_deadline == 1005.0 and not queue.pending
+    
+    for number in range(5):
+        queue.notify(f"waiting {number}")
+    assert [entry[2] for entry in queue.pending] == ["waiting 0", "waiting 1", "waiting 2"]
+
+
+def test_cooldown_suppresses_the_same_kind(queue, clock):
+    queue.set_cooldown("reminder", 60)
+    assert queue.notify("Look away for 20 s", key="reminder")
+    clock[0] += 30
+    assert not queue.notify("Look away again", key="reminder")
+    clock[0] += 30
+    assert queue.is_ready("reminder")
+
+
+def test_nothing_is_queued_without_a_live_label(clock):
+    queue = NotificationQueue(FakeRoot())
+    assert not queue.notify("lost")
+    assert not queue.pending and not queue.root.timers
\ No newline at end of file
@@ -0,0 +1,65 @@
+import os
+import threading
+
+import cv2
+import pytest
+
+from seemyfocus_engine import FocusEngine, SimulatedClock
+from seemyfocus_eyes import drifting_frames
+from seemyfocus_pipeline import DetectionPipeline, run_pipelined, run_sequential
+
+PORTRAIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "face.png")
+
+
+@pytest.fixture(scope="module")
+def frames():
+    frames = drifting_frames(PORTRAIT, 60, scale=2.0)
+    return frames, [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+
+
+def recording_engine(tmp_path):
+    """An engine mid-session that records the face, state and eyes after every update"""
+    engine = FocusEngine(str(tmp_path / "progress.json"), str(tmp_path / "history.json"),
+                         SimulatedClock(start=1_700_000_000.0))
+    engine.start_session()
+    engine.updates = []
+    process = engine.process_face_detection
+    
+    def record(frame, faces, gray, **kwargs):
+        process(frame, faces, gray, **kwargs)
+        eyes = tuple(map(tuple, engine.eye_history[-1])) if engine.eye_history else None
+        engine.updates.append((engine.primary_face, engine.current_state, eyes))
+    
+    engine.process_face_detection = record
+    return engine
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_pipelined_updates_match_the_sequential_loop(frames, tmp_path, workers):
+    frames, grays = frames
+    sequential = recording_engine(tmp_path / "sequential")
+    run_sequential(sequential, grays, frames)
+    pipelined = recording_engine(tmp_path / "pipelined")
+    run_pipelined(pipelined, grays, frames, workers)
+    
+    assert any(eyes for _, _, eyes in sequential.updates)
+    assert pipelined.updates == sequential.updates
+
+
+def test_submit_does_not_wait_for_detection(frames, tmp_path):
+    frames, grays = frames
+    engine = recording_engine(tmp_path)
+    pipeline = DetectionPipeline(engine, workers=1)
+    release = threading.Event()
+    find_faces = pipeline.find_faces
+    pipeline.find_faces = lambda gray: release.wait(5) and find_faces(gray)
+    try:
+        # Up to workers + 1 frames may be in flight before submit() holds the caller up
+        assert pipeline.submit(frames[0], grays[0]) == []
+        assert pipeline.submit(frames[1], grays[1]) == []
+        assert engine.updates == []
+        release.set()
+        assert [frame is done for frame, (done, _) in zip(frames, pipeline.flush())] == [True, True]
+        assert len(engine.updates) == 2
+    finally:
+        pipeline.close()
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from seemyfocus_engine import FocusEngine, SimulatedClock
+from seemyfocus_eyes import drifting_frames
+from seemyfocus_presence import (DESK_HOLD, PRESENCE_HOLD, BreakPresence, DeskPresence, desk_region, privacy_blur,
+                                 scripted_desk)
+
+PORTRAIT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "face.png")
+
+
+@pytest.fixture(scope="module")
+def face_gray():
+    return cv2.cvtColor(drifting_frames(PORTRAIT, 1, scale=2.0)[0], cv2.COLOR_BGR2GRAY)
+
+
+def test_privacy_blur_removes_detail_in_place():
+    rng = np.random.default_rng(1)
+    frame = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    out = np.empty_like(frame)
+    blurred = privacy_blur(frame, out)
+    assert blurred is out and blurred.shape == frame.shape
+    assert np.abs(cv2.Laplacian(blurred, cv2.CV_32F)).mean() < np.abs(cv2.Laplacian(frame, cv2.CV_32F)).mean() / 20
+    assert abs(float(blurred.mean()) - float(frame.mean())) < 2
+
+
+def test_break_presence_holds_a_face_for_a_few_seconds(face_gray):
+    presence = BreakPresence()
+    empty = np.full_like(face_gray, 90)
+    assert presence.check(face_gray, 100.0)
+    assert presence.check(empty, 100.0 + PRESENCE_HOLD)  # still within the hold
+    assert not presence.check(empty, 100.5 + PRESENCE_HOLD)
+    presence.reset()
+    assert not presence.check(empty, 200.0)
+    assert presence.stats()["break_presence_checks"] == 4
+
+
+def test_break_frames_record_presence_without_scoring(tmp_path):
+    clock = SimulatedClock(start=1_700_000_000.0)
+    engine = FocusEngine(str(tmp_path / "progress.json"), str(tmp_path / "history.json"), clock)
+    engine.start_session()
+    engine.current_cycle_type = "break"
+    assert engine.in_break()
+    frame = np.zeros((480, 640, 3), np.uint8)
+    for seen in (True, True, False):
+        engine.process_break_presence(frame, seen)
+        clock.advance(5)
+    assert engine.focus_timeline.to_list() == [FocusEngine.TIMELINE_FOCUSED] * 2 + [FocusEngine.TIMELINE_AWAY]
+    assert engine.current_state == "Away" and engine.primary_face is None
+    assert engine.total_frames == 0 and engine.focus_score == 0
+
+
+def test_desk_presence_holds_then_lets_go_of_a_still_scene():
+    desk = DeskPresence()
+    user = (240, 100, 160, 160)
+    scene = np.full((480, 640), 110, np.uint8)
+    cv2.rectangle(scene, (0, 360), (640, 480), 70, -1)
+    for number in range(3):
+        assert desk.check(scene, number * 0.1, face_finder=lambda gray: [user])
+    assert desk.state == DeskPresence.WATCHING
+    assert desk.region == desk_region(user, 640, 480)
+    
+    # Nothing moves and no face is found: present for DESK_HOLD, then empty
+    now = 0.2
+    while now < 0.2 + DESK_HOLD - 0.1:
+        now += 0.1
+        assert desk.check(scene, now)
+    now += 0.3
+    assert not desk.check(scene, now)
+    
+    # Movement in the region counts as someone back at once
+    moving = scene.copy()
+    cv2.circle(moving, (320, 420), 30, 200, -1)
+    assert desk.check(moving, now + 0.1)
+
+
+def test_desk_presence_follows_a_user_writing_head_down():
+    script = (("upright", 3, True), ("head down", 10, True), ("away", 15, False), ("still reading", 8, True))
+    desk = DeskPresence()
+    face_cascade_finder = FocusEngine(os.devnull, os.devnull).detect_faces
+    fps = 5.0
+    right = {}
+    now = 0.0
+    for frame, phase, present in scripted_desk(PORTRAIT, fps, script=script):
+        seen = desk.check(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), now, face_cascade_finder)
+        right.setdefault(phase, []).append(seen == present)
+        now += 1.0 / fps
+    assert all(right["head down"]) and all(right["still reading"])
+    # Leaving is noticed once the hold and the background model have caught up
+    settled = right["away"].index(True)
+    assert all(right["away"][settled:]) and settled / fps <= DESK_HOLD + 2
\ No newline at end of file
@@ -0,0 +1,60 @@
+import time
+
+from seemyfocus_profiler import FrameLoopProfiler, parse_profile_arg
+
+
+def detect_faces():
+    end = time.perf_counter() + 0.02
+    while time.perf_counter() < end:
+        pass
+
+
+def update_camera():
+    detect_faces()
+    return "frame"
+
+
+def test_profile_modes_from_the_command_line():
+    assert parse_profile_arg(["--theme", "dark"]) is None
+    assert parse_profile_arg(["--profile"]) == "sample"
+    assert parse_profile_arg(["--profile=cprofile"]) == "cprofile"
+    assert parse_profile_arg(["--profile=bogus"]) == "sample"
+
+
+def test_sampler_only_records_frames_while_active(tmp_path):
+    session = {"active": False}
+    profiler = FrameLoopProfiler("sample", directory=str(tmp_path), active=lambda: session["active"])
+    loop = profiler.wrap(update_camera)
+    try:
+        assert loop() == "frame"
+        assert profiler.frames == 0 and profiler.sampler is None
+        
+        session["active"] = True
+        for _ in range(10):
+            loop()
+        assert profiler.frames == 10
+        path = profiler.write_report("2025-10-25 15:49")
+    finally:
+        profiler.stop()
+    
+    assert path == str(tmp_path / "profile_2025-10-25-15-49.txt")
+    report = open(path).read()
+    assert report.startswith("SeeMyFocus frame-loop profile (sample)\n10 frames")
+    assert "test_profiler.py:detect_faces" in report
+    stacks = (tmp_path / "profile_2025-10-25-15-49.folded").read_text().splitlines()
+    assert stacks and all(line.startswith("test_profiler.py:update_camera") for line in stacks)
+    assert "test_profiler.py:update_camera;test_profiler.py:detect_faces" in stacks[0]
+    # Written reports start the next session from scratch
+    assert profiler.frames == 0 and profiler.write_report("next") is None
+
+
+def test_cprofile_counts_every_call(tmp_path):
+    profiler = FrameLoopProfiler("cprofile", directory=str(tmp_path))
+    loop = profiler.wrap(update_camera)
+    for _ in range(3):
+        loop()
+    snapshot = {"stages": {"capture": {"count": 3, "mean_ms": 1.0, "p95_ms": 2.0, "max_ms": 2.5},
+                           "unused": {"count": 0}}}
+    report = open(profiler.write_report("s1", snapshot)).read()
+    assert "capture            mean    1.00 ms" in report and "unused" not in report
+    assert any(line.split()[:1] == ["3"] and "detect_faces" in line for line in report.splitlines())
\ No newline at end of file
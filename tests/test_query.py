@@ -0,0 +1,105 @@
+import random
+from datetime import date
+
+import pytest
+
+from seemyfocus_bench import MOODS, TASKS, synthetic_history
+from seemyfocus_query import HistoryIndex, scan_aggregate, to_timestamp
+from seemyfocus_rollups import normalize_label, parse_start, session_totals
+
+
+def plain_select(history, start=None, end=None, task=None, mood=None, search=None):
+    """Positions matching every filter, oldest first, by testing each session"""
+    start, end = to_timestamp(start), to_timestamp(end)
+    matches = []
+    for position, session in enumerate(history):
+        when = parse_start(session)
+        if when is None:
+            continue
+        when = when.timestamp()
+        if (start is not None and when < start) or (end is not None and when >= end):
+            continue
+        name = normalize_label(session.get("task"))
+        if task is not None and name != normalize_label(task):
+            continue
+        if mood is not None and normalize_label(session.get("mood")) != normalize_label(mood):
+            continue
+        if search and normalize_label(search) not in name:
+            continue
+        matches.append((when, position))
+    return [position for _, position in sorted(matches)]
+
+
+def plain_aggregate(history, positions):
+    sessions = len(positions)
+    return {
+        "sessions": sessions,
+        "focus_seconds": pytest.approx(sum(session_totals(history[p])["focus_seconds"] for p in positions)),
+        "session_seconds": pytest.approx(sum(history[p]["session_time"] for p in positions)),
+        "mean_score": pytest.approx(sum(history[p]["focus_score"] for p in positions) / sessions if sessions else 0.0)
+    }
+
+
+def queries(index, count=60, seed=3):
+    rng = random.Random(seed)
+    first, last = index.all.starts[0], index.all.starts[-1]
+    yield {}
+    yield {"task": "  code   REVIEW "}
+    yield {"search": "e"}
+    for _ in range(count):
+        start, end = sorted(rng.uniform(first, last) for _ in range(2))
+        filters = {"start": start, "end": end}
+        if rng.random() < 0.5:
+            filters["task"] = rng.choice(TASKS).upper()
+        if rng.random() < 0.4:
+            filters["mood"] = rng.choice(MOODS)
+        if rng.random() < 0.3:
+            filters["search"] = rng.choice(("stud", "ess", "re", "nothing like it"))
+        yield filters
+
+
+@pytest.fixture(scope="module")
+def history():
+    history = synthetic_history(800)
+    random.Random(1).shuffle(history)  # an imported history is not in time order
+    history.append({"session_time": 60, "task": "Essay draft"})  # no start time: not indexed
+    return history
+
+
+def test_select_and_aggregate_match_a_scan(history):
+    index = HistoryIndex(history)
+    assert index.unindexed == 1
+    for filters in queries(index):
+        positions = plain_select(history, **filters)
+        assert index.select(**filters) == positions, filters
+        assert index.aggregate(**filters) == plain_aggregate(history, positions), filters
+
+
+def test_scan_aggregate_agrees_with_the_index(history):
+    index = HistoryIndex(history)
+    total = scan_aggregate(history, date(2024, 2, 1), "2024-03-01", "Email")
+    indexed = index.aggregate(date(2024, 2, 1), "2024-03-01", task="email")
+    assert total["sessions"] == indexed["sessions"] > 0
+    assert total["focus_seconds"] == pytest.approx(indexed["focus_seconds"])
+
+
+def test_added_sessions_keep_the_index_in_step(history):
+    ordered = sorted(history[:-1], key=lambda session: parse_start(session))
+    live = ordered[:400]
+    index = HistoryIndex(live)
+    for session in ordered[400:600]:
+        live.append(session)
+        index.add(len(live) - 1)
+    assert index.all.positions == list(range(600))  # appended in order, no rebuild
+    
+    # A session from before the newest one, imported from another machine: the totals after it are rebuilt
+    live.append(dict(ordered[10], task="Imported"))
+    index.add(len(live) - 1)
+    live.append({"task": "no start"})
+    index.add(len(live) - 1)
+    assert index.unindexed == 1 and index.all.positions.index(600) == 11
+    fresh = HistoryIndex(live)
+    for filters in queries(index, count=20, seed=4):
+        assert index.select(**filters) == fresh.select(**filters) == plain_select(live, **filters)
+        assert index.aggregate(**filters) == plain_aggregate(live, plain_select(live, **filters))
+    assert index.task_names()[-1] == ("imported", 1)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from seemyfocus_analytics import DayArrays, day_arrays
+from seemyfocus_bench import synthetic_history
+from seemyfocus_engine import FocusEngine, SimulatedClock
+from seemyfocus_rollups import TOTALS, Rollups, cycles_ended, week_of
+
+
+@pytest.fixture(scope="module")
+def history():
+    return synthetic_history(600)
+
+
+def rows_close(a, b):
+    """Rollup tables equal up to float rounding of the summed seconds"""
+    assert a.keys() == b.keys()
+    for key in a:
+        for field, value in a[key].items():
+            if isinstance(value, dict):
+                assert value.keys() == b[key][field].keys()
+                for name, entry in value.items():
+                    assert entry == pytest.approx(b[key][field][name])
+            else:
+                assert value == pytest.approx(b[key][field]), (key, field)
+
+
+def test_adding_sessions_one_by_one_matches_a_rebuild(history):
+    rollups = Rollups.rebuild(history[:400])
+    for session in history[400:]:
+        rollups.add(session)
+    rebuilt = Rollups.rebuild(history)
+    assert rollups.sessions == rebuilt.sessions == len(history)
+    rows_close(rollups.days, rebuilt.days)
+    rows_close(rollups.weeks, rebuilt.weeks)
+
+
+def test_week_rows_are_the_sum_of_their_days(history):
+    rollups = Rollups.rebuild(history)
+    for monday, week in rollups.weeks.items():
+        days = [rollups.days.get((date.fromisoformat(monday) + timedelta(days=n)).isoformat()) for n in range(7)]
+        for key in TOTALS:
+            assert week[key] == pytest.approx(sum(day[key] for day in days if day))
+    first, last = rollups.first_day() + timedelta(days=3), date.fromisoformat(max(rollups.days))
+    by_day = sum(row["focus_seconds"] for day, row in rollups.day_rows(first, last) if row)
+    assert rollups.totals(first, last)["focus_seconds"] == pytest.approx(by_day)
+
+
+def test_saved_rollups_load_back_and_unknown_versions_are_rejected(history, tmp_path):
+    rollups = Rollups.rebuild(history[:50])
+    path = tmp_path / "rollups.json"
+    rollups.save(str(path))
+    loaded = Rollups.load(str(path))
+    assert loaded.sessions == 50 and loaded.days == json.loads(json.dumps(rollups.days))
+    path.write_text(json.dumps(dict(rollups.to_dict(), version=99)))
+    assert Rollups.load(str(path)) is None
+    assert Rollups.load(str(tmp_path / "missing.json")) is None
+
+
+def test_streak_and_weekly_report():
+    sessions = [{"timestamp": f"2025-10-{day:02d} 09:00:00", "session_time": 3000, "focus_score": 80,
+                 "streak_count": 2, "wellness_points": 10, "xp_earned": 100}
+                for day in (20, 22, 23, 24, 27, 28)]
+    rollups = Rollups.rebuild(sessions)
+    assert rollups.day_streak(date(2025, 10, 24)) == 3
+    assert rollups.day_streak(date(2025, 10, 25)) == 3  # nothing yet today: yesterday still counts
+    assert rollups.day_streak(date(2025, 10, 26)) == 0
+    
+    report = rollups.weekly_report(week_of(date(2025, 10, 28)))
+    assert report["week"] == "2025-10-27" and report["active_days"] == 2
+    assert report["this"]["sessions"] == 2 and report["previous"]["sessions"] == 4
+    assert report["this"]["cycles"] == 2 * cycles_ended(3000) == 4 and report["cycle_rate"] == 1.0
+
+
+def test_finish_session_adds_to_the_rollups_and_a_stale_file_is_rebuilt(tmp_path):
+    clock = SimulatedClock(start=1_760_000_000.0)
+    engine = FocusEngine(str(tmp_path / "progress.json"), str(tmp_path / "history.json"), clock)
+    for _ in range(2):
+        engine.start_session()
+        clock.advance(1500)
+        engine.finish_session()
+    assert engine.rollups.sessions == 2 and engine.rollups.totals()["sessions"] == 2
+    assert Rollups.load(engine.rollups_file).sessions == 2
+    
+    # The history gained a session the rollups never saw
+    engine.session_history.append(dict(engine.session_history[-1]))
+    engine.save_session_history()
+    reloaded = FocusEngine(str(tmp_path / "progress.json"), str(tmp_path / "history.json"), clock)
+    reloaded.load_session_history()
+    assert reloaded.rollups.sessions == 3 and reloaded.rollups.totals()["sessions"] == 3
+
+
+def assert_same_columns(kept, fresh):
+    assert kept.day.tolist() == fresh.day.tolist()
+    for name in DayArrays.COLUMNS + ("score_counts", "hour_focus"):
+        np.testing.assert_allclose(getattr(kept, name), getattr(fresh, name))
+    assert kept.tasks == fresh.tasks and kept.moods == fresh.moods
+
+
+def test_dashboard_columns_follow_new_sessions_without_a_full_read(history):
+    rollups = Rollups.rebuild(history[:500])
+    kept = day_arrays(rollups)
+    assert kept.update() == 0
+    
+    last = max(rollups.days)
+    late = dict(history[0], timestamp=f"{last} 23:30:00", session_time=7200)  # runs past midnight
+    rollups.add(late)
+    assert day_arrays(rollups, kept) is kept
+    assert kept.seen == len(rollups.changed_days)
+    assert_same_columns(kept, DayArrays(rollups))
+    
+    for session in history[500:]:
+        rollups.add(session)
+    early = dict(history[0], timestamp="2023-06-01 10:00:00")  # before every other day
+    rollups.add(early)
+    day_arrays(rollups, kept)
+    assert_same_columns(kept, DayArrays(rollups))
+    
+    # A rebuilt table is read afresh
+    rebuilt = Rollups.rebuild(history)
+    assert day_arrays(rebuilt, kept) is not kept
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pytest
+
+from seemyfocus_sim import parse_script, replay_ledger, simulate
+
+
+def test_scripts_parse_and_reject_unknown_presence():
+    assert parse_script("focused:1500, away:30") == [("focused", 1500.0), ("away", 30.0)]
+    with pytest.raises(ValueError, match="unknown presence 'asleep'"):
+        parse_script("asleep:60")
+
+
+def test_ledger_replay_applies_level_ups_and_penalties():
+    ledger = [("xp", 80, "focus"), ("xp", 30, "cycle"), ("penalty", 50, "reminder"), ("penalty", 500, "reminder")]
+    assert replay_ledger(ledger[:2], 1, 0, 100) == (2, 10, 150)
+    assert replay_ledger(ledger, 1, 0, 100) == (2, 0, 150)
+
+
+def test_an_hour_of_focus_completes_every_cycle_on_time():
+    report = simulate(1.0, parse_script("focused:3600"), fps=2)
+    assert report["cycles"]["completed"] == report["cycles"]["max_possible"] == 2
+    assert report["cycles"]["reminders"] == 0 and report["cycles"]["persistent_streak"] == 2
+    assert report["timers"]["boundaries"] == 4 and report["timers"]["late_max_ms"] <= 1.0
+    assert report["timers"]["max_cycle_drift_s"] == 0.0
+    assert report["xp"]["ledger_consistent"]
+    assert report["memory"]["focus_timeline_in_memory"] == 0  # spilled once the session ended
+
+
+def test_leaving_the_desk_breaks_the_streak_and_back_to_back_sessions_are_saved():
+    report = simulate(2.0, parse_script("focused:900,away:60"), fps=2, session_hours=1)
+    assert report["sessions"] == 2
+    assert report["cycles"]["reminders"] > 0
+    assert report["cycles"]["persistent_streak"] < report["cycles"]["completed"]
+    assert report["presence_minutes"]["away"] == pytest.approx(7.0, abs=0.2)
+    assert report["xp"]["ledger_consistent"]
+
+
+def test_camera_outages_keep_the_streak_and_are_recorded_as_no_camera():
+    report = simulate(1.0, parse_script("focused:900,nocamera:60"), fps=2)
+    assert report["cycles"]["reminders"] == 0
+    assert report["cycles"]["persistent_streak"] == report["cycles"]["completed"] == 2
+    assert report["cycles"]["no_camera_minutes"] == pytest.approx(3.0, abs=0.2)
+    assert report["cycles"]["focus_score"] >= 95  # no-camera time is not counted as unfocused
\ No newline at end of file
@@ -0,0 +1,39 @@
+import json
+import os
+
+from seemyfocus_engine import HISTORY_FILE
+from seemyfocus_stations import parse_source, render_dashboard, run_stations, station_name
+
+
+def test_sources_and_names():
+    assert parse_source("0") == 0 and parse_source("desk.mp4") == "desk.mp4"
+    assert station_name(1, 0) == "1-cam1"
+    assert station_name("recordings/desk3.mp4", 2) == "3-desk3"
+
+
+def test_every_station_runs_its_own_engine_and_files(recording, tmp_path):
+    missing = str(tmp_path / "unplugged.avi")
+    summaries = run_stations([recording, recording, missing], target_fps=10, data_root=str(tmp_path / "stations"),
+                             duration=1.5, dashboard=False)
+    
+    names = [summary["name"] for summary in summaries]
+    assert names == ["1-desk", "2-desk", "3-unplugged"]
+    assert summaries[2]["error"] == "cannot open source"
+    for summary in summaries[:2]:
+        assert summary["frames"] >= 10
+        with open(tmp_path / "stations" / summary["name"] / HISTORY_FILE) as f:
+            history = json.load(f)
+        assert [session["task"] for session in history] == [summary["name"]]
+    assert not os.path.exists(tmp_path / "stations" / "3-unplugged" / HISTORY_FILE)
+
+
+def test_dashboard_has_a_line_per_station():
+    statuses = {
+        "1-cam0": {"state": "Focused", "cycle": "focus", "remaining": 1032, "streak": 4, "score": 91,
+                   "fps": 9.8, "frame_ms": 21.5},
+        "2-desk": {"name": "2-desk", "error": "cannot open source"}
+    }
+    lines = render_dashboard(statuses, 12.4).splitlines()
+    assert lines[0].startswith("SeeMyFocus stations: 2 running for 12s")
+    assert lines[2].split() == ["1-cam0", "Focused", "focus", "17:12", "4", "91%", "9.8", "21.5"]
+    assert lines[3].split() == ["2-desk", "cannot", "open", "source"]
\ No newline at end of file
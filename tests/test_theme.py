@@ -0,0 +1,67 @@
+from SeeMyFocus_app import ThemeRegistry
+
+LIGHT = {"bg": "#F5F7FA", "card": "#FFFFFF", "accent": "#3B82F6", "secondary": "#64748B", "fg": "#1E293B"}
+DARK = {"bg": "#0F172A", "card": "#1E293B", "accent": "#60A5FA", "secondary": "#94A3B8", "fg": "#F1F5F9"}
+
+
+class FakeWidget:
+    def __init__(self, children=(), **options):
+        self.options = options
+        self.children = list(children)
+        self.alive = True
+    
+    def keys(self):
+        return list(self.options)
+    
+    def cget(self, option):
+        return self.options[option]
+    
+    def configure(self, **options):
+        self.options.update(options)
+    
+    def winfo_children(self):
+        return self.children
+    
+    def winfo_exists(self):
+        return self.alive
+
+
+def test_a_screen_is_recolored_in_place():
+    label = FakeWidget(bg="#ffffff", fg="#3b82f6")
+    button = FakeWidget(bg="#3B82F6", fg="#FFFFFF", activebackground="#3B82F6")
+    screen = FakeWidget([FakeWidget([label, button], bg="#FFFFFF")], bg="#F5F7FA")
+    theme = ThemeRegistry(LIGHT)
+    theme.register_tree(screen)
+    
+    theme.apply(DARK)
+    assert screen.options["bg"] == DARK["bg"]
+    assert screen.children[0].options["bg"] == DARK["card"]
+    assert label.options == {"bg": DARK["card"], "fg": DARK["accent"]}
+    # White is both the card and the button text; bg looks up card first, fg accent first
+    assert button.options == {"bg": DARK["accent"], "fg": DARK["card"], "activebackground": DARK["accent"]}
+    
+    theme.apply(LIGHT)
+    assert label.options == {"bg": LIGHT["card"], "fg": LIGHT["accent"]}
+
+
+def test_colors_outside_the_palette_are_left_alone():
+    badge = FakeWidget(bg="#FEF3C7", fg="#1E293B")
+    theme = ThemeRegistry(LIGHT)
+    theme.register_tree(badge)
+    theme.apply(DARK)
+    assert badge.options == {"bg": "#FEF3C7", "fg": DARK["fg"]}
+
+
+def test_destroyed_widgets_are_dropped_and_hooks_run():
+    kept, destroyed = FakeWidget(bg="#F5F7FA"), FakeWidget(bg="#F5F7FA")
+    theme = ThemeRegistry(LIGHT)
+    theme.register(kept, bg="bg")
+    theme.register(destroyed, bg="bg")
+    seen = []
+    theme.on_change(seen.append)
+    
+    destroyed.alive = False
+    theme.apply(DARK)
+    assert [widget for widget, _ in theme.entries] == [kept]
+    assert destroyed.options["bg"] == LIGHT["bg"]
+    assert seen == [DARK]
\ No newline at end of file
@@ -0,0 +1,76 @@
+import pytest
+
+from seemyfocus_engine import FocusEngine, SimulatedClock
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = FocusEngine(str(tmp_path / "progress.json"), str(tmp_path / "history.json"), SimulatedClock(start=START))
+    engine.shown = []
+    engine.show_cycle_timer = engine.shown.append
+    return engine
+
+
+def run_until(engine, when):
+    """Fire the timers at every deadline up to when, with no camera frames, as the app's Tk timer does"""
+    while True:
+        deadline = engine.next_timer_deadline()
+        if deadline is None or deadline > when:
+            break
+        engine.clock.advance_to(deadline)
+        engine.run_timers()
+    engine.clock.advance_to(when)
+
+
+def test_deadlines_follow_the_countdown_and_the_distraction_buffer(engine):
+    assert engine.next_timer_deadline() is None
+    engine.start_session()
+    assert engine.next_timer_deadline() == START + 1
+    engine.clock.advance(1199.4)
+    assert engine.next_timer_deadline() == START + 1200  # the boundary, not past it
+    
+    engine.current_state = "Focused"
+    engine.distraction_start_time = engine.clock.time() - 4.9
+    assert engine.next_timer_deadline() == pytest.approx(engine.clock.time() + 0.1)
+
+
+def test_cycles_end_on_time_without_frames(engine):
+    engine.start_session()
+    engine.current_state = "Focused"
+    run_until(engine, START + 1199.9)
+    assert engine.current_cycle_type == "focus" and engine.shown[-1] == 1
+    assert engine.shown == list(range(1199, 0, -1))  # one countdown update per second
+    
+    run_until(engine, START + 1200)
+    assert engine.current_cycle_type == "break" and engine.cycle_start_time == START + 1200
+    assert engine.cycles_completed == 1 and engine.persistent_streak_count == 1
+    
+    run_until(engine, START + 1500)
+    assert engine.current_cycle_type == "focus" and engine.cycle_start_time == START + 1500
+
+
+def test_a_late_boundary_does_not_push_later_cycles_back(engine):
+    engine.start_session()
+    engine.clock.advance(1200 + 20)  # a 20 s stall over the boundary
+    engine.run_timers()
+    assert engine.current_cycle_type == "break" and engine.cycle_start_time == START + 1200
+    
+    engine.clock.advance(300 + 61)  # slept past the catch-up limit: restart from now
+    engine.run_timers()
+    assert engine.current_cycle_type == "focus" and engine.cycle_start_time == engine.clock.time()
+
+
+def test_a_pending_distraction_is_confirmed_by_the_timer(engine):
+    engine.start_session()
+    engine.current_state = "Focused"
+    engine.persistent_streak_count = 3
+    engine.clock.advance(60)
+    engine.distraction_start_time = engine.clock.time()
+    
+    run_until(engine, engine.clock.time() + 4.9)
+    assert engine.current_state == "Focused" and engine.reminder_count == 0
+    run_until(engine, engine.clock.time() + 0.1)
+    assert engine.current_state == "Away"
+    assert engine.persistent_streak_count == 0 and engine.reminder_count == 1
\ No newline at end of file